@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import meetings
+from app.database import async_engine
+from app.responses import SelectiveGZipMiddleware
+from app.routers import health, live, meetings, search
+from app.services.job_events import relay
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Relays job progress written by the workers to /events subscribers
+    relay.start()
+    yield
+    await relay.stop()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="STT FastAPI App",
     description="Minimal FastAPI backend with MySQL + SQLAlchemy",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -14,6 +29,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Retry-After", "Accept-Ranges", "Content-Range", "Content-Length", "X-Audio-Rendition",
+                    "X-Waveform-Dtype", "X-Waveform-Sample-Rate", "X-Waveform-Samples-Per-Peak", "X-Waveform-Start"],
 )
 
+# Added last, so it is the outermost middleware and compresses the final response
+app.add_middleware(SelectiveGZipMiddleware)
+
 app.include_router(meetings.router)
+app.include_router(health.router)
+app.include_router(search.router)
+app.include_router(live.router)
@@ -1,4 +1,8 @@
 from .meeting import Meeting
 from .speaker import Speaker
 from .transcript import Transcript
-from .summary import Summary
\ No newline at end of file
+from .transcript_segment import TranscriptSegment
+from .summary import Summary
+from .job import Job
+from .artifact import JobArtifact
+from .search import SearchDocument, SearchPosting
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy.orm import relationship
+from ..database import Base
+from datetime import datetime, timezone
+
+class JobArtifact(Base):
+    __tablename__ = "job_artifacts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), index=True)
+    stage = Column(String(50), nullable=False)
+    version = Column(Integer, nullable=False)
+    # Fingerprint of the stage inputs and parameters; a stage is skipped when it matches
+    input_key = Column(String(64), nullable=False, index=True)
+    path = Column(String(255), nullable=False)
+    # Wall-clock time spent computing the stage, used to learn its real-time factor
+    elapsed_seconds = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    job = relationship("Job", back_populates="artifacts")
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Text, Float, Boolean
+from sqlalchemy.orm import relationship
+from ..database import Base
+from datetime import datetime, timezone
+import enum
+
+def utcnow() -> datetime:
+    # Job timestamps are stored as naive UTC so comparisons behave the same on every backend
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), index=True)
+    status = Column(Enum(JobStatus), default=JobStatus.queued, nullable=False, index=True)
+    # Set to "meeting:<id>" while the job is active, cleared when it finishes.
+    # The unique constraint makes a second identical enqueue fail instead of
+    # creating a duplicate job (single-flight).
+    dedupe_key = Column(String(64), unique=True, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    worker_id = Column(String(255), nullable=True)
+    submitted_by = Column(String(100), default="anonymous", nullable=False, index=True)
+    expected_seconds = Column(Float, nullable=True)
+    # Groups jobs submitted together through the batch endpoint
+    batch_id = Column(String(36), nullable=True, index=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    available_at = Column(DateTime, default=utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    stage = Column(String(50), nullable=True)
+    progress = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+    meeting = relationship("Meeting", back_populates="jobs")
+    artifacts = relationship("JobArtifact", back_populates="job", cascade="all, delete-orphan")
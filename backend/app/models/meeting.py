@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Float, Boolean, Index
 from ..database import Base
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
@@ -15,13 +15,22 @@ class Meeting(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
-    date = Column(DateTime, nullable=False)
+    date = Column(DateTime, nullable=False, index=True)
     audio_file_path = Column(String(255), nullable=False)
     duration = Column(Float, nullable=True)
     status = Column(Enum(MeetingStatus), default=MeetingStatus.pending, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     num_speakers = Column(Integer, default=-1)
     diarization = Column(Boolean, default=False)
+    # Bumped whenever transcript, summary or speaker names change; keys export caches and ETags
+    content_version = Column(Integer, default=0, nullable=False)
     transcripts = relationship("Transcript", back_populates="meeting", cascade="all, delete-orphan")
+    transcript_segments = relationship("TranscriptSegment", back_populates="meeting", cascade="all, delete-orphan", passive_deletes=True)
     summaries = relationship("Summary", back_populates="meeting", cascade="all, delete-orphan")
-    speakers = relationship("Speaker", back_populates="meeting", cascade="all, delete-orphan")
\ No newline at end of file
+    speakers = relationship("Speaker", back_populates="meeting", cascade="all, delete-orphan")
+    jobs = relationship("Job", back_populates="meeting", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset pagination of the meeting list (newest first)
+        Index("ix_meetings_created_at_id", "created_at", "id"),
+    )
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Text, Index
+from ..database import Base
+
+class SearchDocument(Base):
+    """A searchable unit: one transcript segment, summary entry or speaker name of a meeting."""
+    __tablename__ = "search_documents"
+
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, index=True)
+    # "segment", "summary" or "speaker"
+    kind = Column(String(20), nullable=False)
+    # Summary field the entry comes from (executive_summary, topics, ...); NULL for segments
+    field = Column(String(50), nullable=True)
+    start = Column(Float, nullable=True)
+    # Diarization label (speaker_0, ...); names are applied when results are read
+    speaker = Column(String(255), nullable=True)
+    text = Column(Text, nullable=False)
+    # Number of indexed terms, for length normalisation in ranking
+    length = Column(Integer, nullable=False)
+
+class SearchPosting(Base):
+    """Inverted index: which documents contain a term and how often."""
+    __tablename__ = "search_postings"
+
+    term = Column(String(64), primary_key=True)
+    document_id = Column(Integer, ForeignKey("search_documents.id", ondelete="CASCADE"), primary_key=True)
+    tf = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_search_postings_document", "document_id"),
+    )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, Text, Index
+from sqlalchemy.orm import relationship
+from ..database import Base
+
+class TranscriptSegment(Base):
+    __tablename__ = "transcript_segments"
+
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    # Order of the segment within the meeting, used as the pagination cursor
+    position = Column(Integer, nullable=False)
+    start = Column(Float, nullable=False)
+    end = Column(Float, nullable=False)
+    # Diarization label (speaker_0, "speaker_0 + speaker_1"), NULL without diarization
+    speaker = Column(String(100), nullable=True)
+    raw_text = Column(Text, nullable=False)
+    text = Column(Text, nullable=True)
+    confidence = Column(Float, nullable=True)
+
+    meeting = relationship("Meeting", back_populates="transcript_segments")
+
+    __table_args__ = (
+        Index("ix_transcript_segments_meeting_position", "meeting_id", "position", unique=True),
+        Index("ix_transcript_segments_meeting_start", "meeting_id", "start"),
+        Index("ix_transcript_segments_meeting_speaker", "meeting_id", "speaker"),
+    )
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.services.admission import AdmissionService
+
+
+router = APIRouter(
+    prefix="/api",
+    tags=["health"]
+)
+
+
+@router.get("/health")
+async def health(db: AsyncSession = Depends(get_async_db)):
+    """Liveness plus the current load used for admission control."""
+    try:
+        await db.execute(text("SELECT 1"))
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "detail": str(e)})
+
+    load = await db.run_sync(AdmissionService.load)
+
+    overloaded = load["queued_audio_seconds"] >= load["max_queued_audio_seconds"]
+    if load["memory_budget_mb"] and load["estimated_memory_mb"] > load["memory_budget_mb"]:
+        overloaded = True
+
+    return {
+        "status": "overloaded" if overloaded else "ok",
+        **load
+    }
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import time
+import traceback
+from collections import deque
+from typing import Optional
+
+from fastapi import APIRouter, WebSocket
+from starlette.websockets import WebSocketState
+
+from app.database import AsyncSessionLocal
+from app.services.live_session import LIVE_MAX_LAG_SECONDS, LIVE_SAMPLE_RATE, LiveSession, LiveSessionRejected, LiveSessionService
+from scripts.utils.transcriber import TranscriptSegment
+
+
+router = APIRouter(
+    tags=["live"]
+)
+
+# Close code for "try again later" (RFC 6455 registry)
+WS_TRY_AGAIN_LATER = 1013
+
+
+def segment_message(seg: TranscriptSegment) -> dict:
+    return {"type": "segment", "start": seg.start, "end": seg.end, "text": seg.text, "confidence": seg.confidence}
+
+
+async def send_json(websocket: WebSocket, message: dict):
+    # The session is finished and saved even if the client went away
+    if websocket.client_state == WebSocketState.CONNECTED:
+        try:
+            await websocket.send_json(message)
+        except Exception:
+            pass
+
+
+class AudioInbox:
+    """
+    PCM received from the client and not decoded yet, bounded in bytes: the
+    receiver waits while it is full, so a client that sends faster than the
+    session decodes is slowed down instead of filling memory.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._chunks: deque[tuple[bytes, float]] = deque()
+        self._bytes = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+
+    async def put(self, pcm: bytes):
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._bytes < self.max_bytes)
+            self._chunks.append((pcm, time.monotonic()))
+            self._bytes += len(pcm)
+            self._changed.notify_all()
+
+    async def close(self):
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    async def take(self) -> Optional[tuple[bytes, float]]:
+        """Everything received so far and when its oldest part arrived; None once the stream ended."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._chunks or self._closed)
+            if not self._chunks:
+                return None
+            arrived = self._chunks[0][1]
+            pcm = b"".join(chunk for chunk, _arrived in self._chunks)
+            self._chunks.clear()
+            self._bytes = 0
+            self._changed.notify_all()
+            return pcm, arrived
+
+
+async def receive_audio(websocket: WebSocket, inbox: AudioInbox):
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                await inbox.put(message["bytes"])
+            elif message.get("text"):
+                try:
+                    command = json.loads(message["text"])
+                except ValueError:
+                    continue
+                if command.get("type") == "stop":
+                    break
+    finally:
+        # End of stream for the decoding loop
+        await inbox.close()
+
+
+async def decode_session(websocket: WebSocket, session: LiveSession, inbox: AudioInbox) -> Optional[str]:
+    """Decode until the client stops; returns why the session was cut short, if it was."""
+    while True:
+        received = await inbox.take()
+        if received is None:
+            break
+        pcm, arrived = received
+
+        segments, partial = await asyncio.to_thread(session.feed, pcm)
+        for seg in segments:
+            await send_json(websocket, segment_message(seg))
+        if partial is not None:
+            await send_json(websocket, {"type": "partial", "text": partial})
+
+        # How long the oldest audio of this batch waited to be decoded
+        lag = time.monotonic() - arrived
+        if session.adjust(lag):
+            level = session.policy.level
+            await send_json(websocket, {"type": "lag", "seconds": round(lag, 1), "quality": level.name, "beam_size": level.beam_size})
+        if lag > 2 * LIVE_MAX_LAG_SECONDS:
+            return f"Transcription is {lag:.0f}s behind"
+
+    for seg in await asyncio.to_thread(session.finish):
+        await send_json(websocket, segment_message(seg))
+    return None
+
+
+async def save_session(websocket: WebSocket, session: LiveSession, title: str, status: str = "completed"):
+    if not session.samples:
+        session.audio_path.unlink(missing_ok=True)
+        await send_json(websocket, {"type": "saved", "meeting_id": None})
+        return
+
+    try:
+        async with AsyncSessionLocal() as db:
+            meeting_id = await db.run_sync(LiveSessionService.save, session, title, status)
+    except Exception:
+        # Nothing refers to the recording without its meeting
+        session.audio_path.unlink(missing_ok=True)
+        raise
+
+    print(f"Live session {session.id} saved as meeting {meeting_id} ({status}, {session.duration:.0f}s, {len(session.segments)} segments)")
+    await send_json(websocket, {"type": "saved", "meeting_id": meeting_id, "duration": session.duration})
+
+
+async def run_session(websocket: WebSocket, title: str, language: str, streaming: bool) -> Optional[str]:
+    """Run one session and save it; returns the reason to close with 1013 if it fell too far behind."""
+    # The first session loads the shared Whisper model
+    session = await asyncio.to_thread(LiveSession, language, streaming)
+    await send_json(websocket, {"type": "ready", "session_id": session.id, "sample_rate": LIVE_SAMPLE_RATE, "streaming": streaming})
+
+    inbox = AudioInbox(max_bytes=int(2 * LIVE_MAX_LAG_SECONDS * LIVE_SAMPLE_RATE) * 2)
+    receiver = asyncio.create_task(receive_audio(websocket, inbox))
+
+    overloaded, error = None, None
+    try:
+        overloaded = await decode_session(websocket, session, inbox)
+    except Exception as e:
+        error = e
+    finally:
+        receiver.cancel()
+        session.close()
+
+    # A failed session keeps what was decoded; its recording can be processed again from the meeting
+    await save_session(websocket, session, title, status="failed" if error else "completed")
+    if error:
+        raise error
+    return overloaded
+
+
+@router.websocket("/ws/live")
+async def live_transcription(websocket: WebSocket, title: str = "Live meeting", language: str = "sr", streaming: bool = False):
+    """
+    Live transcription. The client sends binary messages of 16 kHz mono
+    16-bit little-endian PCM and {"type": "stop"} when it is done. The server
+    sends "ready", then a "segment" message for every transcribed segment
+    (plus "partial" hypotheses with streaming=true), "lag" whenever falling
+    behind changes the decoding quality, and finally "saved" with the id of
+    the meeting the session was stored as. A session that falls more than
+    2 * LIVE_MAX_LAG_SECONDS behind is saved and closed with 1013.
+    """
+    await websocket.accept()
+
+    try:
+        with LiveSessionService.session_slot():
+            overloaded = await run_session(websocket, title, language or None, streaming)
+    except LiveSessionRejected as e:
+        await websocket.close(code=WS_TRY_AGAIN_LATER, reason=str(e))
+        return
+    except Exception as e:
+        print(f"Live session error: {e}")
+        traceback.print_exc()
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close(code=1011, reason="Live transcription failed")
+        return
+
+    if websocket.client_state == WebSocketState.CONNECTED:
+        if overloaded:
+            print(f"Live session closed: {overloaded}")
+            await websocket.close(code=WS_TRY_AGAIN_LATER, reason=overloaded)
+        else:
+            await websocket.close()
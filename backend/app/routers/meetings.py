@@ -1,134 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from pathlib import Path
-import json, os
+import asyncio, base64, hashlib, json, mimetypes, os, re, uuid
 from datetime import datetime
 
 from app import models, schemas
-from app.database import get_db, SessionLocal
-from app.services.processing_service import ProcessingService
+from app.database import get_async_db
+from app.responses import FastJSONResponse, model_response
+from app.services.admission import ADMISSION_MAX_UPLOAD_MB, AdmissionRejected, AdmissionService
+from app.services.audio_preview import AUDIO_PREVIEW_MEDIA_TYPE, AudioPreviewService
+from app.services.audio_processor import AudioProcessor
+from app.services.checkpoint_store import CheckpointStore
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.job_events import TERMINAL_JOB_STATUSES, broker, job_event, relay
+from app.services.job_queue import JobQueueService
+from app.services.meeting_cache import meeting_cache
+from app.services.scheduler import SchedulerService
 from app.services.meeting_parser import MeetingParserService
+from app.services.search_index import SearchIndexService
+from app.services.speaker_names import SpeakerNameService
+from app.services.waveform import WaveformService
 
 
 router = APIRouter(
     prefix="/api/meetings",
-    tags=["meetings"]
+    tags=["meetings"],
+    default_response_class=FastJSONResponse
 )
 
-AUDIO_DIR = Path("data")
-OUTPUT_DIR = Path("output")
+# Shared with the workers; on multi-node setups both must point at the same volume
+AUDIO_DIR = Path(os.getenv("AUDIO_DIR", "data"))
+OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "output"))
 AUDIO_DIR.mkdir(exist_ok=True, parents=True)
 OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
-def process_meeting_audio(meeting_id: int, audio_path: str):
-    db = SessionLocal()
-
-    try:
-        meeting = db.query(models.Meeting).filter(
-            models.Meeting.id == meeting_id
-        ).first()
-
-        if not meeting:
-            return
-
-        meeting.status = "processing"
-        db.commit()
-
-        processing_service = ProcessingService(
-            diarization=meeting.diarization,
-            num_speakers=meeting.num_speakers,
-            model_size="large",
-            device="cpu"
-        )
-
-        result = processing_service.process_meeting_audio(
-            audio_path=audio_path,
-            output_dir=OUTPUT_DIR
-        )
-
-        # =============================
-        # UPDATE MEETING
-        # =============================
-
-        meeting.duration = result["duration"]
-
-        # Remove old transcript/summary/speakers if re-processing
-        db.query(models.Transcript).filter(
-            models.Transcript.meeting_id == meeting_id
-        ).delete()
-
-        db.query(models.Summary).filter(
-            models.Summary.meeting_id == meeting_id
-        ).delete()
-
-        db.query(models.Speaker).filter(
-            models.Speaker.meeting_id == meeting_id
-        ).delete()
-
-        # =============================
-        # SAVE TRANSCRIPT
-        # =============================
-
-        db_transcript = models.Transcript(
-            meeting_id=meeting_id,
-            raw_text=result["raw_text"],
-            reconstructed_text=result["reconstructed_text"]
-        )
-
-        db.add(db_transcript)
-
-        # =============================
-        # SAVE SUMMARY
-        # =============================
-
-        summary = result["summary"]
-
-        db_summary = models.Summary(
-            meeting_id=meeting_id,
-            executive_summary=summary["executive_summary"],
-            topics_json=json.dumps(summary["topics"]),
-            decisions_json=json.dumps(summary["decisions"]),
-            action_items_json=json.dumps(summary["action_items"]),
-            discussions_json=json.dumps(summary["discussions"])
-        )
-
-        db.add(db_summary)
-
-        # =============================
-        # SAVE SPEAKERS
-        # =============================
-
-        for label in result["detected_speakers"]:
-            db.add(models.Speaker(
-                meeting_id=meeting_id,
-                label=label,
-                name=None
-            ))
-
-        meeting.status = "completed"
-        db.commit()
-
-    except Exception as e:
-        print(f"Processing error: {e}")
-
-        meeting = db.query(models.Meeting).filter(
-            models.Meeting.id == meeting_id
-        ).first()
-
-        if meeting:
-            meeting.status = "failed"
-            db.commit()
-
-    finally:
-        db.close()
-
-def replace_speaker_labels(text: str, speakers: list[models.Speaker]) -> str:
-    new_text = text
-    for sp in speakers:
-        if sp.name:
-            new_text = new_text.replace(sp.label, sp.name)
-    return new_text
+SSE_KEEPALIVE_SECONDS = 15
+MEETINGS_PAGE_SIZE = 50
+MEETINGS_MAX_PAGE_SIZE = 200
+SEGMENTS_PAGE_SIZE = 200
+SEGMENTS_MAX_PAGE_SIZE = 1000
+# Whisper never emits segments longer than its 30 s window
+MAX_SEGMENT_SECONDS = 30
+MEETING_LIST_ADAPTER = TypeAdapter(list[schemas.MeetingListItem])
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+AUDIO_CHUNK_SIZE = 64 * 1024
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def too_busy(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=429, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+async def get_meeting_or_404(db: AsyncSession, meeting_id: int) -> models.Meeting:
+    meeting = await db.get(models.Meeting, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting
 
 @router.post("/", response_model=schemas.MeetingRead)
 async def create_meeting(
@@ -137,162 +66,618 @@ async def create_meeting(
     file: UploadFile = File(...),
     diarization: bool = Form(False),
     num_speakers: int = Form(-1),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     
     audio_path = AUDIO_DIR / file.filename
     if not audio_path.exists():
-        with open(audio_path, "wb") as f:
-            f.write(await file.read())
+        try:
+            with AdmissionService.upload_slot():
+                # Stream to disk in chunks instead of holding the whole upload in memory
+                tmp_path = audio_path.with_name(audio_path.name + ".part")
+                written = 0
+                try:
+                    with open(tmp_path, "wb") as f:
+                        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                            written += len(chunk)
+                            if written > ADMISSION_MAX_UPLOAD_MB * 1024 * 1024:
+                                raise HTTPException(status_code=413, detail=f"Audio file larger than {ADMISSION_MAX_UPLOAD_MB:.0f} MB")
+                            f.write(chunk)
+                    os.replace(tmp_path, audio_path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+        except AdmissionRejected as e:
+            raise too_busy(e)
 
     meeting = models.Meeting(
         title=title,
         date=datetime.fromisoformat(date),
         audio_file_path=str(audio_path),
+        duration=await asyncio.to_thread(AudioProcessor.probe_duration, str(audio_path)),
         status="pending",
         diarization=diarization,
-        num_speakers=num_speakers if diarization else -1
+        num_speakers=num_speakers if diarization else -1,
+        speakers=[]
     )
     db.add(meeting)
-    db.commit()
-    db.refresh(meeting)
+    await db.commit()
     return meeting
 
 
-@router.get("/", response_model=list[schemas.MeetingRead])
-def list_meetings(db: Session = Depends(get_db)):
-    meetings = db.query(models.Meeting).options(joinedload(models.Meeting.speakers)).order_by(models.Meeting.created_at.desc()).all()
-    return meetings
+def encode_cursor(created_at: datetime, meeting_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), meeting_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
 
-@router.get("/{meeting_id}", response_model=schemas.MeetingRead)
-def get_meeting(meeting_id: int, db: Session = Depends(get_db)):
-    meeting = db.query(models.Meeting).options(joinedload(models.Meeting.speakers)).filter(models.Meeting.id == meeting_id).first()
-    if not meeting:
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, meeting_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(meeting_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """(first, last) byte of a single "bytes=" range; None means send the whole file."""
+    m = _BYTE_RANGE.match((header or "").strip())
+    if not m or not (m.group(1) or m.group(2)):
+        # Absent, multi-range or another unit: a full 200 response is always allowed
+        return None
+
+    if m.group(1):
+        first = int(m.group(1))
+        last = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+    else:
+        # Suffix range: the last N bytes
+        first, last = max(size - int(m.group(2)), 0), size - 1
+
+    if first >= size or first > last:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return first, last
+
+
+def file_range_response(request: Request, path: Path, media_type: str) -> Response:
+    """Serve a file with byte-range support, so players can seek without downloading all of it."""
+    stat = path.stat()
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    headers = {"Accept-Ranges": "bytes", "ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = parse_byte_range(request.headers.get("range"), size)
+    # If-Range: only resume from a range of the same version of the file
+    if byte_range and request.headers.get("if-range", etag) != etag:
+        byte_range = None
+
+    first, last = byte_range or (0, size - 1)
+
+    def read_range():
+        with open(path, "rb") as f:
+            f.seek(first)
+            remaining = last - first + 1
+            while remaining > 0:
+                chunk = f.read(min(AUDIO_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    headers["Content-Length"] = str(last - first + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+
+    return StreamingResponse(read_range(), status_code=206 if byte_range else 200, media_type=media_type, headers=headers)
+
+
+@router.get("/", response_model=list[schemas.MeetingListItem])
+async def list_meetings(
+    request: Request,
+    limit: int = Query(MEETINGS_PAGE_SIZE, ge=1, le=MEETINGS_MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    status: str | None = Query(None),
+    date_from: datetime | None = Query(None, description="Only meetings held at or after this date"),
+    date_to: datetime | None = Query(None, description="Only meetings held before this date"),
+    include: str | None = Query(None, description="include=speakers adds the speakers of each meeting"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Meetings newest first, one page at a time (keyset pagination on
+    created_at, id). The cursor of the next page is returned in the
+    X-Next-Cursor header; an unchanged page answers If-None-Match with 304.
+    """
+    Meeting = models.Meeting
+
+    speaker_count = select(func.count(models.Speaker.id)).where(
+        models.Speaker.meeting_id == Meeting.id
+    ).correlate(Meeting).scalar_subquery()
+
+    query = select(
+        Meeting.id, Meeting.title, Meeting.date, Meeting.duration,
+        Meeting.status, Meeting.created_at, speaker_count.label("speaker_count")
+    )
+
+    if status:
+        query = query.where(Meeting.status == status)
+    if date_from:
+        query = query.where(Meeting.date >= date_from)
+    if date_to:
+        query = query.where(Meeting.date < date_to)
+    if cursor:
+        created_at, meeting_id = decode_cursor(cursor)
+        query = query.where(or_(
+            Meeting.created_at < created_at,
+            and_(Meeting.created_at == created_at, Meeting.id < meeting_id)
+        ))
+
+    rows = (await db.execute(query.order_by(Meeting.created_at.desc(), Meeting.id.desc()).limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [schemas.MeetingListItem.model_validate(row._mapping) for row in rows]
+
+    if include == "speakers" and items:
+        speakers: dict[int, list] = {item.id: [] for item in items}
+        for speaker in await db.scalars(select(models.Speaker).where(models.Speaker.meeting_id.in_(speakers.keys()))):
+            speakers[speaker.meeting_id].append(schemas.SpeakerRead.model_validate(speaker))
+        for item in items:
+            item.speakers = speakers[item.id]
+
+    body = MEETING_LIST_ADAPTER.dump_json(items)
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if has_more:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{meeting_id}", response_model=schemas.MeetingDetail)
+async def get_meeting(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    """The meeting with its speakers, transcript and summary; hot meetings come from the in-process cache."""
+    aggregate = await meeting_cache.load(db, meeting_id)
+    if aggregate is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    
-    meeting.speakers
 
-    return meeting
+    return Response(content=aggregate.detail_json(), media_type="application/json")
 
 
 @router.delete("/{meeting_id}")
-def delete_meeting(meeting_id: int, db: Session = Depends(get_db)):
-    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-
-    db.delete(meeting)
-    db.commit()
+async def delete_meeting(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    meeting = await get_meeting_or_404(db, meeting_id)
+    audio_path = meeting.audio_file_path
+
+    def delete_all(session: Session):
+        # A running worker notices the job row disappearing and stops at its next checkpoint
+        job = JobQueueService.get_active_job(session, meeting_id)
+        if job:
+            JobQueueService.request_cancel(session, job)
+
+        # Bulk delete instead of loading every segment through the relationship cascade
+        session.query(models.TranscriptSegment).filter(
+            models.TranscriptSegment.meeting_id == meeting_id
+        ).delete(synchronize_session=False)
+        SearchIndexService.remove_meeting(session, meeting_id)
+
+        session.delete(meeting)
+        session.commit()
+
+    await db.run_sync(delete_all)
+    meeting_cache.invalidate(meeting_id)
+    ExportService.remove_meeting(meeting_id)
+    AudioPreviewService.remove_meeting(meeting_id)
+    WaveformService.remove_meeting(meeting_id)
+    # Stage checkpoints and the converted 16 kHz WAV they point at; the recording itself stays
+    await asyncio.to_thread(CheckpointStore.remove_meeting, meeting_id, [audio_path])
     return {"detail": "Meeting deleted"}
 
 
 @router.post("/{meeting_id}/process")
-def process_meeting(meeting_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
-    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
+async def process_meeting(meeting_id: int, x_user: str | None = Header(None), db: AsyncSession = Depends(get_async_db)):
+    meeting = await get_meeting_or_404(db, meeting_id)
     if not os.path.isfile(meeting.audio_file_path):
         raise HTTPException(status_code=400, detail="Audio file missing")
 
-    background_tasks.add_task(process_meeting_audio, meeting_id, meeting.audio_file_path)
-    return {"detail": "Processing started"}
+    # The queue services are synchronous; run_sync executes them on this session's connection
+    def enqueue(session: Session):
+        if JobQueueService.get_active_job(session, meeting_id) is None:
+            AdmissionService.check_job(session, [meeting])
+
+        # Jobs are picked up by the worker processes (python -m app.worker)
+        job, created = JobQueueService.enqueue(session, meeting, submitted_by=x_user or "anonymous")
+        return job, created, SchedulerService.queue_estimate(session, job)
+
+    try:
+        job, created, estimate = await db.run_sync(enqueue)
+    except AdmissionRejected as e:
+        raise too_busy(e)
+    meeting_cache.invalidate(meeting_id)
+
+    broker.publish(job_event(meeting, job))
+    return {
+        "detail": "Processing queued" if created else "Processing already queued",
+        "job": schemas.JobRead.model_validate(job),
+        "queue": estimate
+    }
+
+
+@router.post("/batch-process")
+async def batch_process_meetings(request: schemas.BatchProcessRequest, x_user: str | None = Header(None), db: AsyncSession = Depends(get_async_db)):
+    """
+    Queue several meetings at once. The jobs share a batch id whose progress
+    and throughput can be followed at /batches/{batch_id}.
+    """
+    meeting_ids = list(dict.fromkeys(request.meeting_ids))
+    if not meeting_ids:
+        raise HTTPException(status_code=400, detail="No meetings given")
+
+    batch_id = str(uuid.uuid4())
+    jobs = []
+    skipped = []
+    rejected = None
+
+    def enqueue_all(session: Session):
+        nonlocal rejected
+        meetings = {m.id: m for m in session.query(models.Meeting).filter(models.Meeting.id.in_(meeting_ids)).all()}
+
+        for meeting_id in meeting_ids:
+            meeting = meetings.get(meeting_id)
+            if not meeting:
+                skipped.append({"meeting_id": meeting_id, "detail": "Meeting not found"})
+                continue
+            if not os.path.isfile(meeting.audio_file_path):
+                skipped.append({"meeting_id": meeting_id, "detail": "Audio file missing"})
+                continue
+
+            # Meetings are admitted in order until the queue is full; the rest can be resubmitted later
+            if rejected is None and JobQueueService.get_active_job(session, meeting_id) is None:
+                try:
+                    AdmissionService.check_job(session, [meeting])
+                except AdmissionRejected as e:
+                    rejected = e
+            if rejected is not None:
+                skipped.append({"meeting_id": meeting_id, "detail": rejected.detail})
+                continue
+
+            job, _created = JobQueueService.enqueue(session, meeting, submitted_by=x_user or "anonymous", batch_id=batch_id)
+            meeting_cache.invalidate(meeting_id)
+            broker.publish(job_event(meeting, job))
+            jobs.append(schemas.JobRead.model_validate(job))
+
+    await db.run_sync(enqueue_all)
+
+    if rejected is not None and not jobs:
+        raise too_busy(rejected)
+
+    return {
+        "batch_id": batch_id,
+        "jobs": jobs,
+        "skipped": skipped,
+        "retry_after": rejected.retry_after if rejected else None
+    }
+
+
+@router.get("/batches/{batch_id}")
+async def batch_status(batch_id: str, db: AsyncSession = Depends(get_async_db)):
+    summary = await db.run_sync(JobQueueService.batch_summary, batch_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return summary
+
+
+@router.post("/{meeting_id}/cancel")
+async def cancel_meeting_processing(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    meeting = await get_meeting_or_404(db, meeting_id)
+
+    job = await db.run_sync(JobQueueService.get_active_job, meeting_id)
+    if not job:
+        raise HTTPException(status_code=409, detail="No processing job to cancel")
+
+    cancelled = await db.run_sync(JobQueueService.request_cancel, job)
+    meeting_cache.invalidate(meeting_id)
+    broker.publish(job_event(meeting, job))
+    return {
+        "detail": "Processing cancelled" if cancelled else "Cancellation requested",
+        "job": schemas.JobRead.model_validate(job)
+    }
 
 
 @router.get("/{meeting_id}/status")
-def meeting_status(meeting_id: int, db: Session = Depends(get_db)):
-    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
-    if not meeting:
+async def meeting_status(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    meeting = await get_meeting_or_404(db, meeting_id)
+
+    job = await db.scalar(
+        select(models.Job).where(models.Job.meeting_id == meeting_id).order_by(models.Job.id.desc()).limit(1)
+    )
+    return {
+        "status": meeting.status,
+        "job": schemas.JobRead.model_validate(job) if job else None
+    }
+
+
+@router.get("/{meeting_id}/events")
+async def meeting_events(meeting_id: int, request: Request):
+    """
+    Server-sent events with the meeting status, job stage and progress.
+    Updates come from the in-process broker; the database is only read once
+    here for the initial snapshot, which is always fresh.
+    """
+    snapshot = await asyncio.to_thread(relay.snapshot, meeting_id)
+    if snapshot["status"] == "deleted":
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return {"status": meeting.status}
 
+    queue = broker.subscribe(meeting_id, snapshot)
+
+    def format_event(event: dict) -> str:
+        return f"event: status\ndata: {json.dumps(event)}\n\n"
+
+    def is_finished(event: dict) -> bool:
+        return event["status"] == "deleted" or event["job_status"] in TERMINAL_JOB_STATUSES
+
+    async def stream():
+        try:
+            yield format_event(snapshot)
+            if is_finished(snapshot):
+                return
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield format_event(event)
+                if is_finished(event):
+                    return
+        finally:
+            broker.unsubscribe(meeting_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-@router.put("/{meeting_id}/speakers")
-def update_speakers(meeting_id: int, speakers: list[schemas.SpeakerCreate], db: Session = Depends(get_db)):
-    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
 
-    for sp in speakers:
-        speaker = db.query(models.Speaker).filter(
-            models.Speaker.meeting_id == meeting_id, models.Speaker.label == sp.label
-        ).first()
-        if speaker:
-            speaker.name = sp.name
-        else:
-            db.add(models.Speaker(meeting_id=meeting_id, label=sp.label, name=sp.name))
-    all_speakers = db.query(models.Speaker).filter(models.Speaker.meeting_id == meeting_id).all()
+@router.get("/{meeting_id}/queue")
+async def meeting_queue(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    await get_meeting_or_404(db, meeting_id)
 
-    # Update transcript
-    transcript = db.query(models.Transcript).filter(models.Transcript.meeting_id == meeting_id).first()
-    if transcript:
-        transcript.reconstructed_text = replace_speaker_labels(transcript.reconstructed_text, all_speakers)
-    
-    # Update summary executive_summary
-    summary = db.query(models.Summary).filter(models.Summary.meeting_id == meeting_id).first()
-    if summary:
-        summary.executive_summary = replace_speaker_labels(summary.executive_summary, all_speakers)
-    
-    db.commit()
-    return {"detail": "Speakers updated and transcript/summary refreshed"}
+    job = await db.run_sync(JobQueueService.get_active_job, meeting_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Meeting is not queued")
 
-@router.get("/{meeting_id}/export")
-def export_meeting(meeting_id: int, format: str = "txt", db: Session = Depends(get_db)):
-    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
+    estimate = await db.run_sync(SchedulerService.queue_estimate, job)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "position": estimate["position"] if estimate else 0,
+        "expected_start": estimate["expected_start"] if estimate else job.started_at,
+        "expected_wait_seconds": estimate["expected_wait_seconds"] if estimate else 0.0,
+        "expected_seconds": job.expected_seconds
+    }
 
-    transcript = db.query(models.Transcript).filter(models.Transcript.meeting_id == meeting_id).first()
-    summary = db.query(models.Summary).filter(models.Summary.meeting_id == meeting_id).first()
-    speakers = db.query(models.Speaker).filter(models.Speaker.meeting_id == meeting_id).all()
-
-    if format == "json":
-        data = {
-            "meeting": {
-                "id": meeting.id,
-                "title": meeting.title,
-                "date": str(meeting.date),
-                "status": meeting.status,
-            },
-            "transcript": transcript.reconstructed_text if transcript else None,
-            "summary": {
-                "executive_summary": summary.executive_summary if summary else None,
-                "topics": json.loads(summary.topics_json) if summary else [],
-                "decisions": json.loads(summary.decisions_json) if summary else [],
-                "action_items": json.loads(summary.action_items_json) if summary else [],
-                "discussions": json.loads(summary.discussions_json) if summary else []
-            },
-            "speakers": [{ "label": s.label, "name": s.name } for s in speakers]
+
+def like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@router.get("/{meeting_id}/segments", response_model=schemas.TranscriptSegmentPage)
+async def meeting_segments(
+    meeting_id: int,
+    start: float | None = Query(None, ge=0, description="Only segments ending after this time (seconds)"),
+    end: float | None = Query(None, ge=0, description="Only segments starting before this time (seconds)"),
+    speaker: str | None = Query(None, description="Speaker label, e.g. speaker_0"),
+    after: int | None = Query(None, ge=-1, description="Position of the last segment of the previous page"),
+    limit: int = Query(SEGMENTS_PAGE_SIZE, ge=1, le=SEGMENTS_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Transcript segments in order, optionally limited to a time range and/or a
+    speaker, one page at a time (keyset pagination on the segment position).
+    """
+    await get_meeting_or_404(db, meeting_id)
+
+    Segment = models.TranscriptSegment
+    query = select(Segment).where(Segment.meeting_id == meeting_id)
+
+    if start is not None:
+        # The lower bound on start lets the (meeting_id, start) index narrow the range from both sides
+        query = query.where(Segment.start > start - MAX_SEGMENT_SECONDS, Segment.end > start)
+    if end is not None:
+        query = query.where(Segment.start < end)
+    if speaker is not None:
+        # Segments where several people talk have labels like "speaker_0 + speaker_1";
+        # the label is matched literally, its "_" (and any "%") is not a wildcard
+        label = like_escape(speaker)
+        query = query.where(or_(
+            Segment.speaker == speaker,
+            Segment.speaker.like(f"{label} + %", escape="\\"),
+            Segment.speaker.like(f"% + {label}", escape="\\")
+        ))
+    if after is not None:
+        query = query.where(Segment.position > after)
+
+    items = (await db.scalars(query.order_by(Segment.position).limit(limit + 1))).all()
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    names = await db.run_sync(SpeakerNameService.names_for_meeting, meeting_id)
+    pages = []
+    for item in items:
+        segment = schemas.TranscriptSegmentRead.model_validate(item)
+        segment.speaker_name = SpeakerNameService.render(item.speaker, names)
+        pages.append(segment)
+
+    return model_response(schemas.TranscriptSegmentPage(
+        items=pages,
+        next_after=items[-1].position if has_more else None
+    ))
+
+
+@router.get("/{meeting_id}/audio")
+async def meeting_audio(
+    request: Request,
+    meeting_id: int,
+    rendition: str = Query("preview", pattern="^(preview|original)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Meeting audio with HTTP Range support (206 Partial Content). The default
+    preview is a small Opus rendition made by the workers; while it does not
+    exist the original is served (X-Audio-Rendition tells which) and a worker
+    is asked to encode it. rendition=original always serves the uploaded file.
+    """
+    meeting = await get_meeting_or_404(db, meeting_id)
+    if not os.path.isfile(meeting.audio_file_path):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    if rendition == "preview":
+        path = AudioPreviewService.available(meeting_id)
+        if path is not None:
+            response = file_range_response(request, path, AUDIO_PREVIEW_MEDIA_TYPE)
+            response.headers["X-Audio-Rendition"] = "preview"
+            return response
+        # Never transcode in the API process
+        AudioPreviewService.request(meeting_id)
+
+    media_type = mimetypes.guess_type(meeting.audio_file_path)[0] or "application/octet-stream"
+    response = file_range_response(request, Path(meeting.audio_file_path), media_type)
+    response.headers["X-Audio-Rendition"] = "original"
+    return response
+
+
+@router.get("/{meeting_id}/waveform/levels")
+async def meeting_waveform_levels(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    await get_meeting_or_404(db, meeting_id)
+
+    meta = WaveformService.meta(meeting_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Waveform not available, process the meeting first")
+    return meta
+
+
+@router.get("/{meeting_id}/waveform")
+async def meeting_waveform(
+    meeting_id: int,
+    start: float = Query(0.0, ge=0),
+    end: float | None = Query(None, ge=0),
+    pixels: int | None = Query(None, ge=1, description="Width to draw; picks the coarsest level with a peak per pixel"),
+    samples_per_peak: int | None = Query(None, description="Exact level, one of /waveform/levels"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Min/max peaks between start and end (seconds) as binary interleaved
+    (min, max) pairs of X-Waveform-Dtype. The first pair starts at
+    X-Waveform-Start seconds; each covers X-Waveform-Samples-Per-Peak samples.
+    """
+    meeting = await get_meeting_or_404(db, meeting_id)
+
+    meta = WaveformService.meta(meeting_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Waveform not available, process the meeting first")
+
+    level = WaveformService.choose_level(meta, start, end if end is not None else meeting.duration or 0.0, pixels, samples_per_peak)
+    if level is None:
+        raise HTTPException(status_code=400, detail="Unknown samples_per_peak")
+
+    first, data = await asyncio.to_thread(WaveformService.window, meeting_id, meta, level, start, end)
+
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={
+            "X-Waveform-Dtype": meta["dtype"],
+            "X-Waveform-Sample-Rate": str(meta["sample_rate"]),
+            "X-Waveform-Samples-Per-Peak": str(level["samples_per_peak"]),
+            "X-Waveform-Start": f"{first * level['samples_per_peak'] / meta['sample_rate']:.3f}",
+            "Cache-Control": "max-age=3600"
         }
-        out_file = OUTPUT_DIR / f"meeting_{meeting_id}.json"
-        out_file.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-        return FileResponse(out_file, media_type="application/json", filename=out_file.name)
+    )
 
-    elif format in ["txt", "md"]:
 
-        out_file = OUTPUT_DIR / f"meeting_{meeting_id}.{format}"
+@router.put("/{meeting_id}/speakers")
+async def update_speakers(meeting_id: int, speakers: list[schemas.SpeakerCreate], db: AsyncSession = Depends(get_async_db)):
+    meeting = await get_meeting_or_404(db, meeting_id)
 
-        lines = []
+    existing = {
+        speaker.label: speaker for speaker in await db.scalars(
+            select(models.Speaker).where(models.Speaker.meeting_id == meeting_id)
+        )
+    }
+    for sp in speakers:
+        speaker = existing.get(sp.label)
+        if speaker:
+            speaker.name = sp.name
+        else:
+            db.add(models.Speaker(meeting_id=meeting_id, label=sp.label, name=sp.name))
 
-        if transcript:
-            lines.append("--- Transcript ---")
-            lines.append(transcript.reconstructed_text)
-            lines.append("")
+    # Transcripts and the search index keep speaker labels; names are applied when they are read
+    # or exported. Only the meeting's speaker name entries in the search index are rewritten.
+    await db.run_sync(SearchIndexService.index_speakers, meeting_id)
+    # Exports rendered with the old names are no longer current
+    meeting.content_version = (meeting.content_version or 0) + 1
+    await db.commit()
+    meeting_cache.invalidate(meeting_id)
+    return {"detail": "Speakers updated"}
 
-        if summary:
-            minutes = MeetingParserService.from_db_summary(summary)
+@router.get("/{meeting_id}/export")
+async def export_meeting(request: Request, meeting_id: int, format: str = "txt", db: AsyncSession = Depends(get_async_db)):
+    """
+    Export as txt, md, json, or srt/vtt subtitles timed from the transcript
+    segments. Exports are cached per meeting content version, which is also
+    the ETag; If-None-Match answers 304 without touching the transcript.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Unsupported format")
 
-            temp_summary_file = OUTPUT_DIR / f"_temp_summary_{meeting_id}.txt"
-            MeetingParserService.save_minutes_to_file(minutes, temp_summary_file)
+    aggregate = await meeting_cache.load(db, meeting_id)
+    if aggregate is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
 
-            summary_text = temp_summary_file.read_text(encoding="utf-8")
-            lines.append(summary_text)
+    filename = f"meeting_{meeting_id}.{format}"
+    headers = {
+        "ETag": ExportService.etag(meeting_id, aggregate.content_version, aggregate.status, format),
+        "Cache-Control": "no-cache",
+        "Content-Disposition": f'attachment; filename="{filename}"'
+    }
 
-            temp_summary_file.unlink(missing_ok=True)
+    if headers["ETag"] in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
 
-        out_file.write_text("\n".join(lines), encoding="utf-8")
+    cached = ExportService.cached(meeting_id, aggregate.content_version, aggregate.status, format)
+    if cached:
+        return FileResponse(cached, media_type=EXPORT_FORMATS[format], headers=headers)
 
-        return FileResponse(out_file, media_type="text/plain", filename=out_file.name)
+    names = aggregate.names
+    transcript = aggregate.transcript
+    transcript_text = SpeakerNameService.render(transcript.reconstructed_text, names) if transcript else None
 
+    if format in ("txt", "md"):
+        chunks = ExportService.render_text(transcript_text, aggregate.summary, names)
     else:
-        raise HTTPException(status_code=400, detail="Unsupported format")
+        segments = (await db.scalars(
+            select(models.TranscriptSegment).where(
+                models.TranscriptSegment.meeting_id == meeting_id
+            ).order_by(models.TranscriptSegment.position)
+        )).all()
+        # The raw transcript keeps its "[start - end] (speaker)" lines for meetings without segments
+        cues = ExportService.cues(segments, transcript.raw_text if transcript else None, names)
+
+        if format == "json":
+            chunks = ExportService.render_json(aggregate.meeting, transcript_text, aggregate.summary, cues, names)
+        else:
+            chunks = ExportService.render_subtitles(cues, format)
+
+    return StreamingResponse(
+        ExportService.stream_to_cache(chunks, ExportService.cache_path(meeting_id, aggregate.content_version, aggregate.status, format)),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers
+    )
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.responses import FastJSONResponse
+from app.services.search_index import SearchIndexService
+
+
+router = APIRouter(
+    prefix="/api/search",
+    tags=["search"],
+    default_response_class=FastJSONResponse
+)
+
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1, description="Words to search for; all of them must match"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ranked search over transcript segments, speaker names and summaries of all meetings."""
+    result = await db.run_sync(SearchIndexService.search, q, limit=limit, offset=offset)
+    return {
+        "query": q,
+        "total": result["total"],
+        "limit": limit,
+        "offset": offset,
+        "items": result["items"]
+    }
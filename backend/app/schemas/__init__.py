@@ -1,4 +1,6 @@
-from .meeting import MeetingCreate, MeetingRead
+from .meeting import MeetingCreate, MeetingRead, MeetingDetail, MeetingListItem
 from .speaker import SpeakerCreate, SpeakerRead
 from .transcript import TranscriptCreate, TranscriptRead
-from .summary import SummaryCreate, SummaryRead
\ No newline at end of file
+from .transcript_segment import TranscriptSegmentRead, TranscriptSegmentPage
+from .summary import SummaryCreate, SummaryRead, SummaryDetail
+from .job import JobRead, BatchProcessRequest
\ No newline at end of file
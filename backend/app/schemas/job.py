@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+class JobRead(BaseModel):
+    id: int
+    meeting_id: int
+    status: str
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    worker_id: str | None
+    submitted_by: str
+    expected_seconds: float | None
+    batch_id: str | None
+    last_error: str | None
+    stage: str | None
+    progress: float | None
+    created_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+class BatchProcessRequest(BaseModel):
+    meeting_ids: list[int]
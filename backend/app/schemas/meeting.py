@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional, List
 from .speaker import SpeakerRead
+from .summary import SummaryDetail
+from .transcript import TranscriptRead
 
 class MeetingCreate(BaseModel):
     title: str
@@ -17,4 +19,22 @@ class MeetingRead(BaseModel):
     created_at: datetime
     speakers: List[SpeakerRead] = []
 
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+class MeetingDetail(MeetingRead):
+    # Speaker names applied
+    transcript: Optional[TranscriptRead] = None
+    summaries: List[SummaryDetail] = []
+
+class MeetingListItem(BaseModel):
+    id: int
+    title: str
+    date: datetime
+    duration: Optional[float]
+    status: str
+    created_at: datetime
+    speaker_count: int = 0
+    # Only filled when the list is requested with include=speakers
+    speakers: Optional[List[SpeakerRead]] = None
+
+    model_config = {"from_attributes": True}
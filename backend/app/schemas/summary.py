@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 import json
-from typing import List
+from typing import Any, List
 
 class SummaryCreate(BaseModel):
     meeting_id: int
@@ -36,3 +36,11 @@ class SummaryRead(BaseModel):
         return json.loads(self.discussions_json) if self.discussions_json else []
 
     model_config = {"from_attributes": True}
+
+class SummaryDetail(BaseModel):
+    """Summary with its JSON columns already parsed."""
+    executive_summary: str | None = None
+    topics: List[Any] = []
+    decisions: List[Any] = []
+    action_items: List[Any] = []
+    discussions: List[Any] = []
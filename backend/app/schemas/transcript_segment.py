@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+class TranscriptSegmentRead(BaseModel):
+    id: int
+    position: int
+    start: float
+    end: float
+    speaker: str | None
+    # The speaker label with the names given to the meeting's speakers applied
+    speaker_name: str | None = None
+    raw_text: str
+    text: str | None
+    confidence: float | None
+
+    model_config = {"from_attributes": True}
+
+class TranscriptSegmentPage(BaseModel):
+    items: list[TranscriptSegmentRead]
+    # Pass as `after` to fetch the next page; None on the last page
+    next_after: int | None
@@ -0,0 +1,138 @@
+import math
+import os
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models.job import JobStatus
+from app.services.scheduler import SCHEDULER_DEFAULT_DURATION, SCHEDULER_TOTAL_SLOTS, SchedulerService
+
+# Seconds of audio that may be queued or running before new work is refused
+ADMISSION_MAX_QUEUED_AUDIO_SECONDS = float(os.getenv("ADMISSION_MAX_QUEUED_AUDIO_SECONDS", str(8 * 3600)))
+# Memory available to the jobs running at the same time (0 = 80% of the machine's memory)
+ADMISSION_MEMORY_BUDGET_MB = float(os.getenv("ADMISSION_MEMORY_BUDGET_MB", "0"))
+# Estimated peak memory of one job: the loaded models plus the decoded audio and diarization buffers
+ADMISSION_JOB_BASE_MEMORY_MB = float(os.getenv("ADMISSION_JOB_BASE_MEMORY_MB", "3500"))
+ADMISSION_JOB_MEMORY_PER_AUDIO_HOUR_MB = float(os.getenv("ADMISSION_JOB_MEMORY_PER_AUDIO_HOUR_MB", "600"))
+ADMISSION_MAX_UPLOAD_MB = float(os.getenv("ADMISSION_MAX_UPLOAD_MB", "1024"))
+ADMISSION_MAX_CONCURRENT_UPLOADS = int(os.getenv("ADMISSION_MAX_CONCURRENT_UPLOADS", "4"))
+ADMISSION_MIN_RETRY_AFTER = 5
+ADMISSION_MAX_RETRY_AFTER = 3600
+
+ACTIVE_STATUSES = (JobStatus.queued, JobStatus.running)
+
+
+def _total_memory_mb() -> Optional[float]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_budget_mb() -> Optional[float]:
+    if ADMISSION_MEMORY_BUDGET_MB > 0:
+        return ADMISSION_MEMORY_BUDGET_MB
+    total = _total_memory_mb()
+    return total * 0.8 if total else None
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionService:
+    """
+    Refuses new work while the queue already holds more audio than the
+    workers can get through in reasonable time, or while the jobs that would
+    run side by side are estimated to exceed the memory budget.
+    """
+
+    _uploads = 0
+    _uploads_lock = threading.Lock()
+
+    @staticmethod
+    def job_memory_mb(duration: Optional[float]) -> float:
+        hours = (duration or SCHEDULER_DEFAULT_DURATION) / 3600
+        return ADMISSION_JOB_BASE_MEMORY_MB + ADMISSION_JOB_MEMORY_PER_AUDIO_HOUR_MB * hours
+
+    @staticmethod
+    def active_durations(db: Session) -> list[Optional[float]]:
+        rows = db.query(models.Meeting.duration).join(
+            models.Job, models.Job.meeting_id == models.Meeting.id
+        ).filter(models.Job.status.in_(ACTIVE_STATUSES)).all()
+        return [duration for (duration,) in rows]
+
+    @staticmethod
+    def load(db: Session, durations: Optional[list[Optional[float]]] = None) -> dict:
+        if durations is None:
+            durations = AdmissionService.active_durations(db)
+        running = db.query(func.count(models.Job.id)).filter(models.Job.status == JobStatus.running).scalar() or 0
+
+        queued_audio = sum(d or SCHEDULER_DEFAULT_DURATION for d in durations)
+
+        # Peak memory: the largest jobs that can occupy the worker slots at the same time
+        concurrent = sorted((AdmissionService.job_memory_mb(d) for d in durations), reverse=True)[:SCHEDULER_TOTAL_SLOTS]
+
+        return {
+            "active_jobs": len(durations),
+            "running_jobs": running,
+            "worker_slots": SCHEDULER_TOTAL_SLOTS,
+            "queued_audio_seconds": queued_audio,
+            "max_queued_audio_seconds": ADMISSION_MAX_QUEUED_AUDIO_SECONDS,
+            "estimated_memory_mb": sum(concurrent),
+            "memory_budget_mb": memory_budget_mb(),
+            "uploads_in_progress": AdmissionService._uploads,
+            "max_concurrent_uploads": ADMISSION_MAX_CONCURRENT_UPLOADS
+        }
+
+    @staticmethod
+    def retry_after(db: Session, excess_audio_seconds: float) -> int:
+        # Time for the workers to get through the audio that is over the limit
+        rtf = sum(SchedulerService.stage_rtfs(db).values())
+        seconds = excess_audio_seconds * rtf / max(SCHEDULER_TOTAL_SLOTS, 1)
+        return int(min(max(math.ceil(seconds), ADMISSION_MIN_RETRY_AFTER), ADMISSION_MAX_RETRY_AFTER))
+
+    @staticmethod
+    def check_job(db: Session, meetings: list[models.Meeting]):
+        """Raise AdmissionRejected if queueing these meetings would overload the workers."""
+        durations = AdmissionService.active_durations(db)
+        load = AdmissionService.load(db, durations)
+        new_durations = [m.duration or SCHEDULER_DEFAULT_DURATION for m in meetings]
+
+        queued_audio = load["queued_audio_seconds"] + sum(new_durations)
+        excess = queued_audio - ADMISSION_MAX_QUEUED_AUDIO_SECONDS
+        if excess > 0 and load["active_jobs"] > 0:
+            raise AdmissionRejected(
+                f"Processing queue is full ({load['queued_audio_seconds'] / 3600:.1f} h of audio queued)",
+                AdmissionService.retry_after(db, excess)
+            )
+
+        budget = load["memory_budget_mb"]
+        if budget:
+            concurrent = sorted((AdmissionService.job_memory_mb(d) for d in durations + [m.duration for m in meetings]), reverse=True)[:SCHEDULER_TOTAL_SLOTS]
+            if sum(concurrent) > budget and load["active_jobs"] > 0:
+                raise AdmissionRejected(
+                    f"Not enough memory for more jobs ({sum(concurrent):.0f} MB estimated, {budget:.0f} MB available)",
+                    AdmissionService.retry_after(db, load["queued_audio_seconds"] / max(load["active_jobs"], 1))
+                )
+
+    @staticmethod
+    @contextmanager
+    def upload_slot():
+        """Limits the number of uploads written to disk at the same time."""
+        with AdmissionService._uploads_lock:
+            if AdmissionService._uploads >= ADMISSION_MAX_CONCURRENT_UPLOADS:
+                raise AdmissionRejected("Too many uploads in progress", ADMISSION_MIN_RETRY_AFTER)
+            AdmissionService._uploads += 1
+        try:
+            yield
+        finally:
+            with AdmissionService._uploads_lock:
+                AdmissionService._uploads -= 1
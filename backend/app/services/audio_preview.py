@@ -0,0 +1,79 @@
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from app.services.audio_processor import AudioProcessor
+
+# Low-bitrate playback renditions, one per meeting
+AUDIO_PREVIEW_DIR = Path(os.getenv("OUTPUT_DIR", "output")) / "previews"
+AUDIO_PREVIEW_BITRATE = os.getenv("AUDIO_PREVIEW_BITRATE", "24k")
+AUDIO_PREVIEW_MEDIA_TYPE = "audio/webm"
+
+
+class AudioPreviewService:
+    """
+    Compact Opus renditions of meeting audio for playback next to the
+    transcript (about 10 MB per hour at 24 kbit/s). Renditions are only
+    encoded by the workers: after processing, or when the API asked for a
+    missing one (a marker file next to the previews, picked up by an idle
+    worker). They are kept until the meeting is deleted.
+    """
+
+    @staticmethod
+    def path(meeting_id: int) -> Path:
+        return AUDIO_PREVIEW_DIR / f"meeting_{meeting_id}.webm"
+
+    @staticmethod
+    def _request_path(meeting_id: int) -> Path:
+        return AUDIO_PREVIEW_DIR / f"meeting_{meeting_id}.requested"
+
+    @staticmethod
+    def available(meeting_id: int) -> Optional[Path]:
+        path = AudioPreviewService.path(meeting_id)
+        return path if path.is_file() else None
+
+    @staticmethod
+    def request(meeting_id: int):
+        """Ask the workers to encode the preview of a meeting. Cheap, safe to call on every miss."""
+        marker = AudioPreviewService._request_path(meeting_id)
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch(exist_ok=True)
+
+    @staticmethod
+    def take_request() -> Optional[int]:
+        """Claim one requested preview; the marker is removed, so only one worker encodes it."""
+        for marker in sorted(AUDIO_PREVIEW_DIR.glob("meeting_*.requested")):
+            try:
+                marker.unlink()
+            except FileNotFoundError:
+                # Another worker took it
+                continue
+            try:
+                return int(marker.stem.split("_", 1)[1])
+            except ValueError:
+                continue
+        return None
+
+    @staticmethod
+    def ensure(meeting_id: int, source_path: str) -> Path:
+        """Return the preview of a meeting, encoding it first if needed. Blocks while encoding."""
+        path = AudioPreviewService.path(meeting_id)
+        if path.is_file():
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            AudioProcessor.encode_opus_preview(source_path, str(tmp_path), AUDIO_PREVIEW_BITRATE)
+            # Atomic, so the API never serves a half-written file
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        return path
+
+    @staticmethod
+    def remove_meeting(meeting_id: int):
+        AudioPreviewService.path(meeting_id).unlink(missing_ok=True)
+        AudioPreviewService._request_path(meeting_id).unlink(missing_ok=True)
@@ -13,3 +13,11 @@ class AudioProcessor:
     @staticmethod
     def get_audio_duration(wav_path: str) -> float:
         return audio_utils.get_audio_duration(wav_path)
+
+    @staticmethod
+    def encode_opus_preview(input_path: str, output_path: str, bitrate: str = "24k") -> str:
+        return audio_utils.encode_opus_preview(input_path, output_path, bitrate)
+
+    @staticmethod
+    def probe_duration(input_path: str) -> float | None:
+        return audio_utils.probe_duration(input_path)
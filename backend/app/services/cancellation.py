@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+
+from app import models
+from app.database import SessionLocal
+from app.services.job_queue import JobQueueService
+
+JOB_CANCEL_POLL_INTERVAL = 1.0
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "10"))
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class CancellationToken:
+    """Thread-safe flag checked by the pipeline between segments, diarization callbacks and LLM chunks."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason: str = "cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class JobWatcher(threading.Thread):
+    """
+    Side thread running next to the pipeline. It renews the job lease every
+    heartbeat interval and polls the job row every second, tripping the
+    cancellation token when the job is cancelled or deleted, or when the
+    lease was lost to another worker.
+    """
+
+    def __init__(self, job_id: int, token: CancellationToken, worker_id: str = None, interval: float = JOB_CANCEL_POLL_INTERVAL, heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL, session_factory=SessionLocal):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.token = token
+        self.worker_id = worker_id
+        self.interval = interval
+        self.heartbeat_interval = heartbeat_interval
+        self.session_factory = session_factory
+        self._stopped = threading.Event()
+        self._last_heartbeat = time.monotonic()
+
+    def stop(self):
+        self._stopped.set()
+
+    def check(self):
+        db = self.session_factory()
+        try:
+            if self.worker_id and time.monotonic() - self._last_heartbeat >= self.heartbeat_interval:
+                if not JobQueueService.heartbeat(db, self.job_id, self.worker_id):
+                    self.token.cancel("lease_lost")
+                    return
+                self._last_heartbeat = time.monotonic()
+
+            cancel_requested = db.query(models.Job.cancel_requested).filter(
+                models.Job.id == self.job_id
+            ).scalar()
+        finally:
+            db.close()
+
+        # A missing row means the meeting (and its jobs) was deleted
+        if cancel_requested is None or cancel_requested:
+            self.token.cancel()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Job watcher error for job {self.job_id}: {e}")
+
+            if self.token.is_cancelled():
+                return
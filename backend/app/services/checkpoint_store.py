@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func
+
+from app import models
+from app.database import SessionLocal
+
+# Point OUTPUT_DIR at a shared volume when workers run on several nodes
+ARTIFACT_DIR = Path(os.getenv("OUTPUT_DIR", "output")) / "artifacts"
+
+
+class CheckpointStore:
+    """
+    Persists the output of each pipeline stage as a versioned JSON artifact
+    tied to a job. A stage whose input fingerprint matches a stored artifact
+    of the same meeting is loaded instead of recomputed.
+    """
+
+    def __init__(self, job_id: int, meeting_id: int, artifact_dir: Path = ARTIFACT_DIR, session_factory=SessionLocal):
+        self.job_id = job_id
+        self.meeting_id = meeting_id
+        self.artifact_dir = Path(artifact_dir) / f"meeting_{meeting_id}"
+        self.session_factory = session_factory
+
+    @staticmethod
+    def fingerprint(*parts: Any) -> str:
+        data = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def file_fingerprint(path: str) -> str:
+        stat = os.stat(path)
+        return CheckpointStore.fingerprint(str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def _referenced_files(path) -> list[str]:
+        try:
+            return json.loads(Path(path).read_text(encoding="utf-8")).get("files", [])
+        except (OSError, ValueError):
+            return []
+
+    @staticmethod
+    def remove_meeting(meeting_id: int, keep: Iterable[str] = (), artifact_dir: Path = ARTIFACT_DIR):
+        """Delete the checkpoints of a meeting and the files they point at (e.g. the converted WAV), except keep."""
+        directory = Path(artifact_dir) / f"meeting_{meeting_id}"
+        if not directory.is_dir():
+            return
+
+        protected = {Path(p).resolve() for p in keep}
+        for path in directory.glob("*.json"):
+            for f in CheckpointStore._referenced_files(path):
+                if Path(f).resolve() not in protected:
+                    Path(f).unlink(missing_ok=True)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    def prune(self, keep: Iterable[str] = ()) -> int:
+        """
+        Delete the artifacts superseded by a newer version of the same stage,
+        with the files only they point at. Returns how many were deleted.
+        """
+        db = self.session_factory()
+        try:
+            artifacts = db.query(models.JobArtifact).filter(
+                models.JobArtifact.meeting_id == self.meeting_id
+            ).order_by(models.JobArtifact.stage, models.JobArtifact.version.desc()).all()
+
+            latest, superseded = {}, []
+            for artifact in artifacts:
+                if artifact.stage in latest:
+                    superseded.append(artifact)
+                else:
+                    latest[artifact.stage] = artifact
+            if not superseded:
+                return 0
+
+            paths = [artifact.path for artifact in superseded]
+            latest_paths = [artifact.path for artifact in latest.values()]
+            for artifact in superseded:
+                db.delete(artifact)
+            db.commit()
+        finally:
+            db.close()
+
+        # Rows go first: a stage whose checkpoint file is missing is simply recomputed
+        protected = {Path(p).resolve() for p in keep}
+        protected.update(Path(f).resolve() for path in latest_paths for f in self._referenced_files(path))
+        for path in paths:
+            for f in self._referenced_files(path):
+                if Path(f).resolve() not in protected:
+                    Path(f).unlink(missing_ok=True)
+            Path(path).unlink(missing_ok=True)
+        return len(paths)
+
+    def load(self, stage: str, input_key: str) -> Optional[Any]:
+        db = self.session_factory()
+        try:
+            artifact = db.query(models.JobArtifact).filter(
+                models.JobArtifact.meeting_id == self.meeting_id,
+                models.JobArtifact.stage == stage,
+                models.JobArtifact.input_key == input_key
+            ).order_by(models.JobArtifact.version.desc()).first()
+        finally:
+            db.close()
+
+        if artifact is None or not os.path.isfile(artifact.path):
+            return None
+
+        content = json.loads(Path(artifact.path).read_text(encoding="utf-8"))
+
+        # Artifacts that point at files on disk (e.g. the converted WAV) are only valid while those files exist
+        if any(not os.path.isfile(f) for f in content.get("files", [])):
+            return None
+
+        return content["payload"]
+
+    def save(self, stage: str, input_key: str, payload: Any, files: Optional[list[str]] = None, elapsed_seconds: Optional[float] = None):
+        db = self.session_factory()
+        try:
+            latest = db.query(func.max(models.JobArtifact.version)).filter(
+                models.JobArtifact.meeting_id == self.meeting_id,
+                models.JobArtifact.stage == stage
+            ).scalar()
+            version = (latest or 0) + 1
+
+            self.artifact_dir.mkdir(parents=True, exist_ok=True)
+            path = self.artifact_dir / f"{stage}_v{version}.json"
+
+            # Write to a temp file first so a crash never leaves a truncated artifact behind
+            tmp_path = path.with_suffix(".json.tmp")
+            tmp_path.write_text(
+                json.dumps({"payload": payload, "files": files or []}, ensure_ascii=False),
+                encoding="utf-8"
+            )
+            os.replace(tmp_path, path)
+
+            db.add(models.JobArtifact(
+                job_id=self.job_id,
+                meeting_id=self.meeting_id,
+                stage=stage,
+                version=version,
+                input_key=input_key,
+                path=str(path),
+                elapsed_seconds=elapsed_seconds
+            ))
+            db.commit()
+        finally:
+            db.close()
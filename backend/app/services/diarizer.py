@@ -1,20 +1,13 @@
 # app/services/diarizer_service.py
 import soundfile as sf
-from typing import List, Optional
+from typing import Callable, List, Optional
 from pathlib import Path
 from scripts.utils import diarizer as diarizer_utils
+from scripts.utils import model_pool
 from scripts.utils.transcriber import TranscriptSegment
 
-_diarizer_instance = None
-
 def get_diarizer(num_speakers: int = -1, cluster_threshold: float = 0.5):
-    global _diarizer_instance
-    if _diarizer_instance is None:
-        _diarizer_instance = diarizer_utils.load_diarizer(
-            num_speakers=num_speakers,
-            cluster_threshold=cluster_threshold
-        )
-    return _diarizer_instance
+    return model_pool.get_diarizer(num_speakers=num_speakers, cluster_threshold=cluster_threshold)
 
 
 class DiarizationService:
@@ -24,10 +17,23 @@ class DiarizationService:
         self.cluster_threshold = cluster_threshold
         self.diarizer_model = get_diarizer(num_speakers, cluster_threshold)
 
-    def diarize(self, wav_path: str) -> list:
+    def diarize(self, wav_path: str, should_stop: Optional[Callable[[], bool]] = None, on_progress: Optional[Callable[[float], None]] = None) -> List[diarizer_utils.DiarizationSegment]:
         samples, _sample_rate = sf.read(wav_path)
-        segments = self.diarizer_model.process(samples=samples, callback=None)
-        return segments.sort_by_start_time()
+
+        # sherpa-onnx aborts diarization when the progress callback returns non-zero
+        def callback(processed_chunks: int, num_chunks: int) -> int:
+            if on_progress and num_chunks:
+                on_progress(processed_chunks / num_chunks)
+            return 1 if should_stop and should_stop() else 0
+
+        segments = self.diarizer_model.process(samples=samples, callback=callback)
+        return [
+            diarizer_utils.DiarizationSegment(start=seg.start, end=seg.end, speaker=seg.speaker)
+            for seg in segments.sort_by_start_time()
+        ]
+
+    def speaker_labels(self, transcript: List[TranscriptSegment], diarization_segments: list) -> List[str]:
+        return diarizer_utils.assign_speaker_labels(transcript, diarization_segments)
 
     def assign_speakers(self, transcript: List[TranscriptSegment], diarization_segments: list, speaker_map: Optional[dict] = None) -> List[str]:
         return diarizer_utils.assign_speakers_to_transcript(
@@ -0,0 +1,189 @@
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import orjson
+
+from app import models, schemas
+from app.services.meeting_parser import MeetingParserService
+from app.services.speaker_names import SpeakerNameService
+
+# Rendered exports, one file per meeting, content version, status and format
+EXPORT_CACHE_DIR = Path(os.getenv("OUTPUT_DIR", "output")) / "exports"
+
+EXPORT_FORMATS = {
+    "json": "application/json",
+    "txt": "text/plain; charset=utf-8",
+    "md": "text/markdown; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8",
+}
+
+# Segments serialized per chunk of a streamed JSON export
+EXPORT_JSON_BATCH = 500
+
+_TRANSCRIPT_LINE = re.compile(
+    r"^\[(\d+):(\d+):(\d+) - (\d+):(\d+):(\d+)\]\s*(?:\((?P<speaker>[^)]*)\)\s*)?(?P<text>.*)$"
+)
+
+
+def vtt_escape(text: str) -> str:
+    # Escaping ">" also breaks up "-->", which would otherwise end the cue timing line
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def subtitle_text(text: str) -> str:
+    # A blank line ends a cue, so multi-line text is kept on consecutive lines
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def subtitle_timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3600 * 1000)
+    minutes, millis = divmod(millis, 60 * 1000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+class ExportService:
+    """
+    Renders meeting exports as a stream of chunks. A meeting's content_version
+    changes whenever its transcript, summary or speaker names change, so a
+    rendered export is cached on disk under that version (and the meeting
+    status, which the JSON export includes) and serves as its ETag until the
+    next change.
+    """
+
+    @staticmethod
+    def etag(meeting_id: int, content_version: int, status: str, format: str) -> str:
+        return f'"{meeting_id}-{content_version}-{status}-{format}"'
+
+    @staticmethod
+    def cache_path(meeting_id: int, content_version: int, status: str, format: str) -> Path:
+        return EXPORT_CACHE_DIR / f"meeting_{meeting_id}_v{content_version}_{status}.{format}"
+
+    @staticmethod
+    def cached(meeting_id: int, content_version: int, status: str, format: str) -> Optional[Path]:
+        path = ExportService.cache_path(meeting_id, content_version, status, format)
+        return path if path.is_file() else None
+
+    @staticmethod
+    def remove_meeting(meeting_id: int):
+        for path in EXPORT_CACHE_DIR.glob(f"meeting_{meeting_id}_v*.*"):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def stream_to_cache(chunks: Iterable[str], path: Path) -> Iterator[bytes]:
+        """
+        Yield the encoded chunks while writing them to a private temp file,
+        which replaces the cache entry only once the export is complete.
+        Concurrent exports of the same meeting never see a partial file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        completed = False
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    f.write(data)
+                    yield data
+            os.replace(tmp_path, path)
+            completed = True
+
+            # Older versions of this export are stale now
+            for old in path.parent.glob(f"{path.name.split('_v')[0]}_v*{path.suffix}"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+        finally:
+            if not completed:
+                tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def cues(segments: list[models.TranscriptSegment], transcript_text: Optional[str], names: dict[str, str]) -> list[dict]:
+        if segments:
+            return [
+                {
+                    "start": seg.start,
+                    "end": seg.end,
+                    "speaker": SpeakerNameService.render(seg.speaker, names),
+                    "text": (seg.text or seg.raw_text or "").strip()
+                }
+                for seg in segments
+            ]
+
+        # Meetings processed before segments were stored: whole-second times from the transcript lines
+        cues = []
+        for line in (transcript_text or "").splitlines():
+            m = _TRANSCRIPT_LINE.match(line.strip())
+            if not m or not m.group("text"):
+                continue
+            h1, m1, s1, h2, m2, s2 = (int(g) for g in m.groups()[:6])
+            cues.append({
+                "start": h1 * 3600 + m1 * 60 + s1,
+                "end": h2 * 3600 + m2 * 60 + s2,
+                "speaker": m.group("speaker"),
+                "text": m.group("text").strip()
+            })
+        return cues
+
+    @staticmethod
+    def render_json(meeting: schemas.MeetingRead, transcript_text: Optional[str], summary: Optional[dict],
+                    cues: list[dict], names: dict[str, str]) -> Iterator[str]:
+        data = {
+            "meeting": {
+                "id": meeting.id,
+                "title": meeting.title,
+                "date": str(meeting.date),
+                "status": meeting.status,
+            },
+            "transcript": transcript_text,
+            "summary": SpeakerNameService.render_value(summary or {
+                "executive_summary": None,
+                "topics": [],
+                "decisions": [],
+                "action_items": [],
+                "discussions": []
+            }, names),
+            "speakers": [{"label": s.label, "name": s.name} for s in meeting.speakers]
+        }
+
+        # Compact JSON; the segments array is written in batches
+        head = orjson.dumps(data).decode("utf-8")
+        yield head[:-1] + ',"segments":['
+        for i in range(0, len(cues), EXPORT_JSON_BATCH):
+            batch = orjson.dumps(cues[i:i + EXPORT_JSON_BATCH]).decode("utf-8")[1:-1]
+            yield ("," if i else "") + batch
+        yield "]}"
+
+    @staticmethod
+    def render_text(transcript_text: Optional[str], summary: Optional[dict], names: dict[str, str]) -> Iterator[str]:
+        if transcript_text is not None:
+            yield "--- Transcript ---\n"
+            yield transcript_text
+            yield "\n\n"
+
+        if summary:
+            minutes = MeetingParserService.from_summary_dict(summary, speaker_names=names)
+            yield MeetingParserService.format_minutes(minutes)
+
+    @staticmethod
+    def render_subtitles(cues: list[dict], format: str) -> Iterator[str]:
+        separator = "." if format == "vtt" else ","
+        if format == "vtt":
+            yield "WEBVTT\n\n"
+
+        for number, cue in enumerate((c for c in cues if c["text"]), start=1):
+            start = subtitle_timestamp(cue["start"], separator)
+            end = subtitle_timestamp(max(cue["end"], cue["start"]), separator)
+            if format == "vtt":
+                text = vtt_escape(subtitle_text(cue["text"]))
+                if cue["speaker"]:
+                    text = f"<v {vtt_escape(' '.join(cue['speaker'].split()))}>{text}"
+                yield f"{start} --> {end}\n{text}\n\n"
+            else:
+                # SRT has no escaping; an arrow in the text must not look like a timing line
+                text = subtitle_text(f"{cue['speaker']}: {cue['text']}" if cue["speaker"] else cue["text"]).replace("-->", "->")
+                yield f"{number}\n{start} --> {end}\n{text}\n\n"
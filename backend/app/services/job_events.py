@@ -0,0 +1,236 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import func
+
+from app import models
+from app.database import SessionLocal
+from app.models.job import utcnow
+from app.services.meeting_cache import MeetingCache, meeting_cache
+
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", "1"))
+JOB_EVENTS_RELAY_INTERVAL = float(os.getenv("JOB_EVENTS_RELAY_INTERVAL", "1"))
+
+TERMINAL_JOB_STATUSES = {"completed", "failed", "cancelled"}
+
+
+def _value(status):
+    return getattr(status, "value", status)
+
+
+def job_event(meeting: Optional[models.Meeting], job: Optional[models.Job]) -> dict:
+    return {
+        "meeting_id": meeting.id if meeting else job.meeting_id,
+        "status": _value(meeting.status) if meeting else None,
+        "job_id": job.id if job else None,
+        "job_status": _value(job.status) if job else None,
+        "stage": job.stage if job else None,
+        "progress": job.progress if job else None,
+    }
+
+
+class JobProgressReporter:
+    """
+    Worker side: records the current stage and progress on the job row so the
+    API can relay it. Writes are throttled except on stage changes.
+    """
+
+    def __init__(self, job_id: int, interval: float = JOB_PROGRESS_INTERVAL, session_factory=SessionLocal):
+        self.job_id = job_id
+        self.interval = interval
+        self.session_factory = session_factory
+        self._stage = None
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, stage: str, progress: float):
+        with self._lock:
+            now = time.monotonic()
+            if stage == self._stage and now - self._last_write < self.interval:
+                return
+            self._stage = stage
+            self._last_write = now
+
+        db = self.session_factory()
+        try:
+            db.query(models.Job).filter(models.Job.id == self.job_id).update({
+                models.Job.stage: stage,
+                models.Job.progress: round(min(max(progress, 0.0), 1.0), 4),
+                models.Job.updated_at: utcnow()
+            }, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            print(f"Could not record progress for job {self.job_id}: {e}")
+        finally:
+            db.close()
+
+
+class EventBroker:
+    """
+    In-process pub/sub of meeting status events. Subscribers are asyncio
+    queues; publish() may be called from any thread.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._latest: dict[int, dict] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def watched_meetings(self) -> list[int]:
+        return list(self._subscribers.keys())
+
+    def latest(self, meeting_id: int) -> Optional[dict]:
+        return self._latest.get(meeting_id)
+
+    def subscribe(self, meeting_id: int, snapshot: Optional[dict] = None) -> asyncio.Queue:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        if snapshot is not None:
+            # The first subscriber already has the snapshot, don't send it again.
+            # Later ones keep the last delivered event, so watchers already
+            # connected still see every change.
+            self._latest.setdefault(meeting_id, snapshot)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self._subscribers.setdefault(meeting_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, meeting_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(meeting_id)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[meeting_id]
+            self._latest.pop(meeting_id, None)
+
+    def _deliver(self, event: dict):
+        meeting_id = event["meeting_id"]
+        queues = self._subscribers.get(meeting_id)
+        if not queues:
+            # Nobody watches: remembering the event would only leak and go stale
+            return
+        if self._latest.get(meeting_id) == event:
+            return
+        self._latest[meeting_id] = event
+
+        for queue in queues:
+            if queue.full():
+                # Slow consumer: drop the oldest event, only the latest status matters
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def publish(self, event: dict):
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            self._deliver(event)
+        else:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+
+broker = EventBroker()
+
+
+class JobEventRelay:
+    """
+    API side: forwards job progress written by worker processes to the
+    broker. It issues one query per tick for all watched meetings together,
+    no matter how many clients are connected, and none when nobody watches.
+    It also drops cached meeting aggregates the workers have changed.
+    """
+
+    def __init__(self, event_broker: EventBroker, interval: float = JOB_EVENTS_RELAY_INTERVAL, session_factory=SessionLocal,
+                 cache: Optional[MeetingCache] = meeting_cache):
+        self.broker = event_broker
+        self.interval = interval
+        self.session_factory = session_factory
+        self.cache = cache
+        self._task: Optional[asyncio.Task] = None
+
+    def _poll(self, meeting_ids: list[int]) -> list[dict]:
+        db = self.session_factory()
+        try:
+            # Every watched meeting with its latest job, in a single statement
+            latest_job = db.query(
+                models.Job.meeting_id.label("meeting_id"),
+                func.max(models.Job.id).label("job_id")
+            ).filter(
+                models.Job.meeting_id.in_(meeting_ids)
+            ).group_by(models.Job.meeting_id).subquery()
+
+            rows = db.query(models.Meeting, models.Job).outerjoin(
+                latest_job, latest_job.c.meeting_id == models.Meeting.id
+            ).outerjoin(
+                models.Job, models.Job.id == latest_job.c.job_id
+            ).filter(models.Meeting.id.in_(meeting_ids)).all()
+
+            events = [job_event(meeting, job) for meeting, job in rows]
+
+            # Meetings that disappeared (deleted) get a final event
+            found = {meeting.id for meeting, _job in rows}
+            for meeting_id in set(meeting_ids) - found:
+                events.append({"meeting_id": meeting_id, "status": "deleted", "job_id": None,
+                               "job_status": None, "stage": None, "progress": None})
+            return events
+        finally:
+            db.close()
+
+    def snapshot(self, meeting_id: int) -> dict:
+        return self._poll([meeting_id])[0]
+
+    def _revalidate_cache(self):
+        db = self.session_factory()
+        try:
+            self.cache.revalidate(db)
+        finally:
+            db.close()
+
+    async def run(self):
+        self.broker.bind_loop(asyncio.get_running_loop())
+
+        while True:
+            await asyncio.sleep(self.interval)
+
+            if self.cache is not None:
+                try:
+                    await asyncio.to_thread(self._revalidate_cache)
+                except Exception as e:
+                    print(f"Meeting cache revalidation error: {e}")
+
+            meeting_ids = self.broker.watched_meetings()
+            if not meeting_ids:
+                continue
+
+            try:
+                events = await asyncio.to_thread(self._poll, meeting_ids)
+            except Exception as e:
+                print(f"Job event relay error: {e}")
+                continue
+
+            for event in events:
+                self.broker.publish(event)
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+relay = JobEventRelay(broker)
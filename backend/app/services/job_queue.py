@@ -0,0 +1,292 @@
+import os
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models.job import JobStatus, utcnow
+from app.services.scheduler import SchedulerService
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_RETRY_DELAY_SECONDS = int(os.getenv("JOB_RETRY_DELAY_SECONDS", "30"))
+
+ACTIVE_STATUSES = (JobStatus.queued, JobStatus.running)
+
+
+def dedupe_key_for(meeting_id: int) -> str:
+    return f"meeting:{meeting_id}"
+
+
+class JobQueueService:
+
+    @staticmethod
+    def get_active_job(db: Session, meeting_id: int) -> Optional[models.Job]:
+        return db.query(models.Job).filter(
+            models.Job.meeting_id == meeting_id,
+            models.Job.status.in_(ACTIVE_STATUSES)
+        ).order_by(models.Job.id.desc()).first()
+
+    @staticmethod
+    def get_latest_job(db: Session, meeting_id: int) -> Optional[models.Job]:
+        return db.query(models.Job).filter(
+            models.Job.meeting_id == meeting_id
+        ).order_by(models.Job.id.desc()).first()
+
+    @staticmethod
+    def enqueue(db: Session, meeting: models.Meeting, submitted_by: str = "anonymous", batch_id: Optional[str] = None) -> tuple[models.Job, bool]:
+        """
+        Queue a processing job for the meeting.
+        Returns (job, created); when an identical job is already queued or
+        running it is returned instead of creating a second one.
+        """
+        existing = JobQueueService.get_active_job(db, meeting.id)
+        if existing:
+            if batch_id and existing.batch_id is None:
+                existing.batch_id = batch_id
+                db.commit()
+            return existing, False
+
+        job = models.Job(
+            meeting_id=meeting.id,
+            status=JobStatus.queued,
+            dedupe_key=dedupe_key_for(meeting.id),
+            max_attempts=JOB_MAX_ATTEMPTS,
+            available_at=utcnow(),
+            submitted_by=submitted_by,
+            batch_id=batch_id,
+            expected_seconds=SchedulerService.expected_seconds(db, meeting)
+        )
+        db.add(job)
+        meeting.status = "pending"
+
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request queued the same meeting between our check and insert
+            db.rollback()
+            existing = JobQueueService.get_active_job(db, meeting.id)
+            if existing:
+                return existing, False
+            raise
+
+        db.refresh(job)
+        return job, True
+
+    @staticmethod
+    def claim(db: Session, worker_id: str, max_candidates: int = 5) -> Optional[models.Job]:
+        """
+        Claim the best available job (see SchedulerService) and give the
+        worker a lease on it. Candidate rows are locked with
+        SELECT ... FOR UPDATE SKIP LOCKED, so workers on other nodes skip
+        them instead of blocking. Running jobs whose lease expired are taken
+        over. Returns None when there is nothing to do.
+        """
+        now = utcnow()
+
+        candidates = SchedulerService.claim_order(db)[:max_candidates]
+        if not candidates:
+            return None
+
+        locked = db.query(models.Job).filter(
+            models.Job.id.in_(candidates),
+            SchedulerService.claimable_filter(now)
+        ).with_for_update(skip_locked=True).all()
+
+        rank = {job_id: i for i, job_id in enumerate(candidates)}
+
+        for job in sorted(locked, key=lambda j: rank[j.id]):
+            if job.status == JobStatus.running:
+                print(f"Taking over job {job.id} from {job.worker_id} (lease expired)")
+                if job.cancel_requested:
+                    JobQueueService.mark_cancelled(db, job)
+                    continue
+                if job.attempts >= job.max_attempts:
+                    JobQueueService.fail(db, job, "Worker lease expired")
+                    continue
+
+            # Compare-and-set on the observed state guards backends without row locks (SQLite)
+            conditions = [
+                models.Job.id == job.id,
+                models.Job.status == job.status,
+                models.Job.attempts == job.attempts
+            ]
+            # A taken-over job already counts as running for its user
+            if job.status == JobStatus.queued:
+                conditions.append(SchedulerService.under_user_cap(job.submitted_by))
+
+            claimed = db.query(models.Job).filter(*conditions).update({
+                models.Job.status: JobStatus.running,
+                models.Job.worker_id: worker_id,
+                models.Job.attempts: models.Job.attempts + 1,
+                models.Job.lease_expires_at: now + timedelta(seconds=JOB_LEASE_SECONDS),
+                models.Job.started_at: now
+            }, synchronize_session=False)
+            db.commit()
+
+            if claimed:
+                db.expire_all()
+                return db.get(models.Job, job.id)
+
+            db.rollback()
+
+        db.commit()
+        return None
+
+    @staticmethod
+    def batch_summary(db: Session, batch_id: str) -> Optional[dict]:
+        """
+        Progress of a batch: job counts per status and throughput in hours of
+        audio processed per hour of wall time since the first job started.
+        """
+        rows = db.query(models.Job, models.Meeting.duration).outerjoin(
+            models.Meeting, models.Meeting.id == models.Job.meeting_id
+        ).filter(models.Job.batch_id == batch_id).all()
+
+        if not rows:
+            return None
+
+        counts = {status.value: 0 for status in JobStatus}
+        audio_seconds_total = 0.0
+        audio_seconds_done = 0.0
+        for job, duration in rows:
+            counts[job.status.value] += 1
+            audio_seconds_total += duration or 0.0
+            if job.status == JobStatus.completed:
+                audio_seconds_done += duration or 0.0
+
+        started = [job.started_at for job, _ in rows if job.started_at]
+        finished = all(job.status not in ACTIVE_STATUSES for job, _ in rows)
+        end = max((job.finished_at for job, _ in rows if job.finished_at), default=None) if finished else utcnow()
+
+        wall_seconds = (end - min(started)).total_seconds() if started and end else 0.0
+        throughput = audio_seconds_done / wall_seconds if wall_seconds > 0 else None
+
+        return {
+            "batch_id": batch_id,
+            "jobs": len(rows),
+            "counts": counts,
+            "finished": finished,
+            "audio_seconds_total": audio_seconds_total,
+            "audio_seconds_done": audio_seconds_done,
+            "wall_seconds": wall_seconds,
+            "audio_hours_per_hour": throughput
+        }
+
+    @staticmethod
+    def heartbeat(db: Session, job_id: int, worker_id: str) -> bool:
+        """Renew the lease. Returns False when the job is no longer owned by this worker."""
+        renewed = db.query(models.Job).filter(
+            models.Job.id == job_id,
+            models.Job.worker_id == worker_id,
+            models.Job.status == JobStatus.running
+        ).update({
+            models.Job.lease_expires_at: utcnow() + timedelta(seconds=JOB_LEASE_SECONDS)
+        }, synchronize_session=False)
+        db.commit()
+        return bool(renewed)
+
+    @staticmethod
+    def complete(db: Session, job: models.Job):
+        job.status = JobStatus.completed
+        job.dedupe_key = None
+        job.lease_expires_at = None
+        job.last_error = None
+        job.finished_at = utcnow()
+        db.commit()
+
+    @staticmethod
+    def fail(db: Session, job: models.Job, error: str) -> bool:
+        """
+        Record a failed attempt. The job is re-queued with a linear backoff
+        while it has attempts left. Returns True if it will be retried.
+        """
+        job.last_error = error
+        job.lease_expires_at = None
+        job.worker_id = None
+
+        if job.attempts < job.max_attempts:
+            job.status = JobStatus.queued
+            job.available_at = utcnow() + timedelta(seconds=JOB_RETRY_DELAY_SECONDS * job.attempts)
+            db.commit()
+            return True
+
+        job.status = JobStatus.failed
+        job.dedupe_key = None
+        job.finished_at = utcnow()
+        if job.meeting:
+            job.meeting.status = "failed"
+        db.commit()
+        return False
+
+    @staticmethod
+    def request_cancel(db: Session, job: models.Job) -> bool:
+        """
+        Cancel a job. Queued jobs are cancelled immediately; running jobs are
+        flagged and stopped by their worker at the next checkpoint.
+        Returns True if the job is already cancelled when this returns.
+        """
+        if job.status == JobStatus.queued:
+            JobQueueService.mark_cancelled(db, job)
+            return True
+
+        job.cancel_requested = True
+        db.commit()
+        return False
+
+    @staticmethod
+    def mark_cancelled(db: Session, job: models.Job):
+        job.status = JobStatus.cancelled
+        job.cancel_requested = True
+        job.dedupe_key = None
+        job.lease_expires_at = None
+        job.finished_at = utcnow()
+
+        # Meetings that were processed before keep their previous results
+        meeting = job.meeting
+        if meeting:
+            has_results = db.query(models.Transcript.id).filter(
+                models.Transcript.meeting_id == meeting.id
+            ).first() is not None
+            meeting.status = "completed" if has_results else "pending"
+
+        db.commit()
+
+    @staticmethod
+    def recover_stale(db: Session) -> int:
+        """
+        Re-queue running jobs whose worker lost its lease, and queue a job for
+        meetings left in `processing` without any active job (e.g. after a
+        crash or a restart of the old in-process runner).
+        Returns the number of jobs recovered.
+        """
+        recovered = 0
+        now = utcnow()
+
+        expired = db.query(models.Job).filter(
+            models.Job.status == JobStatus.running,
+            models.Job.lease_expires_at < now
+        ).all()
+
+        for job in expired:
+            if job.cancel_requested:
+                JobQueueService.mark_cancelled(db, job)
+                continue
+
+            print(f"Recovering job {job.id} (lease of {job.worker_id} expired)")
+            JobQueueService.fail(db, job, "Worker lease expired")
+            recovered += 1
+
+        stuck_meetings = db.query(models.Meeting).filter(
+            models.Meeting.status == "processing"
+        ).all()
+
+        for meeting in stuck_meetings:
+            if JobQueueService.get_active_job(db, meeting.id) is None:
+                print(f"Re-queueing meeting {meeting.id} left in processing")
+                JobQueueService.enqueue(db, meeting)
+                recovered += 1
+
+        return recovered
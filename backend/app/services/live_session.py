@@ -0,0 +1,213 @@
+import os
+import threading
+import uuid
+import wave
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from faster_whisper.vad import VadOptions
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.search_index import SearchIndexService
+from scripts.utils import model_pool
+from scripts.utils.backlog import QUALITY_LEVELS, BacklogPolicy
+from scripts.utils.live_audio import RingBuffer, StreamingVad
+from scripts.utils.streaming import LocalAgreementDecoder, join_words
+from scripts.utils.transcriber import Transcriber, TranscriptSegment
+
+AUDIO_DIR = Path(os.getenv("AUDIO_DIR", "data"))
+# Whisper model of live sessions; loaded once per API process, with one CTranslate2 worker per session
+LIVE_MODEL_SIZE = os.getenv("LIVE_MODEL_SIZE", "large")
+LIVE_MAX_SESSIONS = int(os.getenv("LIVE_MAX_SESSIONS", "2"))
+# Longest voiced segment decoded at once, and seconds of new audio between streaming decodes
+LIVE_CHUNK_SECONDS = int(os.getenv("LIVE_CHUNK_SECONDS", "5"))
+LIVE_MIN_CHUNK_SECONDS = float(os.getenv("LIVE_MIN_CHUNK_SECONDS", "1.0"))
+# Seconds received audio may wait to be decoded: above it decoding drops to beam 1,
+# at twice that the session is saved and closed (1013) and the receive buffer is full
+LIVE_MAX_LAG_SECONDS = float(os.getenv("LIVE_MAX_LAG_SECONDS", "15"))
+# Clients send 16-bit little-endian mono PCM at this rate
+LIVE_SAMPLE_RATE = 16000
+LIVE_RING_SLACK_SECONDS = 10
+
+LIVE_VAD_OPTIONS = VadOptions(threshold=0.5, min_speech_duration_ms=200, min_silence_duration_ms=150)
+# The API process has no fallback model; live sessions only trade beam size
+LIVE_QUALITY_LEVELS = tuple(level for level in QUALITY_LEVELS if not level.fallback_model)
+
+
+class LiveSessionRejected(Exception):
+    pass
+
+
+class LiveSession:
+    """
+    State of one live transcription connection: the session recording, the
+    ring buffer and VAD state (or the streaming decoder) and the segments
+    decoded so far. Nothing is shared between sessions except the Whisper
+    and VAD models. All methods except adjust() block and run in a worker
+    thread.
+    """
+
+    def __init__(self, language: Optional[str] = "sr", streaming: bool = False):
+        self.id = uuid.uuid4().hex
+        self.language = language
+        self.transcriber: Transcriber = model_pool.get_transcriber(model_size=LIVE_MODEL_SIZE, num_workers=LIVE_MAX_SESSIONS)
+        self.segments: list[TranscriptSegment] = []
+        self.samples = 0
+
+        chunk_samples = LIVE_SAMPLE_RATE * LIVE_CHUNK_SECONDS
+        self.ring = RingBuffer(LIVE_SAMPLE_RATE * (LIVE_CHUNK_SECONDS * 2 + LIVE_RING_SLACK_SECONDS))
+        self.vad = None if streaming else StreamingVad(LIVE_VAD_OPTIONS, LIVE_SAMPLE_RATE, max_segment_samples=chunk_samples)
+        self.decoder = LocalAgreementDecoder(self.transcriber.model, language, sample_rate=LIVE_SAMPLE_RATE) if streaming else None
+        self._decoded_until = 0.0
+        # The worker count of the shared model is fixed, so only the quality level moves
+        self.policy = BacklogPolicy(max_workers=1, high_water=LIVE_MAX_LAG_SECONDS, low_water=LIVE_MAX_LAG_SECONDS / 3,
+                                    levels=LIVE_QUALITY_LEVELS)
+
+        AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+        self.audio_path = AUDIO_DIR / f"live_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.id[:8]}.wav"
+        self._wav = wave.open(str(self.audio_path), "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(LIVE_SAMPLE_RATE)
+
+    @property
+    def duration(self) -> float:
+        return self.samples / LIVE_SAMPLE_RATE
+
+    def adjust(self, lag: float) -> bool:
+        """Pick the quality level for the measured lag; returns True if it changed."""
+        changed = self.policy.update(lag)
+        if changed and self.decoder is not None:
+            self.decoder.beam_size = self.policy.level.beam_size
+        return changed
+
+    def _decode_range(self, start: int, end: int) -> list[TranscriptSegment]:
+        audio = self.ring.slice(start, end).astype(np.float32) / 32768.0
+        offset = start / LIVE_SAMPLE_RATE
+
+        segments = []
+        for seg in self.transcriber.transcribe(audio, language=self.language, beam_size=self.policy.level.beam_size):
+            text = seg.text.strip()
+            if text:
+                segments.append(TranscriptSegment(start=offset + seg.start, end=offset + seg.end, text=text, confidence=seg.confidence))
+        return segments
+
+    def _from_words(self, words) -> list[TranscriptSegment]:
+        text = join_words(words)
+        if not text:
+            return []
+        return [TranscriptSegment(start=words[0].start, end=words[-1].end, text=text)]
+
+    def feed(self, pcm: bytes) -> tuple[list[TranscriptSegment], Optional[str]]:
+        """Add received PCM; returns the segments finished by it and the current partial hypothesis."""
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2")
+
+        new_segments: list[TranscriptSegment] = []
+        partial = None
+
+        # One second at a time, so a large message cannot overwrite ring audio VAD still refers to
+        for offset in range(0, len(samples), LIVE_SAMPLE_RATE):
+            block = samples[offset:offset + LIVE_SAMPLE_RATE]
+            start = self.samples
+            self._wav.writeframes(block.tobytes())
+            self.ring.write(block)
+            self.samples += len(block)
+
+            if self.decoder is not None:
+                self.decoder.insert(block, start / LIVE_SAMPLE_RATE)
+                if self.decoder.end - self._decoded_until >= LIVE_MIN_CHUNK_SECONDS:
+                    self._decoded_until = self.decoder.end
+                    committed, hypothesis = self.decoder.step()
+                    new_segments += self._from_words(committed)
+                    partial = join_words(hypothesis)
+            else:
+                for seg_start, seg_end in self.vad.process(block):
+                    new_segments += self._decode_range(seg_start, seg_end)
+
+        self.segments += new_segments
+        return new_segments, partial
+
+    def finish(self) -> list[TranscriptSegment]:
+        """Decode what is left and close the recording."""
+        if self.decoder is not None:
+            new_segments = self._from_words(self.decoder.finish())
+        else:
+            new_segments = [seg for seg_start, seg_end in self.vad.flush() for seg in self._decode_range(seg_start, seg_end)]
+
+        self.segments += new_segments
+        self.close()
+        return new_segments
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+class LiveSessionService:
+    """Admission and persistence of live transcription sessions."""
+
+    _sessions = 0
+    _sessions_lock = threading.Lock()
+
+    @staticmethod
+    @contextmanager
+    def session_slot():
+        """Limits live sessions to the CTranslate2 workers of the shared model."""
+        with LiveSessionService._sessions_lock:
+            if LiveSessionService._sessions >= LIVE_MAX_SESSIONS:
+                raise LiveSessionRejected(f"Too many live sessions ({LIVE_MAX_SESSIONS} running)")
+            LiveSessionService._sessions += 1
+        try:
+            yield
+        finally:
+            with LiveSessionService._sessions_lock:
+                LiveSessionService._sessions -= 1
+
+    @staticmethod
+    def save(db: Session, session: LiveSession, title: str, status: str = "completed") -> int:
+        """
+        Store the session as a meeting with its transcript and segments.
+        A session that failed is stored as "failed" with what was decoded, so
+        its recording can be processed again. Returns the meeting id.
+        """
+        meeting = models.Meeting(
+            title=title,
+            date=datetime.now(),
+            audio_file_path=str(session.audio_path),
+            duration=session.duration,
+            status=status,
+            diarization=False,
+            num_speakers=-1,
+            content_version=1
+        )
+        db.add(meeting)
+        db.flush()
+
+        segments = sorted(session.segments, key=lambda seg: seg.start)
+        raw_text = "\n".join(seg.format() for seg in segments)
+        db.add(models.Transcript(meeting_id=meeting.id, raw_text=raw_text, reconstructed_text=None))
+
+        if segments:
+            db.execute(insert(models.TranscriptSegment), [
+                {
+                    "meeting_id": meeting.id,
+                    "position": position,
+                    "start": seg.start,
+                    "end": seg.end,
+                    "speaker": None,
+                    "raw_text": seg.text,
+                    "text": seg.text,
+                    "confidence": seg.confidence
+                }
+                for position, seg in enumerate(segments)
+            ])
+
+        SearchIndexService.index_meeting(db, meeting.id)
+        db.commit()
+        return meeting.id
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app import models, schemas
+from app.services.speaker_names import SpeakerNameService
+
+# Meetings kept hydrated in each API process; a long meeting takes about 1 MB
+MEETING_CACHE_SIZE = int(os.getenv("MEETING_CACHE_SIZE", "32"))
+
+
+@dataclass
+class MeetingAggregate:
+    """A meeting with its speakers, transcript and parsed summary, as stored (speaker labels, not names)."""
+    meeting: schemas.MeetingRead
+    content_version: int
+    transcript: Optional[schemas.TranscriptRead]
+    summary: Optional[dict]
+    names: dict[str, str]
+    _detail_json: Optional[bytes] = field(default=None, repr=False)
+
+    @property
+    def status(self) -> str:
+        return getattr(self.meeting.status, "value", self.meeting.status)
+
+    def detail_json(self) -> bytes:
+        """The meeting detail response with speaker names applied, rendered once per cached aggregate."""
+        if self._detail_json is None:
+            transcript = None
+            if self.transcript:
+                transcript = self.transcript.model_copy(update={
+                    "raw_text": SpeakerNameService.render(self.transcript.raw_text, self.names),
+                    "reconstructed_text": SpeakerNameService.render(self.transcript.reconstructed_text, self.names)
+                })
+            summaries = [schemas.SummaryDetail(**SpeakerNameService.render_value(self.summary, self.names))] if self.summary else []
+
+            detail = schemas.MeetingDetail(**self.meeting.model_dump(), transcript=transcript, summaries=summaries)
+            self._detail_json = detail.model_dump_json().encode("utf-8")
+        return self._detail_json
+
+
+def parse_summary(summary: models.Summary) -> dict:
+    return {
+        "executive_summary": summary.executive_summary,
+        "topics": json.loads(summary.topics_json or "[]"),
+        "decisions": json.loads(summary.decisions_json or "[]"),
+        "action_items": json.loads(summary.action_items_json or "[]"),
+        "discussions": json.loads(summary.discussions_json or "[]"),
+    }
+
+
+class MeetingCache:
+    """
+    Read-through LRU cache of meeting aggregates in the API process.
+    Writes made by this process invalidate their meeting explicitly; changes
+    made by the workers (status, new results) are picked up by revalidate(),
+    which the job event relay runs every tick with one query for all cached
+    meetings.
+    """
+
+    def __init__(self, max_size: int = MEETING_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[int, MeetingAggregate] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so a load that raced with one is not stored
+        self._generation = 0
+
+    def get(self, meeting_id: int) -> Optional[MeetingAggregate]:
+        with self._lock:
+            aggregate = self._entries.get(meeting_id)
+            if aggregate is not None:
+                self._entries.move_to_end(meeting_id)
+            return aggregate
+
+    def put(self, meeting_id: int, aggregate: MeetingAggregate, generation: int):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[meeting_id] = aggregate
+            self._entries.move_to_end(meeting_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, meeting_id: int):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(meeting_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    async def load(self, db: AsyncSession, meeting_id: int) -> Optional[MeetingAggregate]:
+        aggregate = self.get(meeting_id)
+        if aggregate is not None:
+            return aggregate
+
+        generation = self._generation
+
+        meeting = await db.scalar(
+            select(models.Meeting).options(selectinload(models.Meeting.speakers)).where(models.Meeting.id == meeting_id)
+        )
+        if meeting is None:
+            return None
+
+        transcript = await db.scalar(select(models.Transcript).where(models.Transcript.meeting_id == meeting_id).limit(1))
+        summary = await db.scalar(select(models.Summary).where(models.Summary.meeting_id == meeting_id).limit(1))
+
+        aggregate = MeetingAggregate(
+            meeting=schemas.MeetingRead.model_validate(meeting),
+            content_version=meeting.content_version or 0,
+            transcript=schemas.TranscriptRead.model_validate(transcript) if transcript else None,
+            summary=parse_summary(summary) if summary else None,
+            names={s.label: s.name for s in meeting.speakers if s.name}
+        )
+        self.put(meeting_id, aggregate, generation)
+        return aggregate
+
+    def revalidate(self, db: Session) -> int:
+        """Drop cached meetings whose status or content changed in the database. Returns how many were dropped."""
+        with self._lock:
+            cached = {meeting_id: (a.content_version, a.status) for meeting_id, a in self._entries.items()}
+        if not cached:
+            return 0
+
+        rows = db.query(models.Meeting.id, models.Meeting.content_version, models.Meeting.status).filter(
+            models.Meeting.id.in_(cached.keys())
+        ).all()
+        current = {
+            meeting_id: (version or 0, getattr(status, "value", status))
+            for meeting_id, version, status in rows
+        }
+
+        stale = [meeting_id for meeting_id, state in cached.items() if current.get(meeting_id) != state]
+        for meeting_id in stale:
+            self.invalidate(meeting_id)
+        return len(stale)
+
+
+meeting_cache = MeetingCache()
@@ -1,6 +1,14 @@
 from pathlib import Path
-from scripts.utils.meeting_parser import generate_meeting_minutes_from_file, save_meeting_minutes
+from typing import Callable, List, Optional
+from scripts.utils.meeting_parser import (
+    format_meeting_minutes,
+    generate_meeting_minutes_from_file,
+    generate_minutes_from_partials,
+    save_meeting_minutes,
+    summarize_chunks
+)
 from scripts.utils.summarizer import MeetingMinutes, parse_meeting_minutes
+from .speaker_names import SpeakerNameService
 import json
 
 
@@ -9,9 +17,17 @@ class MeetingParserService:
     @staticmethod
     def generate_from_file(file_path: Path) -> MeetingMinutes:
         return generate_meeting_minutes_from_file(file_path)
+
+    @staticmethod
+    def summarize_chunks(transcript_text: str, should_stop: Optional[Callable[[], bool]] = None) -> List[str]:
+        return summarize_chunks(transcript_text, should_stop=should_stop)
+
+    @staticmethod
+    def generate_from_partials(partial_summaries: List[str]) -> MeetingMinutes:
+        return generate_minutes_from_partials(partial_summaries)
     
     @staticmethod
-    def from_db_summary(summary_model) -> MeetingMinutes:
+    def from_db_summary(summary_model, speaker_names: Optional[dict] = None) -> MeetingMinutes:
         json_data = {
             "executive_summary": summary_model.executive_summary,
             "topics": json.loads(summary_model.topics_json),
@@ -19,9 +35,20 @@ class MeetingParserService:
             "action_items": json.loads(summary_model.action_items_json),
             "discussions": json.loads(summary_model.discussions_json),
         }
+        return MeetingParserService.from_summary_dict(json_data, speaker_names)
+
+    @staticmethod
+    def from_summary_dict(json_data: dict, speaker_names: Optional[dict] = None) -> MeetingMinutes:
+        """Minutes from an already parsed summary (e.g. a cached meeting aggregate)."""
+        if speaker_names:
+            json_data = SpeakerNameService.render_value(json_data, speaker_names)
 
         return parse_meeting_minutes(json.dumps(json_data))
 
+    @staticmethod
+    def format_minutes(minutes: MeetingMinutes) -> str:
+        return format_meeting_minutes(minutes)
+
     @staticmethod
     def save_minutes_to_file(minutes: MeetingMinutes, file_path: Path):
         save_meeting_minutes(minutes, file_path)
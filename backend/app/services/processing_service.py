@@ -1,6 +1,11 @@
+import time
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Callable, Optional, List
 
+from scripts.utils import meeting_parser as meeting_parser_utils
+from scripts.utils import summarizer as summarizer_utils
+from scripts.utils.diarizer import DiarizationSegment
 from scripts.utils.transcriber import TranscriptSegment
 
 from .audio_processor import AudioProcessor
@@ -8,6 +13,20 @@ from .transcriber import TranscriptionService
 from .diarizer import DiarizationService
 from .summarizer import SummarizerService
 from .meeting_parser import MeetingParserService
+from .cancellation import CancellationToken
+from .waveform import WAVEFORM_DTYPE, WaveformService
+
+# Bump a stage version whenever its output format or logic changes,
+# so checkpoints written by older code are not reused.
+STAGE_VERSIONS = {
+    "converted_audio": 1,
+    "waveform_peaks": 1,
+    "raw_segments": 1,
+    "diarization_segments": 1,
+    "cleaned_segments": 1,
+    "partial_summaries": 1,
+    "minutes": 1,
+}
 
 
 class ProcessingService:
@@ -17,12 +36,15 @@ class ProcessingService:
         num_speakers: int = -1,
         cluster_threshold: float = 0.5,
         model_size: str = "large",
-        device: str = "cpu"
+        device: str = "cpu",
+        cpu_threads: int = 0
     ):
         self.audio_processor = AudioProcessor()
+        self.model_size = model_size
         self.transcriber = TranscriptionService(
             model_size=model_size,
-            device=device
+            device=device,
+            cpu_threads=cpu_threads
         )
         self.summarizer = SummarizerService()
         self.meeting_parser = MeetingParserService()
@@ -36,11 +58,85 @@ class ProcessingService:
                 cluster_threshold=cluster_threshold
             )
 
+    @staticmethod
+    def _run_stage(checkpoints, stage: str, input_key: str, compute: Callable[[], Any], files: Callable[[Any], list] = None, cancel_token: Optional[CancellationToken] = None, on_progress: Optional[Callable[[str, float], None]] = None) -> Any:
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        if on_progress:
+            on_progress(stage, 0.0)
+
+        if checkpoints is not None:
+            cached = checkpoints.load(stage, input_key)
+            if cached is not None:
+                print(f"Reusing checkpoint for stage '{stage}'")
+                if on_progress:
+                    on_progress(stage, 1.0)
+                return cached
+
+        started = time.perf_counter()
+        payload = compute()
+        elapsed = time.perf_counter() - started
+
+        # A cancelled stage may have stopped half way; never checkpoint partial output
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        if checkpoints is not None:
+            checkpoints.save(
+                stage, input_key, payload,
+                files=files(payload) if files else None,
+                elapsed_seconds=elapsed
+            )
+
+        if on_progress:
+            on_progress(stage, 1.0)
+
+        return payload
+
+    @staticmethod
+    def _stage_key(checkpoints, stage: str, *inputs: Any) -> Optional[str]:
+        if checkpoints is None:
+            return None
+        return checkpoints.fingerprint(stage, STAGE_VERSIONS[stage], *inputs)
+
+    @staticmethod
+    def temp_files(audio_path: str, output_dir: Optional[Path] = None) -> List[Path]:
+        output_dir = Path(output_dir or "output")
+        stem = Path(audio_path).stem
+        return [
+            output_dir / f"{stem}_16k_mono.wav",
+            output_dir / f"{stem}_clean.txt",
+            output_dir / f"{stem}_final.txt",
+        ]
+
+    @staticmethod
+    def cleanup_temp_files(audio_path: str, output_dir: Optional[Path] = None):
+        for path in ProcessingService.temp_files(audio_path, output_dir):
+            # Never delete the source recording if it was already a 16k mono WAV
+            if path.resolve() != Path(audio_path).resolve():
+                path.unlink(missing_ok=True)
+
     def process_meeting_audio(
         self,
         audio_path: str,
-        output_dir: Optional[Path] = None
+        output_dir: Optional[Path] = None,
+        checkpoints=None,
+        cancel_token: Optional[CancellationToken] = None,
+        on_progress: Optional[Callable[[str, float], None]] = None,
+        waveform_dir: Optional[Path] = None
     ) -> dict:
+        """
+        Run the full pipeline. When a CheckpointStore is given, every stage
+        output is persisted and stages whose inputs and parameters did not
+        change since the last attempt are loaded instead of recomputed.
+        The optional cancel_token is checked between transcribed segments,
+        diarization callbacks and LLM chunks; JobCancelled is raised when set.
+        on_progress(stage, fraction) is called as each stage advances.
+        With a waveform_dir, waveform peaks of the converted audio are written there.
+        """
+
+        should_stop = cancel_token.is_cancelled if cancel_token else None
 
         output_dir = Path(output_dir or "output")
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -48,30 +144,88 @@ class ProcessingService:
         if not self.audio_processor.validate_audio_format(audio_path):
             raise ValueError(f"Unsupported audio format: {audio_path}")
 
-        wav_path = self.audio_processor.convert_to_wav_16k_mono(
-            audio_path,
-            str(output_dir)
+        # =============================
+        # CONVERTED AUDIO
+        # =============================
+
+        convert_key = self._stage_key(
+            checkpoints, "converted_audio",
+            checkpoints.file_fingerprint(audio_path) if checkpoints else None
+        )
+
+        wav_path = self._run_stage(
+            checkpoints, "converted_audio", convert_key,
+            lambda: self.audio_processor.convert_to_wav_16k_mono(audio_path, str(output_dir)),
+            files=lambda path: [path],
+            cancel_token=cancel_token,
+            on_progress=on_progress
         )
 
         duration = self.audio_processor.get_audio_duration(wav_path)
 
-        segments: List[TranscriptSegment] = self.transcriber.transcribe(
-            wav_path,
-            language="sr"
-        )
+        # =============================
+        # WAVEFORM PEAKS
+        # =============================
+
+        if waveform_dir is not None:
+            waveform_key = self._stage_key(checkpoints, "waveform_peaks", convert_key, WAVEFORM_DTYPE, str(waveform_dir))
+
+            self._run_stage(
+                checkpoints, "waveform_peaks", waveform_key,
+                lambda: WaveformService.compute(wav_path, waveform_dir),
+                files=lambda meta: [str(Path(waveform_dir) / level["file"]) for level in meta["levels"]],
+                cancel_token=cancel_token,
+                on_progress=on_progress
+            )
+
+        def report_segment(seg: TranscriptSegment):
+            if on_progress and duration:
+                on_progress("raw_segments", seg.end / duration)
+
+        def report_diarization(fraction: float):
+            if on_progress:
+                on_progress("diarization_segments", fraction)
+
+        # =============================
+        # RAW SEGMENTS
+        # =============================
+
+        transcribe_key = self._stage_key(checkpoints, "raw_segments", convert_key, self.model_size, "sr")
+
+        segments: List[TranscriptSegment] = [
+            TranscriptSegment(**seg) for seg in self._run_stage(
+                checkpoints, "raw_segments", transcribe_key,
+                lambda: [asdict(seg) for seg in self.transcriber.transcribe(wav_path, language="sr", should_stop=should_stop, on_segment=report_segment)],
+                cancel_token=cancel_token,
+                on_progress=on_progress
+            )
+        ]
 
         raw_text = "\n".join([seg.format() for seg in segments])
+        raw_segment_texts = [seg.text.strip() for seg in segments]
+
+        # =============================
+        # CLEANED SEGMENTS
+        # =============================
 
         clean_file = output_dir / f"{Path(audio_path).stem}_clean.txt"
 
-        list(
-            self.summarizer.reconstruct_transcript(
-                raw_text,
-                output_file=clean_file
+        def reconstruct() -> List[str]:
+            list(
+                self.summarizer.reconstruct_transcript(
+                    raw_text,
+                    output_file=clean_file,
+                    should_stop=should_stop
+                )
             )
+            return clean_file.read_text(encoding="utf-8").splitlines()
+
+        clean_key = self._stage_key(
+            checkpoints, "cleaned_segments",
+            transcribe_key, summarizer_utils.CHAT_MODEL, summarizer_utils.SYSTEM_PROMPT
         )
 
-        clean_lines = clean_file.read_text(encoding="utf-8").splitlines()
+        clean_lines = self._run_stage(checkpoints, "cleaned_segments", clean_key, reconstruct, cancel_token=cancel_token, on_progress=on_progress)
 
         for seg, line in zip(segments, clean_lines):
             if "]" in line:
@@ -79,13 +233,32 @@ class ProcessingService:
 
         reconstructed_text = "\n".join([seg.format() for seg in segments])
         detected_labels = []
+        segment_speakers = [None] * len(segments)
+
+        # =============================
+        # DIARIZATION SEGMENTS
+        # =============================
 
         if self.diarization_enabled and self.diarizer:
-            diarization_segments = self.diarizer.diarize(str(wav_path))
+            diarize_key = self._stage_key(
+                checkpoints, "diarization_segments",
+                convert_key, self.num_speakers, self.cluster_threshold
+            )
+
+            diarization_segments = [
+                DiarizationSegment(**seg) for seg in self._run_stage(
+                    checkpoints, "diarization_segments", diarize_key,
+                    lambda: [asdict(seg) for seg in self.diarizer.diarize(str(wav_path), should_stop=should_stop, on_progress=report_diarization)],
+                    cancel_token=cancel_token,
+                    on_progress=on_progress
+                )
+            ]
+
             detected_labels = sorted({f"speaker_{seg.speaker}" for seg in diarization_segments})
             speaker_map = {label: None for label in detected_labels}
 
             segments_text = self.diarizer.assign_speakers(segments, diarization_segments, speaker_map)
+            segment_speakers = self.diarizer.speaker_labels(segments, diarization_segments)
             reconstructed_text = "\n".join([s for s in segments_text if s])
 
         transcript_file = output_dir / f"{Path(audio_path).stem}_final.txt"
@@ -94,22 +267,62 @@ class ProcessingService:
             encoding="utf-8"
         )
 
+        # =============================
+        # PARTIAL SUMMARIES
+        # =============================
+
         test_text = Path("data/sastanak.txt")
+        summary_source = test_text.read_text(encoding="utf-8")
 
-        minutes = MeetingParserService.generate_from_file(test_text)
+        partials_key = self._stage_key(
+            checkpoints, "partial_summaries",
+            summary_source, meeting_parser_utils.CHAT_MODEL, meeting_parser_utils.CHUNK_PROMPT
+        )
 
-        summary_dict = {
-            "executive_summary": minutes.executive_summary,
-            "topics": minutes.topics,
-            "decisions": [d.model_dump() for d in minutes.decisions],
-            "action_items": [a.model_dump() for a in minutes.action_items],
-            "discussions": [d.model_dump() for d in minutes.discussions],
-        }
+        partial_summaries = self._run_stage(
+            checkpoints, "partial_summaries", partials_key,
+            lambda: MeetingParserService.summarize_chunks(summary_source, should_stop=should_stop),
+            cancel_token=cancel_token,
+            on_progress=on_progress
+        )
+
+        # =============================
+        # MINUTES
+        # =============================
+
+        minutes_key = self._stage_key(
+            checkpoints, "minutes",
+            partials_key, meeting_parser_utils.CHAT_MODEL,
+            meeting_parser_utils.SYSTEM_PROMPT, meeting_parser_utils.GRAMMAR
+        )
+
+        def generate_minutes() -> dict:
+            minutes = MeetingParserService.generate_from_partials(partial_summaries)
+            return {
+                "executive_summary": minutes.executive_summary,
+                "topics": minutes.topics,
+                "decisions": [d.model_dump() for d in minutes.decisions],
+                "action_items": [a.model_dump() for a in minutes.action_items],
+                "discussions": [d.model_dump() for d in minutes.discussions],
+            }
+
+        summary_dict = self._run_stage(checkpoints, "minutes", minutes_key, generate_minutes, cancel_token=cancel_token, on_progress=on_progress)
 
         return {
             "duration": duration,
             "raw_text": raw_text,
             "reconstructed_text": reconstructed_text,
+            "segments": [
+                {
+                    "start": seg.start,
+                    "end": seg.end,
+                    "speaker": speaker,
+                    "raw_text": raw,
+                    "text": seg.text.strip(),
+                    "confidence": seg.confidence
+                }
+                for seg, raw, speaker in zip(segments, raw_segment_texts, segment_speakers)
+            ],
             "detected_speakers": detected_labels,
             "summary": summary_dict
         }
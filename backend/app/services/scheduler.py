@@ -0,0 +1,190 @@
+import heapq
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app import models
+from app.models.job import JobStatus, utcnow
+
+SCHEDULER_TOTAL_SLOTS = int(os.getenv("SCHEDULER_TOTAL_SLOTS", os.getenv("JOB_WORKER_CONCURRENCY", "1")))
+SCHEDULER_MAX_RUNNING_PER_USER = int(os.getenv("SCHEDULER_MAX_RUNNING_PER_USER", "1"))
+# Seconds of expected runtime forgiven per second spent waiting in the queue
+SCHEDULER_AGING_FACTOR = float(os.getenv("SCHEDULER_AGING_FACTOR", "2.0"))
+SCHEDULER_DEFAULT_DURATION = float(os.getenv("SCHEDULER_DEFAULT_DURATION", "1800"))
+SCHEDULER_RTF_HISTORY_DAYS = int(os.getenv("SCHEDULER_RTF_HISTORY_DAYS", "30"))
+SCHEDULER_RTF_CACHE_SECONDS = float(os.getenv("SCHEDULER_RTF_CACHE_SECONDS", "60"))
+
+# Real-time factor (processing seconds per audio second) assumed per stage until there is history
+DEFAULT_STAGE_RTF = {
+    "converted_audio": 0.02,
+    "waveform_peaks": 0.002,
+    "raw_segments": 1.0,
+    "diarization_segments": 0.1,
+    "cleaned_segments": 0.3,
+    "partial_summaries": 0.1,
+    "minutes": 0.02,
+}
+
+_rtf_cache: dict = {"loaded_at": 0.0, "values": {}}
+
+
+class SchedulerService:
+    """
+    Orders queued jobs shortest-expected-first, with aging so long jobs are
+    not starved, and a cap on concurrently running jobs per user.
+    """
+
+    @staticmethod
+    def stage_rtfs(db: Session) -> dict[str, float]:
+        if time.monotonic() - _rtf_cache["loaded_at"] < SCHEDULER_RTF_CACHE_SECONDS:
+            return _rtf_cache["values"]
+
+        since = utcnow() - timedelta(days=SCHEDULER_RTF_HISTORY_DAYS)
+
+        rows = db.query(
+            models.JobArtifact.stage,
+            func.avg(models.JobArtifact.elapsed_seconds / models.Meeting.duration)
+        ).join(
+            models.Meeting, models.Meeting.id == models.JobArtifact.meeting_id
+        ).filter(
+            models.JobArtifact.elapsed_seconds.isnot(None),
+            models.Meeting.duration > 0,
+            models.JobArtifact.created_at >= since
+        ).group_by(models.JobArtifact.stage).all()
+
+        values = dict(DEFAULT_STAGE_RTF)
+        for stage, rtf in rows:
+            if rtf is not None:
+                values[stage] = float(rtf)
+
+        _rtf_cache["loaded_at"] = time.monotonic()
+        _rtf_cache["values"] = values
+        return values
+
+    @staticmethod
+    def expected_seconds(db: Session, meeting: models.Meeting) -> float:
+        duration = meeting.duration or SCHEDULER_DEFAULT_DURATION
+        rtfs = SchedulerService.stage_rtfs(db)
+
+        total_rtf = sum(
+            rtf for stage, rtf in rtfs.items()
+            if stage != "diarization_segments" or meeting.diarization
+        )
+        return duration * total_rtf
+
+    @staticmethod
+    def _job_expected(job: models.Job) -> float:
+        if job.expected_seconds is not None:
+            return job.expected_seconds
+        return SCHEDULER_DEFAULT_DURATION * sum(DEFAULT_STAGE_RTF.values())
+
+    @staticmethod
+    def priority(job: models.Job, now: datetime) -> float:
+        waited = max((now - (job.created_at or now).replace(tzinfo=None)).total_seconds(), 0.0)
+        return SchedulerService._job_expected(job) - SCHEDULER_AGING_FACTOR * waited
+
+    @staticmethod
+    def ordered_queue(db: Session, only_available: bool = False) -> list[models.Job]:
+        now = utcnow()
+        query = db.query(models.Job).filter(models.Job.status == JobStatus.queued)
+        if only_available:
+            query = query.filter(models.Job.available_at <= now)
+
+        return sorted(query.all(), key=lambda job: (SchedulerService.priority(job, now), job.id))
+
+    @staticmethod
+    def running_per_user(db: Session) -> dict[str, int]:
+        rows = db.query(models.Job.submitted_by, func.count(models.Job.id)).filter(
+            models.Job.status == JobStatus.running
+        ).group_by(models.Job.submitted_by).all()
+        return {user: count for user, count in rows}
+
+    @staticmethod
+    def under_user_cap(submitted_by: Optional[str]):
+        """
+        Condition that the user runs fewer than SCHEDULER_MAX_RUNNING_PER_USER
+        jobs, for the WHERE clause of the claim itself. claim_order reads the
+        running counts before any row is locked, so two workers could both
+        start a job of the same user; re-checked in the claiming UPDATE, the
+        second one sees the first job running and fails.
+        """
+        other = aliased(models.Job)
+        # Counted over a derived table: MySQL rejects an UPDATE whose subquery reads the updated table directly
+        running = select(other.id).where(
+            other.submitted_by == submitted_by,
+            other.status == JobStatus.running
+        ).subquery()
+        return select(func.count()).select_from(running).scalar_subquery() < SCHEDULER_MAX_RUNNING_PER_USER
+
+    @staticmethod
+    def claimable_filter(now: datetime):
+        """Queued jobs that are due, plus running jobs whose worker stopped renewing its lease."""
+        return or_(
+            and_(models.Job.status == JobStatus.queued, models.Job.available_at <= now),
+            and_(models.Job.status == JobStatus.running, models.Job.lease_expires_at < now)
+        )
+
+    @staticmethod
+    def claim_order(db: Session) -> list[int]:
+        """Ids of the jobs a worker should try to claim, best first, respecting the per-user cap."""
+        now = utcnow()
+        running = SchedulerService.running_per_user(db)
+        order = []
+
+        # Abandoned jobs are taken over first, they already waited their turn
+        abandoned = db.query(models.Job.id).filter(
+            models.Job.status == JobStatus.running,
+            models.Job.lease_expires_at < now
+        ).order_by(models.Job.lease_expires_at).all()
+        order.extend(job_id for (job_id,) in abandoned)
+
+        for job in SchedulerService.ordered_queue(db, only_available=True):
+            if running.get(job.submitted_by, 0) >= SCHEDULER_MAX_RUNNING_PER_USER:
+                continue
+            order.append(job.id)
+
+        return order
+
+    @staticmethod
+    def queue_estimate(db: Session, job: models.Job) -> Optional[dict]:
+        """
+        Estimate the queue position and start time of a queued job by replaying
+        the queue order over the available worker slots.
+        """
+        if job.status != JobStatus.queued:
+            return None
+
+        now = utcnow()
+
+        # Each slot becomes free when its running job is expected to finish
+        slots = []
+        for running in db.query(models.Job).filter(models.Job.status == JobStatus.running).all():
+            started = running.started_at or now
+            remaining = SchedulerService._job_expected(running) - (now - started).total_seconds()
+            slots.append(max(remaining, 0.0))
+
+        slots.sort()
+        slots = slots[:SCHEDULER_TOTAL_SLOTS]
+        slots += [0.0] * (SCHEDULER_TOTAL_SLOTS - len(slots))
+        heapq.heapify(slots)
+
+        for position, queued in enumerate(SchedulerService.ordered_queue(db), start=1):
+            free_at = heapq.heappop(slots)
+            if queued.available_at and queued.available_at > now:
+                free_at = max(free_at, (queued.available_at - now).total_seconds())
+
+            if queued.id == job.id:
+                return {
+                    "position": position,
+                    "expected_start": now + timedelta(seconds=free_at),
+                    "expected_wait_seconds": free_at,
+                    "expected_seconds": SchedulerService._job_expected(job)
+                }
+
+            heapq.heappush(slots, free_at + SchedulerService._job_expected(queued))
+
+        return None
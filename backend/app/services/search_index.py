@@ -0,0 +1,276 @@
+import json
+import math
+import re
+import unicodedata
+from typing import Optional
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import SessionLocal
+from app.services.speaker_names import SpeakerNameService
+
+# BM25 parameters
+SEARCH_K1 = 1.2
+SEARCH_B = 0.75
+SEARCH_SNIPPET_CHARS = 160
+SEARCH_MAX_QUERY_TERMS = 10
+POSTING_INSERT_BATCH = 5000
+
+_CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "ђ": "dj", "е": "e", "ж": "z", "з": "z",
+    "и": "i", "ј": "j", "к": "k", "л": "l", "љ": "lj", "м": "m", "н": "n", "њ": "nj", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "ћ": "c", "у": "u", "ф": "f", "х": "h", "ц": "c",
+    "ч": "c", "џ": "dz", "ш": "s",
+}
+_WORD = re.compile(r"\w+")
+_TRANSCRIPT_LINE = re.compile(r"^\[(\d+):(\d+):(\d+) - [\d:]+\]\s*(?:\((?P<speaker>[^)]*)\)\s*)?(?P<text>.*)$")
+
+
+def fold(word: str) -> str:
+    """Lowercase, transliterate Serbian Cyrillic and strip diacritics, so "Čačak", "cacak" and "Чачак" match."""
+    word = "".join(_CYRILLIC_TO_LATIN.get(ch, ch) for ch in word.lower()).replace("đ", "dj")
+    word = unicodedata.normalize("NFKD", word)
+    return "".join(ch for ch in word if not unicodedata.combining(ch))[:64]
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    return [term for term in (fold(w) for w in _WORD.findall(text)) if len(term) > 1 or term.isdigit()]
+
+
+def snippet(text: str, terms: set[str], width: int = SEARCH_SNIPPET_CHARS) -> str:
+    # Window around the first word that matches a query term
+    match_at = 0
+    for m in _WORD.finditer(text):
+        if fold(m.group(0)) in terms:
+            match_at = m.start()
+            break
+
+    start = max(match_at - width // 3, 0)
+    end = min(start + width, len(text))
+    result = text[start:end].strip()
+    if start > 0:
+        result = "…" + result
+    if end < len(text):
+        result = result + "…"
+    return result
+
+
+class SearchIndexService:
+    """
+    Full-text search over transcript segments, speaker names and summaries,
+    backed by an inverted index in the database (search_documents +
+    search_postings). This works the same on MySQL and SQLite. A meeting's
+    entries are rebuilt whenever its results change.
+    Segments and summary entries are indexed with the diarization labels;
+    speaker names are separate "speaker" documents, so renaming a speaker
+    only rewrites those. Names are applied to results at query time.
+    Results are ranked with BM25 and every query term must match.
+    """
+
+    @staticmethod
+    def remove_meeting(db: Session, meeting_id: int, kind: Optional[str] = None):
+        criteria = [models.SearchDocument.meeting_id == meeting_id]
+        if kind is not None:
+            criteria.append(models.SearchDocument.kind == kind)
+        document_ids = db.query(models.SearchDocument.id).filter(*criteria).scalar_subquery()
+
+        db.query(models.SearchPosting).filter(
+            models.SearchPosting.document_id.in_(document_ids)
+        ).delete(synchronize_session=False)
+
+        db.query(models.SearchDocument).filter(*criteria).delete(synchronize_session=False)
+
+    @staticmethod
+    def _speaker_documents(db: Session, meeting_id: int) -> list[tuple[dict, list[str]]]:
+        names = SpeakerNameService.names_for_meeting(db, meeting_id)
+        return [
+            ({"kind": "speaker", "speaker": label, "text": name}, tokenize(name))
+            for label, name in names.items()
+        ]
+
+    @staticmethod
+    def _documents(db: Session, meeting_id: int) -> list[tuple[dict, list[str]]]:
+        documents = []
+
+        segments = db.query(models.TranscriptSegment).filter(
+            models.TranscriptSegment.meeting_id == meeting_id
+        ).order_by(models.TranscriptSegment.position).all()
+
+        if segments:
+            for seg in segments:
+                text = seg.text or seg.raw_text
+                documents.append((
+                    {"kind": "segment", "start": seg.start, "speaker": seg.speaker, "text": text},
+                    tokenize(text)
+                ))
+        else:
+            # Meetings processed before segments were stored: index the transcript lines
+            transcript = db.query(models.Transcript).filter(
+                models.Transcript.meeting_id == meeting_id
+            ).first()
+            text = transcript.reconstructed_text or transcript.raw_text if transcript else ""
+            for line in text.splitlines():
+                m = _TRANSCRIPT_LINE.match(line.strip())
+                if m:
+                    hours, minutes, seconds = int(m.group(1)), int(m.group(2)), int(m.group(3))
+                    start, speaker, body = hours * 3600 + minutes * 60 + seconds, m.group("speaker"), m.group("text")
+                else:
+                    start, speaker, body = None, None, line.strip()
+                if body:
+                    documents.append((
+                        {"kind": "segment", "start": start, "speaker": speaker, "text": body},
+                        tokenize(body)
+                    ))
+
+        summary = db.query(models.Summary).filter(models.Summary.meeting_id == meeting_id).first()
+        if summary:
+            fields = {
+                "executive_summary": [summary.executive_summary],
+                "topics": json.loads(summary.topics_json or "[]"),
+                "decisions": json.loads(summary.decisions_json or "[]"),
+                "action_items": json.loads(summary.action_items_json or "[]"),
+                "discussions": json.loads(summary.discussions_json or "[]"),
+            }
+            for field, entries in fields.items():
+                for entry in entries:
+                    if isinstance(entry, dict):
+                        entry = " — ".join(
+                            " ".join(v) if isinstance(v, list) else str(v)
+                            for v in entry.values() if v
+                        )
+                    if entry:
+                        documents.append((
+                            {"kind": "summary", "field": field, "text": entry},
+                            tokenize(entry)
+                        ))
+
+        return documents
+
+    @staticmethod
+    def index_meeting(db: Session, meeting_id: int):
+        """Rebuild the index entries of one meeting. The caller commits."""
+        # Pending transcript/summary/speaker changes must be visible to the queries below
+        db.flush()
+
+        SearchIndexService.remove_meeting(db, meeting_id)
+
+        documents = SearchIndexService._documents(db, meeting_id) + SearchIndexService._speaker_documents(db, meeting_id)
+        SearchIndexService._insert(db, meeting_id, documents)
+
+    @staticmethod
+    def index_speakers(db: Session, meeting_id: int):
+        """Rebuild only the speaker name entries of one meeting, e.g. after a rename. The caller commits."""
+        db.flush()
+
+        SearchIndexService.remove_meeting(db, meeting_id, kind="speaker")
+        SearchIndexService._insert(db, meeting_id, SearchIndexService._speaker_documents(db, meeting_id))
+
+    @staticmethod
+    def _insert(db: Session, meeting_id: int, documents: list[tuple[dict, list[str]]]):
+        rows = []
+        for fields, terms in documents:
+            doc = models.SearchDocument(meeting_id=meeting_id, length=len(terms), **fields)
+            rows.append((doc, terms))
+        db.add_all([doc for doc, _terms in rows])
+        db.flush()
+
+        postings = []
+        for doc, terms in rows:
+            counts: dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            postings.extend({"term": t, "document_id": doc.id, "tf": n} for t, n in counts.items())
+
+        for i in range(0, len(postings), POSTING_INSERT_BATCH):
+            db.execute(insert(models.SearchPosting), postings[i:i + POSTING_INSERT_BATCH])
+
+    @staticmethod
+    def search(db: Session, query: str, limit: int = 20, offset: int = 0) -> dict:
+        terms = list(dict.fromkeys(tokenize(query)))[:SEARCH_MAX_QUERY_TERMS]
+        if not terms:
+            return {"total": 0, "items": []}
+
+        Posting, Document = models.SearchPosting, models.SearchDocument
+
+        df = dict(db.query(Posting.term, func.count(Posting.document_id)).filter(
+            Posting.term.in_(terms)
+        ).group_by(Posting.term).all())
+
+        if len(df) < len(terms):
+            return {"total": 0, "items": []}
+
+        total_docs, avg_length = db.query(func.count(Document.id), func.avg(Document.length)).one()
+        avg_length = float(avg_length or 1.0)
+
+        idf = case(
+            *[(Posting.term == term, math.log(1 + (total_docs - n + 0.5) / (n + 0.5))) for term, n in df.items()],
+            else_=0.0
+        )
+        norm = SEARCH_K1 * (1 - SEARCH_B + SEARCH_B * Document.length / avg_length)
+        score = func.sum(idf * Posting.tf * (SEARCH_K1 + 1) / (Posting.tf + norm)).label("score")
+
+        matches = db.query(Posting.document_id.label("document_id"), score).join(
+            Document, Document.id == Posting.document_id
+        ).filter(
+            Posting.term.in_(terms)
+        ).group_by(Posting.document_id).having(
+            func.count(Posting.term) == len(terms)
+        )
+
+        total = db.query(func.count()).select_from(matches.subquery()).scalar()
+
+        page = matches.order_by(score.desc(), Posting.document_id).limit(limit).offset(offset).all()
+        scores = {document_id: s for document_id, s in page}
+
+        rows = db.query(Document, models.Meeting.title).join(
+            models.Meeting, models.Meeting.id == Document.meeting_id
+        ).filter(Document.id.in_(scores.keys())).all()
+
+        # Documents keep the speaker labels; current names are applied here
+        names: dict[int, dict[str, str]] = {}
+        for meeting_id, label, name in db.query(models.Speaker.meeting_id, models.Speaker.label, models.Speaker.name).filter(
+            models.Speaker.meeting_id.in_({doc.meeting_id for doc, _title in rows}),
+            models.Speaker.name.isnot(None),
+            models.Speaker.name != ""
+        ).all():
+            names.setdefault(meeting_id, {})[label] = name
+
+        term_set = set(terms)
+        items = []
+        for doc, title in rows:
+            meeting_names = names.get(doc.meeting_id, {})
+            text = doc.text if doc.kind == "speaker" else SpeakerNameService.render(doc.text, meeting_names)
+            items.append({
+                "meeting_id": doc.meeting_id,
+                "meeting_title": title,
+                "kind": doc.kind,
+                "field": doc.field,
+                "start": doc.start,
+                "speaker": SpeakerNameService.render(doc.speaker, meeting_names),
+                "snippet": snippet(text, term_set),
+                "score": round(float(scores[doc.id]), 4)
+            })
+        items.sort(key=lambda item: -item["score"])
+
+        return {"total": total, "items": items}
+
+
+def rebuild_all():
+    db = SessionLocal()
+    try:
+        meeting_ids = [meeting_id for (meeting_id,) in db.query(models.Meeting.id).order_by(models.Meeting.id).all()]
+        for meeting_id in meeting_ids:
+            SearchIndexService.index_meeting(db, meeting_id)
+            db.commit()
+        print(f"Indexed {len(meeting_ids)} meeting(s)")
+    finally:
+        db.close()
+
+
+# python -m app.services.search_index rebuilds the index of every meeting (e.g. after upgrading)
+if __name__ == "__main__":
+    rebuild_all()
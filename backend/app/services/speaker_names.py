@@ -0,0 +1,50 @@
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+@lru_cache(maxsize=256)
+def _label_pattern(labels: tuple[str, ...]) -> re.Pattern:
+    # Longest labels first and word boundaries on both sides, so speaker_1 never matches inside speaker_10
+    alternatives = "|".join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+
+class SpeakerNameService:
+    """
+    Stored transcripts and summaries keep the diarization labels
+    (speaker_0, speaker_1, ...). Names given to speakers are applied when the
+    text is read or exported, in a single pass over the text.
+    """
+
+    @staticmethod
+    def names_for_meeting(db: Session, meeting_id: int) -> dict[str, str]:
+        rows = db.query(models.Speaker.label, models.Speaker.name).filter(
+            models.Speaker.meeting_id == meeting_id,
+            models.Speaker.name.isnot(None),
+            models.Speaker.name != ""
+        ).all()
+        return {label: name for label, name in rows}
+
+    @staticmethod
+    def render(text: Optional[str], names: dict[str, str]) -> Optional[str]:
+        if not text or not names:
+            return text
+        return _label_pattern(tuple(names)).sub(lambda m: names[m.group(0)], text)
+
+    @staticmethod
+    def render_value(value: Any, names: dict[str, str]) -> Any:
+        """Render every string inside nested dicts/lists (e.g. parsed summary JSON)."""
+        if not names:
+            return value
+        if isinstance(value, str):
+            return SpeakerNameService.render(value, names)
+        if isinstance(value, list):
+            return [SpeakerNameService.render_value(v, names) for v in value]
+        if isinstance(value, dict):
+            return {k: SpeakerNameService.render_value(v, names) for k, v in value.items()}
+        return value
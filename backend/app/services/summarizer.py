@@ -1,6 +1,6 @@
 # app/services/summarizer_service.py
 from pathlib import Path
-from typing import Dict, Optional, Generator
+from typing import Callable, Dict, Optional, Generator
 from scripts.utils import summarizer as summarizer_utils
 
 
@@ -10,12 +10,14 @@ class SummarizerService:
     def reconstruct_transcript(
         raw_text: str,
         terms_dict: Optional[Dict[str, str]] = None,
-        output_file: Optional[Path] = None
+        output_file: Optional[Path] = None,
+        should_stop: Optional[Callable[[], bool]] = None
     ) -> Generator[str, None, None]:
         return summarizer_utils.reconstruct_transcript(
             raw_text=raw_text,
             terms_dict=terms_dict,
-            output_file=output_file
+            output_file=output_file,
+            should_stop=should_stop
         )
 
     @staticmethod
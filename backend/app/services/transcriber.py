@@ -1,18 +1,14 @@
-from typing import List
+from typing import Callable, List, Optional
 from scripts.utils.transcriber import Transcriber, TranscriptSegment
+from scripts.utils import model_pool
 
-_transcriber_instance: Transcriber | None = None
-
-def get_transcriber(model_size: str = "large", device: str = "cpu") -> Transcriber:
-    global _transcriber_instance
-    if _transcriber_instance is None:
-        _transcriber_instance = Transcriber(model_size=model_size, device=device)
-    return _transcriber_instance
+def get_transcriber(model_size: str = "large", device: str = "cpu", cpu_threads: int = 0) -> Transcriber:
+    return model_pool.get_transcriber(model_size=model_size, device=device, cpu_threads=cpu_threads)
 
 
 class TranscriptionService:
-    def __init__(self, model_size: str = "large", device: str = "cpu"):
-        self.transcriber: Transcriber = get_transcriber(model_size=model_size, device=device)
+    def __init__(self, model_size: str = "large", device: str = "cpu", cpu_threads: int = 0):
+        self.transcriber: Transcriber = get_transcriber(model_size=model_size, device=device, cpu_threads=cpu_threads)
 
-    def transcribe(self, audio_path: str, language: str = "sr", verbose: bool = False) -> List[TranscriptSegment]:
-        return self.transcriber.transcribe(audio_path, language=language, verbose=verbose)
+    def transcribe(self, audio_path: str, language: str = "sr", verbose: bool = False, should_stop: Optional[Callable[[], bool]] = None, on_segment: Optional[Callable[[TranscriptSegment], None]] = None) -> List[TranscriptSegment]:
+        return self.transcriber.transcribe(audio_path, language=language, verbose=verbose, should_stop=should_stop, on_segment=on_segment)
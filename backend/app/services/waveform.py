@@ -0,0 +1,64 @@
+import math
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from scripts.utils import waveform as waveform_utils
+
+# Peaks of each meeting, one directory per meeting (a peaks.json index and a binary file per zoom level)
+WAVEFORM_DIR = Path(os.getenv("OUTPUT_DIR", "output")) / "waveforms"
+# int8 (1 byte per value) or float16 (2 bytes, finer quiet passages)
+WAVEFORM_DTYPE = os.getenv("WAVEFORM_DTYPE", "int8")
+WAVEFORM_MAX_PEAKS = 20000
+
+
+class WaveformService:
+    """
+    Multi-resolution min/max peaks for drawing a meeting's waveform. The
+    worker computes every zoom level once from the 16 kHz WAV; clients fetch
+    only the time window they display, at the level that suits their width.
+    """
+
+    @staticmethod
+    def directory(meeting_id: int) -> Path:
+        return WAVEFORM_DIR / f"meeting_{meeting_id}"
+
+    @staticmethod
+    def compute(wav_path: str, output_dir: Path) -> dict:
+        return waveform_utils.write_peaks(wav_path, str(output_dir), WAVEFORM_DTYPE)
+
+    @staticmethod
+    def meta(meeting_id: int) -> Optional[dict]:
+        return waveform_utils.read_meta(str(WaveformService.directory(meeting_id)))
+
+    @staticmethod
+    def choose_level(meta: dict, start: float, end: float, pixels: Optional[int], samples_per_peak: Optional[int]) -> Optional[dict]:
+        levels = meta["levels"]
+        if samples_per_peak:
+            return next((level for level in levels if level["samples_per_peak"] == samples_per_peak), None)
+
+        if not pixels:
+            return levels[0]
+
+        # Coarsest level that still gives at least one peak per pixel
+        seconds = max(end - start, 0.0)
+        for level in reversed(levels):
+            if seconds * meta["sample_rate"] / level["samples_per_peak"] >= pixels:
+                return level
+        return levels[0]
+
+    @staticmethod
+    def window(meeting_id: int, meta: dict, level: dict, start: float, end: Optional[float]) -> tuple[int, bytes]:
+        """Index of the first peak and the interleaved min/max bytes of the peaks between start and end."""
+        peaks_per_second = meta["sample_rate"] / level["samples_per_peak"]
+        first = min(max(int(math.floor(start * peaks_per_second)), 0), level["count"])
+        last = level["count"] if end is None else min(max(int(math.ceil(end * peaks_per_second)), first), level["count"])
+        last = min(last, first + WAVEFORM_MAX_PEAKS)
+
+        data = waveform_utils.read_window(str(WaveformService.directory(meeting_id)), level, meta["dtype"], first, last)
+        return first, data
+
+    @staticmethod
+    def remove_meeting(meeting_id: int):
+        shutil.rmtree(WaveformService.directory(meeting_id), ignore_errors=True)
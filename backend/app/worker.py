@@ -0,0 +1,377 @@
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from app import models
+from app.database import SessionLocal, engine
+from app.services.audio_preview import AudioPreviewService
+from app.services.cancellation import CancellationToken, JobCancelled, JobWatcher
+from app.services.checkpoint_store import ARTIFACT_DIR, CheckpointStore
+from app.services.job_events import JobProgressReporter
+from app.services.job_queue import JobQueueService
+from app.services.processing_service import ProcessingService
+from app.services.search_index import SearchIndexService
+from app.services.waveform import WaveformService
+from scripts.utils.model_pool import split_cpu_budget
+
+# Point these at a shared volume when workers run on several nodes
+OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "output"))
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "1"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+JOB_RECOVERY_INTERVAL = float(os.getenv("JOB_RECOVERY_INTERVAL", "30"))
+# Total CPU threads all worker processes on this node may use for Whisper (0 = no limit)
+WORKER_CPU_BUDGET = int(os.getenv("WORKER_CPU_BUDGET", "0"))
+
+SEGMENT_INSERT_BATCH = 1000
+
+# Whisper threads for this worker process, derived from the CPU budget in run_worker
+_cpu_threads = 0
+
+# One ProcessingService per configuration, kept warm for the lifetime of the worker process
+_processing_services: dict[tuple, ProcessingService] = {}
+
+
+def get_processing_service(diarization: bool, num_speakers: int) -> ProcessingService:
+    key = (bool(diarization), num_speakers)
+    if key not in _processing_services:
+        _processing_services[key] = ProcessingService(
+            diarization=diarization,
+            num_speakers=num_speakers,
+            model_size="large",
+            device="cpu",
+            cpu_threads=_cpu_threads
+        )
+    return _processing_services[key]
+
+
+def process_meeting_audio(db, meeting: models.Meeting, job: models.Job, cancel_token: CancellationToken):
+    meeting_id = meeting.id
+
+    meeting.status = "processing"
+    db.commit()
+
+    processing_service = get_processing_service(meeting.diarization, meeting.num_speakers)
+
+    # Stages already completed by a previous attempt are loaded from their checkpoints
+    checkpoints = CheckpointStore(
+        job_id=job.id,
+        meeting_id=meeting_id,
+        artifact_dir=ARTIFACT_DIR
+    )
+
+    result = processing_service.process_meeting_audio(
+        audio_path=meeting.audio_file_path,
+        output_dir=OUTPUT_DIR,
+        checkpoints=checkpoints,
+        cancel_token=cancel_token,
+        on_progress=JobProgressReporter(job.id),
+        waveform_dir=WaveformService.directory(meeting_id)
+    )
+
+    # Don't write results for a job that was cancelled or deleted during the last stage
+    cancel_token.raise_if_cancelled()
+
+    # =============================
+    # UPDATE MEETING
+    # =============================
+
+    meeting.duration = result["duration"]
+
+    # Remove old transcript/summary/speakers if re-processing
+    db.query(models.Transcript).filter(
+        models.Transcript.meeting_id == meeting_id
+    ).delete()
+
+    db.query(models.Summary).filter(
+        models.Summary.meeting_id == meeting_id
+    ).delete()
+
+    db.query(models.Speaker).filter(
+        models.Speaker.meeting_id == meeting_id
+    ).delete()
+
+    db.query(models.TranscriptSegment).filter(
+        models.TranscriptSegment.meeting_id == meeting_id
+    ).delete()
+
+    # =============================
+    # SAVE TRANSCRIPT
+    # =============================
+
+    db_transcript = models.Transcript(
+        meeting_id=meeting_id,
+        raw_text=result["raw_text"],
+        reconstructed_text=result["reconstructed_text"]
+    )
+
+    db.add(db_transcript)
+
+    # =============================
+    # SAVE SEGMENTS
+    # =============================
+
+    # One executemany per batch instead of an ORM object per segment
+    segment_rows = [
+        {"meeting_id": meeting_id, "position": position, **segment}
+        for position, segment in enumerate(result["segments"])
+    ]
+    for i in range(0, len(segment_rows), SEGMENT_INSERT_BATCH):
+        db.execute(insert(models.TranscriptSegment), segment_rows[i:i + SEGMENT_INSERT_BATCH])
+
+    # =============================
+    # SAVE SUMMARY
+    # =============================
+
+    summary = result["summary"]
+
+    db_summary = models.Summary(
+        meeting_id=meeting_id,
+        executive_summary=summary["executive_summary"],
+        topics_json=json.dumps(summary["topics"]),
+        decisions_json=json.dumps(summary["decisions"]),
+        action_items_json=json.dumps(summary["action_items"]),
+        discussions_json=json.dumps(summary["discussions"])
+    )
+
+    db.add(db_summary)
+
+    # =============================
+    # SAVE SPEAKERS
+    # =============================
+
+    for label in result["detected_speakers"]:
+        db.add(models.Speaker(
+            meeting_id=meeting_id,
+            label=label,
+            name=None
+        ))
+
+    SearchIndexService.index_meeting(db, meeting_id)
+
+    # New results: cached exports of the previous version are no longer served
+    meeting.content_version = (meeting.content_version or 0) + 1
+    meeting.status = "completed"
+    db.commit()
+
+
+def run_job(db, job: models.Job, worker_id: str = None):
+    meeting = job.meeting
+
+    if meeting is None:
+        JobQueueService.fail(db, job, "Meeting no longer exists")
+        return
+
+    job_id = job.id
+    meeting_id = meeting.id
+    audio_path = meeting.audio_file_path
+    cancel_token = CancellationToken()
+    watcher = JobWatcher(job_id, cancel_token, worker_id=worker_id)
+    watcher.start()
+
+    try:
+        if not os.path.isfile(audio_path):
+            raise FileNotFoundError(f"Audio file missing: {audio_path}")
+
+        process_meeting_audio(db, meeting, job, cancel_token)
+        JobQueueService.complete(db, job)
+        print(f"Job {job.id} completed (meeting {meeting.id})")
+
+        # Older stage versions can no longer be the latest result of this meeting
+        try:
+            pruned = CheckpointStore(job_id, meeting_id, ARTIFACT_DIR).prune(keep=[audio_path])
+            if pruned:
+                print(f"Pruned {pruned} superseded checkpoint(s) of meeting {meeting_id}")
+        except Exception as e:
+            print(f"Pruning checkpoints of meeting {meeting_id} failed: {e}")
+
+        # Playback rendition; the API serves the original and asks again if this fails
+        try:
+            AudioPreviewService.ensure(meeting_id, audio_path)
+        except Exception as e:
+            print(f"Audio preview for meeting {meeting_id} failed: {e}")
+
+    except JobCancelled:
+        db.rollback()
+
+        if cancel_token.reason == "lease_lost":
+            # Another worker owns the job now and may be using the same files
+            print(f"Job {job_id} lost its lease, abandoning it")
+            return
+
+        print(f"Job {job_id} cancelled")
+        ProcessingService.cleanup_temp_files(audio_path, OUTPUT_DIR)
+
+        # The meeting was deleted while a stage was running; drop what that stage checkpointed
+        if db.get(models.Meeting, meeting_id) is None:
+            CheckpointStore.remove_meeting(meeting_id, keep=[audio_path])
+
+        job = db.get(models.Job, job_id)
+        if job is not None:
+            JobQueueService.mark_cancelled(db, job)
+
+    except Exception as e:
+        print(f"Processing error in job {job.id}: {e}")
+        traceback.print_exc()
+
+        db.rollback()
+        job = db.get(models.Job, job.id)
+        if job is None:
+            return
+
+        if job.cancel_requested:
+            JobQueueService.mark_cancelled(db, job)
+            return
+
+        retried = JobQueueService.fail(db, job, str(e))
+        if retried:
+            print(f"Job {job.id} will be retried (attempt {job.attempts}/{job.max_attempts})")
+
+    finally:
+        watcher.stop()
+
+
+def encode_requested_preview(db) -> bool:
+    """Encode one audio preview the API asked for. Returns False when none was requested."""
+    meeting_id = AudioPreviewService.take_request()
+    if meeting_id is None:
+        return False
+
+    meeting = db.get(models.Meeting, meeting_id)
+    if meeting is None or not os.path.isfile(meeting.audio_file_path):
+        return True
+
+    try:
+        AudioPreviewService.ensure(meeting_id, meeting.audio_file_path)
+        print(f"Encoded audio preview for meeting {meeting_id}")
+    except Exception as e:
+        print(f"Audio preview for meeting {meeting_id} failed: {e}")
+    return True
+
+
+def run_worker(worker_id: str, poll_interval: float = JOB_POLL_INTERVAL, max_jobs: int = 0, cpu_threads: int = 0):
+    global _cpu_threads
+    _cpu_threads = cpu_threads
+
+    # Connections inherited from the parent process must not be shared
+    engine.dispose(close=False)
+
+    print(f"Worker {worker_id} started")
+
+    jobs_done = 0
+
+    # max_jobs > 0 recycles the process after that many jobs; the supervisor starts a fresh one
+    while not max_jobs or jobs_done < max_jobs:
+        db = SessionLocal()
+        try:
+            job = JobQueueService.claim(db, worker_id)
+            if job is None:
+                # Idle: make the playback renditions requested by the API
+                if not encode_requested_preview(db):
+                    time.sleep(poll_interval)
+                continue
+
+            print(f"Worker {worker_id} claimed job {job.id} (meeting {job.meeting_id}, attempt {job.attempts})")
+            run_job(db, job, worker_id)
+            jobs_done += 1
+
+        except Exception as e:
+            print(f"Worker {worker_id} error: {e}")
+            time.sleep(poll_interval)
+
+        finally:
+            db.close()
+
+    print(f"Worker {worker_id} processed {jobs_done} job(s), exiting")
+
+
+def recover_stale_jobs():
+    db = SessionLocal()
+    try:
+        recovered = JobQueueService.recover_stale(db)
+        if recovered:
+            print(f"Recovered {recovered} stale job(s)")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meeting processing worker")
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=JOB_WORKER_CONCURRENCY,
+        help="Number of worker processes (default: JOB_WORKER_CONCURRENCY or 1)"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=JOB_POLL_INTERVAL,
+        help="Seconds to wait between polls when the queue is empty"
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=0,
+        help="Restart each worker process after this many jobs (default: 0 = never)"
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=int,
+        default=WORKER_CPU_BUDGET,
+        help="Total Whisper CPU threads shared by all worker processes (default: 0 = no limit)"
+    )
+    parser.add_argument(
+        "--name",
+        default=socket.gethostname(),
+        help="Node name used in worker ids (default: hostname)"
+    )
+    args = parser.parse_args()
+
+    host = args.name
+    workers: dict[int, multiprocessing.Process] = {}
+
+    def start_worker(slot: int):
+        worker_id = f"{host}:{os.getpid()}:{slot}"
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(worker_id, args.poll_interval, args.max_jobs, split_cpu_budget(args.cpu_budget, args.concurrency)),
+            daemon=True
+        )
+        process.start()
+        workers[slot] = process
+
+    recover_stale_jobs()
+
+    for slot in range(args.concurrency):
+        start_worker(slot)
+
+    try:
+        # Supervisor loop: restart crashed workers and recover abandoned jobs
+        while True:
+            time.sleep(JOB_RECOVERY_INTERVAL)
+
+            for slot, process in list(workers.items()):
+                if not process.is_alive():
+                    print(f"Worker slot {slot} exited with code {process.exitcode}, restarting")
+                    start_worker(slot)
+
+            recover_stale_jobs()
+
+    except KeyboardInterrupt:
+        print("\nStopping workers...")
+        for process in workers.values():
+            process.terminate()
+        for process in workers.values():
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 import { Component } from '@angular/core';
 import { ActivatedRoute } from '@angular/router';
 import { MeetingService } from '../services/meeting.service';
-import { Meeting } from '../models/meeting.model';
+import { Meeting, MeetingEvent } from '../models/meeting.model';
 import { NgIf, NgForOf, DatePipe, AsyncPipe, DecimalPipe } from '@angular/common';
 import { FormsModule } from '@angular/forms';
-import { Observable, switchMap, interval, takeWhile, map } from 'rxjs';
+import { Observable, switchMap, takeWhile } from 'rxjs';
 import { MatCardModule } from '@angular/material/card';
 import { MatButtonModule } from '@angular/material/button';
 import { MatProgressSpinnerModule } from '@angular/material/progress-spinner';
@@ -32,6 +32,8 @@ import { MatTabsModule } from '@angular/material/tabs';
 export class MeetingDetailComponent {
   meeting$?: Observable<Meeting>;
   processing = false;
+  stage: string | null = null;
+  progress: number | null = null;
 
   constructor(
     private route: ActivatedRoute,
@@ -63,15 +65,16 @@ export class MeetingDetailComponent {
 
     this.meetingService.processMeeting(meeting.id).subscribe({
       next: () => {
-        interval(2000).pipe(
-          switchMap(() => this.meetingService.getStatus(meeting.id)),
-          takeWhile(status => status.status !== 'completed' && status.status !== 'failed', true)
+        this.meetingService.watchStatus(meeting.id).pipe(
+          takeWhile(event => !this.isFinished(event), true)
         ).subscribe({
-          next: status => {
-            if (status.status === 'completed' || status.status === 'failed') {
-              this.processing = false;
-              this.meeting$ = this.meetingService.getMeeting(meeting.id);
-            }
+          next: event => {
+            this.stage = event.stage;
+            this.progress = event.progress;
+          },
+          complete: () => {
+            this.processing = false;
+            this.meeting$ = this.meetingService.getMeeting(meeting.id);
           },
           error: err => {
             console.error(err);
@@ -86,6 +89,20 @@ export class MeetingDetailComponent {
     });
   }
 
+  private isFinished(event: MeetingEvent): boolean {
+    return event.status === 'deleted' || ['completed', 'failed', 'cancelled'].includes(event.job_status ?? '');
+  }
+
+  cancelProcessing(meeting: Meeting): void {
+    this.meetingService.cancelProcessing(meeting.id).subscribe({
+      error: err => console.error(err)
+    });
+  }
+
+  audioUrl(meeting: Meeting): string {
+    return this.meetingService.getAudioUrl(meeting.id);
+  }
+
   exportMeeting(meeting: Meeting, format: string): void {
     this.meetingService.exportMeeting(meeting.id, format).subscribe(blob => {
       const url = window.URL.createObjectURL(blob);
@@ -1,9 +1,8 @@
 import { Component } from '@angular/core';
 import { MeetingService } from '../services/meeting.service';
 import { Meeting } from '../models/meeting.model';
-import { NgIf, NgForOf, DatePipe, AsyncPipe } from '@angular/common';
+import { NgIf, NgForOf, DatePipe } from '@angular/common';
 import { RouterModule } from '@angular/router';
-import { Observable } from 'rxjs';
 import { MatCardModule } from '@angular/material/card';
 import { MatButtonModule } from '@angular/material/button';
 
@@ -12,17 +11,42 @@ import { MatButtonModule } from '@angular/material/button';
   selector: 'app-meeting-list',
   templateUrl: './meeting-list.component.html',
   styleUrls: ['./meeting-list.component.scss'],
-  imports: [NgIf, NgForOf, AsyncPipe, DatePipe, RouterModule, MatCardModule, MatButtonModule]
+  imports: [NgIf, NgForOf, DatePipe, RouterModule, MatCardModule, MatButtonModule]
 })
 export class MeetingListComponent {
-  meetings$?: Observable<Meeting[]>;
+  meetings: Meeting[] | null = null;
+  nextCursor: string | null = null;
+  loadingMore = false;
 
   constructor(private meetingService: MeetingService) {
     this.loadMeetings();
   }
 
   loadMeetings(): void {
-    this.meetings$ = this.meetingService.getMeetings();
+    this.meetingService.getMeetings().subscribe({
+      next: page => {
+        this.meetings = page.meetings;
+        this.nextCursor = page.nextCursor;
+      },
+      error: err => console.error(err)
+    });
+  }
+
+  loadMore(): void {
+    if (!this.nextCursor || this.loadingMore) return;
+
+    this.loadingMore = true;
+    this.meetingService.getMeetings(this.nextCursor).subscribe({
+      next: page => {
+        this.meetings = [...(this.meetings ?? []), ...page.meetings];
+        this.nextCursor = page.nextCursor;
+        this.loadingMore = false;
+      },
+      error: err => {
+        console.error(err);
+        this.loadingMore = false;
+      }
+    });
   }
 
   deleteMeeting(id: number): void {
@@ -3,12 +3,30 @@ export interface Speaker {
   name: string | null;
 }
 
+export interface Decision {
+  decision: string;
+  rationale: string;
+}
+
+export interface ActionItem {
+  task: string;
+  assignee: string | null;
+  deadline: string | null;
+}
+
+export interface Discussion {
+  topic: string;
+  context: string;
+  key_arguments: string[];
+  conclusion: string;
+}
+
 export interface Summary {
   executive_summary: string | null;
   topics: string[];
-  decisions: string[];
-  action_items: string[];
-  discussions: string[];
+  decisions: Decision[];
+  action_items: ActionItem[];
+  discussions: Discussion[];
 }
 
 export interface Transcript {
@@ -26,6 +44,33 @@ export interface Meeting {
   transcript?: Transcript;
   summaries?: Summary[];
   speakers?: Speaker[];
+  speaker_count?: number;
+}
+
+export interface MeetingPage {
+  meetings: Meeting[];
+  nextCursor: string | null;
 }
 
 export interface MeetingDetail extends Meeting {}
+
+export interface Job {
+  id: number;
+  status: "queued" | "running" | "completed" | "failed" | "cancelled";
+  attempts: number;
+  cancel_requested: boolean;
+}
+
+export interface MeetingStatus {
+  status: string;
+  job: Job | null;
+}
+
+export interface MeetingEvent {
+  meeting_id: number;
+  status: string;
+  job_id: number | null;
+  job_status: Job["status"] | null;
+  stage: string | null;
+  progress: number | null;
+}
@@ -1,7 +1,7 @@
-import { Injectable } from '@angular/core';
+import { Injectable, NgZone } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http';
-import { Observable } from 'rxjs';
-import { Meeting, MeetingDetail, Speaker } from '../models/meeting.model';
+import { Observable, map } from 'rxjs';
+import { Meeting, MeetingDetail, MeetingEvent, MeetingPage, MeetingStatus, Speaker } from '../models/meeting.model';
 
 @Injectable({
   providedIn: 'root'
@@ -9,10 +9,19 @@ import { Meeting, MeetingDetail, Speaker } from '../models/meeting.model';
 export class MeetingService {
   private baseUrl = '/api/meetings/';
 
-  constructor(private http: HttpClient) {}
+  constructor(private http: HttpClient, private zone: NgZone) {}
 
-  getMeetings(): Observable<Meeting[]> {
-    return this.http.get<Meeting[]>(this.baseUrl);
+  getMeetings(cursor?: string | null): Observable<MeetingPage> {
+    let params = new HttpParams();
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
+    return this.http.get<Meeting[]>(this.baseUrl, { params, observe: 'response' }).pipe(
+      map(response => ({
+        meetings: response.body ?? [],
+        nextCursor: response.headers.get('X-Next-Cursor')
+      }))
+    );
   }
 
   getMeeting(id: number): Observable<MeetingDetail> {
@@ -31,14 +40,41 @@ export class MeetingService {
     return this.http.post<void>(`${this.baseUrl}${id}/process`, {});
   }
 
-  getStatus(id: number): Observable<{ status: string }> {
-    return this.http.get<{ status: string }>(`${this.baseUrl}${id}/status`);
+  cancelProcessing(id: number): Observable<void> {
+    return this.http.post<void>(`${this.baseUrl}${id}/cancel`, {});
+  }
+
+  getStatus(id: number): Observable<MeetingStatus> {
+    return this.http.get<MeetingStatus>(`${this.baseUrl}${id}/status`);
+  }
+
+  // Status updates pushed by the server (SSE) instead of polling /status
+  watchStatus(id: number): Observable<MeetingEvent> {
+    return new Observable<MeetingEvent>(subscriber => {
+      const source = new EventSource(`${this.baseUrl}${id}/events`);
+
+      source.addEventListener('status', event => {
+        this.zone.run(() => subscriber.next(JSON.parse((event as MessageEvent).data)));
+      });
+      source.onerror = () => {
+        // The server closes the stream after the final event; don't let the browser reconnect
+        source.close();
+        this.zone.run(() => subscriber.complete());
+      };
+
+      return () => source.close();
+    });
   }
 
   updateSpeakers(id: number, speakers: Speaker[]): Observable<void> {
     return this.http.put<void>(`${this.baseUrl}${id}/speakers`, speakers);
   }
 
+  // Range-capable URL for <audio>; the preview rendition is a small Opus file
+  getAudioUrl(id: number, rendition: 'preview' | 'original' = 'preview'): string {
+    return `${this.baseUrl}${id}/audio?rendition=${rendition}`;
+  }
+
   exportMeeting(id: number, format: string): Observable<Blob> {
     const params = new HttpParams().set('format', format);
     return this.http.get(`${this.baseUrl}${id}/export`, { params, responseType: 'blob' });
@@ -0,0 +1,132 @@
+"""
+Live capture benchmark: CPU spent per captured second of audio.
+
+Replays audio through both capture pipelines of live mode without a
+microphone, at several chunk durations:
+
+- polling: the previous loop; reads of a tenth of a chunk appended with
+  np.concatenate, then VAD over each whole chunk
+- ring: audio callback blocks written into the preallocated ring buffer,
+  VAD over the new frames only (StreamingVad), once VAD_BATCH_SAMPLES
+  have arrived
+
+    python -m scripts.benchmarks.live_capture --seconds 300 --chunk-durations 1 2 5 10
+    python -m scripts.benchmarks.live_capture --wav output/recording.wav
+"""
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from scripts.utils.live_audio import RingBuffer, StreamingVad, VAD_BATCH_SAMPLES
+
+SAMPLE_RATE = 16000
+CAPTURE_BLOCK_SIZE = SAMPLE_RATE // 10
+RING_SLACK_SECONDS = 10
+
+VAD_OPTIONS = VadOptions(threshold=0.5, min_speech_duration_ms=200, min_silence_duration_ms=150)
+
+
+def synthetic_audio(seconds: float, seed: int = 3) -> np.ndarray:
+    """Voiced bursts (gliding pitch, syllable-rate envelope) separated by pauses, as int16."""
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    position = 0
+    while position < len(audio):
+        length = min(int(rng.uniform(0.5, 4.0) * SAMPLE_RATE), len(audio) - position)
+        t = np.arange(length) / SAMPLE_RATE
+        pitch = rng.uniform(90, 250) * (1 + 0.15 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+        rolloff = rng.uniform(2, 6)
+        voiced = sum(np.sin(k * phase) * np.exp(-k / rolloff) for k in range(1, 12))
+        envelope = np.clip(np.sin(2 * np.pi * rng.uniform(3, 6) * t + rng.uniform(0, 6)), 0, None)
+        audio[position:position + length] = 0.2 * voiced * envelope + 0.005 * rng.standard_normal(length)
+        position += length + int(rng.uniform(0.2, 1.5) * SAMPLE_RATE)
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+def load_audio(path: str) -> np.ndarray:
+    audio, sample_rate = sf.read(path, dtype="int16", always_2d=True)
+    if sample_rate != SAMPLE_RATE:
+        raise SystemExit(f"{path} is {sample_rate} Hz; live mode captures {SAMPLE_RATE} Hz")
+    return audio[:, 0].copy()
+
+
+def run_polling(audio: np.ndarray, chunk_duration: int) -> int:
+    chunk_size = SAMPLE_RATE * chunk_duration
+    read_size = chunk_size // 10
+    chunk_buffer = np.empty((0,), dtype=np.int16)
+    segments = 0
+
+    for offset in range(0, len(audio), read_size):
+        chunk_buffer = np.concatenate((chunk_buffer, audio[offset:offset + read_size]))
+        if len(chunk_buffer) >= chunk_size:
+            float_buffer = chunk_buffer.astype(np.float32) / 32768.0
+            for seg in get_speech_timestamps(audio=float_buffer, vad_options=VAD_OPTIONS, sampling_rate=SAMPLE_RATE):
+                voiced_chunk = chunk_buffer[seg["start"]:seg["end"]]
+                segments += len(voiced_chunk) > 0
+            chunk_buffer = np.empty((0,), dtype=np.int16)
+
+    return segments
+
+
+def run_ring(audio: np.ndarray, chunk_duration: int) -> int:
+    chunk_size = SAMPLE_RATE * chunk_duration
+    ring = RingBuffer(SAMPLE_RATE * (chunk_duration * 2 + RING_SLACK_SECONDS))
+    vad = StreamingVad(VAD_OPTIONS, SAMPLE_RATE, max_segment_samples=chunk_size)
+    position = 0
+    segments = 0
+
+    for offset in range(0, len(audio), CAPTURE_BLOCK_SIZE):
+        # What the PortAudio callback does
+        ring.write(audio[offset:offset + CAPTURE_BLOCK_SIZE])
+
+        # What the consumer thread does once a VAD batch has arrived
+        written = ring.written
+        if written - position < VAD_BATCH_SAMPLES:
+            continue
+        for start, end in vad.process(ring.slice(position, written)):
+            segments += len(ring.slice(start, end)) > 0
+        position = written
+
+    for start, end in vad.process(ring.slice(position, ring.written)) + vad.flush():
+        segments += len(ring.slice(start, end)) > 0
+    return segments
+
+
+def measure(fn, audio: np.ndarray, chunk_duration: int, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    segments = 0
+    for _ in range(repeat):
+        started = time.process_time()
+        segments = fn(audio, chunk_duration)
+        best = min(best, time.process_time() - started)
+    return best, segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CPU per captured second of the live capture pipelines")
+    parser.add_argument("--seconds", type=float, default=120.0, help="Length of the synthetic audio (default: 120)")
+    parser.add_argument("--wav", type=str, help="16 kHz WAV to replay instead of synthetic audio")
+    parser.add_argument("--chunk-durations", type=int, nargs="+", default=[1, 2, 5, 10], help="Chunk durations in seconds (default: 1 2 5 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is reported (default: 3)")
+    args = parser.parse_args()
+
+    audio = load_audio(args.wav) if args.wav else synthetic_audio(args.seconds)
+    captured = len(audio) / SAMPLE_RATE
+    print(f"Audio: {captured:.0f} s\n")
+
+    # Load the VAD model outside the measurements
+    get_speech_timestamps(np.zeros(SAMPLE_RATE, dtype=np.float32), VAD_OPTIONS, sampling_rate=SAMPLE_RATE)
+
+    print(f"{'chunk':>6}  {'pipeline':<10}{'CPU ms / s':>12}{'segments':>10}")
+    for chunk_duration in args.chunk_durations:
+        for name, fn in (("polling", run_polling), ("ring", run_ring)):
+            cpu, segments = measure(fn, audio, chunk_duration, args.repeat)
+            print(f"{chunk_duration:>5}s  {name:<10}{cpu * 1000 / captured:>12.2f}{segments:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Live mode word latency: chunked VAD segments vs. streaming local agreement.
+
+Replays a 16 kHz WAV as if it were captured in real time, with one
+transcription worker. Audio arrives on a simulated clock; each decode
+advances the clock by the time it really took. A word's latency is the
+time from when the audio holding its end arrived until the word was
+printed (committed, for streaming mode).
+
+    python -m scripts.benchmarks.live_latency --wav meeting.wav --model small --chunk-duration 5 --min-chunk 1
+"""
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+from faster_whisper import WhisperModel
+from faster_whisper.vad import VadOptions
+
+from scripts.utils.live_audio import StreamingVad, VAD_BATCH_SAMPLES
+from scripts.utils.streaming import LocalAgreementDecoder, percentile
+
+SAMPLE_RATE = 16000
+VAD_OPTIONS = VadOptions(threshold=0.5, min_speech_duration_ms=200, min_silence_duration_ms=150)
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def decode(self, fn):
+        started = time.perf_counter()
+        result = fn()
+        self.now += time.perf_counter() - started
+        return result
+
+
+def run_chunked(model: WhisperModel, audio: np.ndarray, chunk_duration: int, language: str) -> list[float]:
+    clock = SimulatedClock()
+    vad = StreamingVad(VAD_OPTIONS, SAMPLE_RATE, max_segment_samples=SAMPLE_RATE * chunk_duration)
+    latencies = []
+
+    segments = []
+    for offset in range(0, len(audio), VAD_BATCH_SAMPLES):
+        block = audio[offset:offset + VAD_BATCH_SAMPLES]
+        # The segment is queued once the batch that closes it has arrived
+        ready = (offset + len(block)) / SAMPLE_RATE
+        segments += [(start, end, ready) for start, end in vad.process(block)]
+    segments += [(start, end, len(audio) / SAMPLE_RATE) for start, end in vad.flush()]
+
+    for start, end, ready in segments:
+        clock.now = max(clock.now, ready)
+        chunk = audio[start:end].astype(np.float32) / 32768.0
+
+        def decode():
+            result, _info = model.transcribe(chunk, language=language, beam_size=5, word_timestamps=True)
+            return [w for segment in result for w in (segment.words or [])]
+
+        words = clock.decode(decode)
+        latencies += [clock.now - (start / SAMPLE_RATE + w.end) for w in words]
+
+    return latencies
+
+
+def run_streaming(model: WhisperModel, audio: np.ndarray, min_chunk: float, language: str) -> list[float]:
+    clock = SimulatedClock()
+    decoder = LocalAgreementDecoder(model, language, sample_rate=SAMPLE_RATE, clock=clock)
+    step_samples = int(min_chunk * SAMPLE_RATE)
+    position = 0
+
+    while position < len(audio):
+        # Everything captured while the worker was busy, but at least min_chunk
+        available = max(int(clock.now * SAMPLE_RATE), position + step_samples)
+        end = min(available, len(audio))
+        clock.now = max(clock.now, end / SAMPLE_RATE)
+
+        for block_start in range(position, end, VAD_BATCH_SAMPLES):
+            block_end = min(block_start + VAD_BATCH_SAMPLES, end)
+            decoder.insert(audio[block_start:block_end], block_start / SAMPLE_RATE, arrived=block_end / SAMPLE_RATE)
+        position = end
+
+        clock.decode(decoder.step)
+
+    clock.decode(decoder.finish)
+    return decoder.latencies
+
+
+def report(name: str, latencies: list[float]):
+    if not latencies:
+        print(f"{name:<24}{'no words':>10}")
+        return
+    print(f"{name:<24}{len(latencies):>10}{percentile(latencies, 50):>10.2f}{percentile(latencies, 95):>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure word latency of the live transcription modes")
+    parser.add_argument("--wav", type=str, required=True, help="16 kHz mono WAV with speech")
+    parser.add_argument("--model", type=str, default="small", help="Whisper model (default: small)")
+    parser.add_argument("--language", type=str, default="sr", help="Language code (default: sr)")
+    parser.add_argument("--chunk-duration", type=int, default=5, help="Chunked mode: maximum segment length (default: 5)")
+    parser.add_argument("--min-chunk", type=float, default=1.0, help="Streaming mode: seconds between decodes (default: 1.0)")
+    args = parser.parse_args()
+
+    audio, sample_rate = sf.read(args.wav, dtype="int16", always_2d=True)
+    if sample_rate != SAMPLE_RATE:
+        raise SystemExit(f"{args.wav} is {sample_rate} Hz; live mode captures {SAMPLE_RATE} Hz")
+    audio = audio[:, 0].copy()
+
+    model = WhisperModel(args.model, device="cpu", compute_type="float32")
+    print(f"Audio: {len(audio) / SAMPLE_RATE:.0f} s, model: {args.model}\n")
+
+    print(f"{'mode':<24}{'words':>10}{'median s':>10}{'p95 s':>10}")
+    report(f"chunked ({args.chunk_duration}s)", run_chunked(model, audio, args.chunk_duration, args.language))
+    report(f"streaming ({args.min_chunk}s)", run_streaming(model, audio, args.min_chunk, args.language))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Serialization and compression benchmark for large meeting payloads.
+
+Builds a realistic long meeting (segments, transcript text and summary) and
+compares the JSON encoders the API can use, then the bytes on the wire with
+gzip at several levels (and brotli, if installed).
+
+    python -m scripts.benchmarks.serialization --hours 2 --repeat 20
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+WORDS = (
+    "dobro jutro kolege danas imamo sastanak o budžetu za sledeći kvartal moramo da pregledamo "
+    "rokove za projekat i da dogovorimo ko preuzima koje zadatke deployment je zakazan za petak "
+    "ali backend tim još radi na API endpointima frontend je spreman testiranje počinje u sredu "
+    "klijent je tražio dodatne izveštaje šta mislite o tome da pomerimo release čačak niš beograd"
+).split()
+
+
+class SegmentModel(BaseModel):
+    id: int
+    meeting_id: int
+    position: int
+    start: float
+    end: float
+    speaker: Optional[str]
+    speaker_name: Optional[str]
+    raw_text: str
+    text: str
+    confidence: Optional[float]
+
+
+class SegmentPage(BaseModel):
+    items: list[SegmentModel]
+    next_after: Optional[int]
+
+
+def build_meeting(hours: float, speakers: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    position = 0
+    while t < hours * 3600:
+        length = rng.uniform(2.0, 12.0)
+        text = " ".join(rng.choice(WORDS) for _ in range(int(length * 2.5)))
+        label = f"speaker_{rng.randrange(speakers)}"
+        segments.append({
+            "id": position + 1,
+            "meeting_id": 1,
+            "position": position,
+            "start": round(t, 2),
+            "end": round(t + length, 2),
+            "speaker": label,
+            "speaker_name": label,
+            "raw_text": text,
+            "text": text.capitalize() + ".",
+            "confidence": round(rng.uniform(0.6, 0.99), 4)
+        })
+        t += length + rng.uniform(0.0, 1.5)
+        position += 1
+
+    transcript = "\n".join(
+        f"[{time.strftime('%H:%M:%S', time.gmtime(s['start']))} - {time.strftime('%H:%M:%S', time.gmtime(s['end']))}] "
+        f"({s['speaker']}) {s['text']}"
+        for s in segments
+    )
+
+    summary = {
+        "executive_summary": " ".join(rng.choice(WORDS) for _ in range(120)),
+        "topics": [" ".join(rng.choice(WORDS) for _ in range(6)) for _ in range(12)],
+        "decisions": [{"decision": " ".join(rng.choice(WORDS) for _ in range(10)), "rationale": " ".join(rng.choice(WORDS) for _ in range(20))} for _ in range(10)],
+        "action_items": [{"task": " ".join(rng.choice(WORDS) for _ in range(8)), "assignee": f"speaker_{i % speakers}", "deadline": None} for i in range(15)],
+        "discussions": [{"topic": " ".join(rng.choice(WORDS) for _ in range(5)), "context": " ".join(rng.choice(WORDS) for _ in range(30)), "key_arguments": [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(4)], "conclusion": " ".join(rng.choice(WORDS) for _ in range(15))} for _ in range(8)],
+    }
+
+    return {
+        "meeting": {"id": 1, "title": "Kvartalni sastanak", "date": datetime(2025, 3, 14, 10, tzinfo=timezone.utc), "status": "completed"},
+        "transcript": transcript,
+        "summary": summary,
+        "segments": segments
+    }
+
+
+def timed(fn: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    result = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoders and compression on a large meeting")
+    parser.add_argument("--hours", type=float, default=2.0, help="Meeting length in hours (default: 2)")
+    parser.add_argument("--speakers", type=int, default=6, help="Number of speakers (default: 6)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement; the best is reported (default: 10)")
+    args = parser.parse_args()
+
+    meeting = build_meeting(args.hours, args.speakers)
+    page = SegmentPage(items=[SegmentModel(**s) for s in meeting["segments"]], next_after=None)
+    print(f"Meeting: {args.hours:g} h, {len(meeting['segments'])} segments, {len(meeting['transcript']) / 1024:.0f} KB of transcript\n")
+
+    encoders = {
+        # What JSONResponse did: jsonable_encoder, then json.dumps
+        "jsonable_encoder + json": lambda: json.dumps(jsonable_encoder(meeting), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        "json (indent=2)": lambda: json.dumps(jsonable_encoder(meeting), ensure_ascii=False, indent=2).encode("utf-8"),
+        "orjson": lambda: orjson.dumps(meeting),
+        "segments: model + jsonable_encoder + json": lambda: json.dumps(jsonable_encoder(page), ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        "segments: model_dump_json": lambda: page.model_dump_json().encode("utf-8"),
+    }
+
+    print(f"{'encoder':<44}{'ms':>10}{'KB':>10}")
+    payload = b""
+    for name, fn in encoders.items():
+        ms, body = timed(fn, args.repeat)
+        print(f"{name:<44}{ms:>10.1f}{len(body) / 1024:>10.0f}")
+        if name == "orjson":
+            payload = body
+
+    print(f"\n{'compression of the orjson payload':<44}{'ms':>10}{'KB':>10}{'ratio':>8}")
+    compressors = {f"gzip -{level}": (lambda level=level: gzip.compress(payload, compresslevel=level)) for level in (1, 6, 9)}
+    if brotli is not None:
+        compressors.update({f"brotli q{q}": (lambda q=q: brotli.compress(payload, quality=q)) for q in (4, 11)})
+
+    for name, fn in compressors.items():
+        ms, body = timed(fn, max(1, args.repeat // 2))
+        print(f"{name:<44}{ms:>10.1f}{len(body) / 1024:>10.0f}{len(payload) / len(body):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+File-fed client for the /ws/live endpoint. Streams an audio file as 16 kHz
+mono PCM, paced like a microphone (or as fast as possible with --speed 0),
+prints the segments the server sends back and the meeting it was saved as.
+
+    python -m scripts.live_client meeting.mp3 --url ws://localhost:8000/ws/live --title "Standup"
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from urllib.parse import urlencode
+
+import soundfile as sf
+import websockets
+
+from scripts.utils import audio_utils
+
+SAMPLE_RATE = 16000
+DEFAULT_URL = "ws://localhost:8000/ws/live"
+DEFAULT_BLOCK_SECONDS = 0.1
+
+
+def load_pcm(audio_path: str) -> bytes:
+    info = sf.info(audio_path) if audio_path.lower().endswith(".wav") else None
+    if info is not None and info.samplerate == SAMPLE_RATE and info.channels == 1:
+        audio, _ = sf.read(audio_path, dtype="int16")
+        return audio.astype("<i2").tobytes()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        wav_path = audio_utils.convert_to_wav_16k_mono(audio_path, tmp_dir)
+        audio, _ = sf.read(wav_path, dtype="int16")
+        return audio.astype("<i2").tobytes()
+
+
+def format_time(seconds: float) -> str:
+    return time.strftime("%H:%M:%S", time.gmtime(int(seconds)))
+
+
+async def send_audio(ws, pcm: bytes, block_seconds: float, speed: float):
+    block_bytes = int(SAMPLE_RATE * block_seconds) * 2
+    started = time.monotonic()
+
+    for i, offset in enumerate(range(0, len(pcm), block_bytes)):
+        await ws.send(pcm[offset:offset + block_bytes])
+        if speed > 0:
+            # Real-time pacing, without drifting
+            delay = started + (i + 1) * block_seconds / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    await ws.send(json.dumps({"type": "stop"}))
+
+
+async def run(args) -> int:
+    pcm = load_pcm(args.audio)
+    query = urlencode({"title": args.title, "language": args.language, "streaming": str(args.streaming).lower()})
+    print(f"Streaming {len(pcm) / 2 / SAMPLE_RATE:.0f}s of audio to {args.url}")
+
+    async with websockets.connect(f"{args.url}?{query}", max_size=None) as ws:
+        ready = json.loads(await ws.recv())
+        print(f"Session {ready['session_id']} ready")
+
+        sender = asyncio.create_task(send_audio(ws, pcm, args.block_seconds, args.speed))
+        meeting_id = None
+
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                if message["type"] == "segment":
+                    print(f"\n[{format_time(message['start'])} - {format_time(message['end'])}] {message['text']}", flush=True)
+                elif message["type"] == "partial" and message["text"]:
+                    print(f"  ~ {message['text']}", end="\r", flush=True)
+                elif message["type"] == "lag":
+                    print(f"\n[{message['seconds']}s behind, decoding at {message['quality']} quality (beam {message['beam_size']})]", flush=True)
+                elif message["type"] == "saved":
+                    meeting_id = message["meeting_id"]
+        except websockets.ConnectionClosedError as e:
+            print(f"\nConnection closed: {e.rcvd.code if e.rcvd else ''} {e.rcvd.reason if e.rcvd else ''}")
+            if meeting_id:
+                print(f"Saved what was transcribed as meeting {meeting_id}")
+            return 1
+        finally:
+            sender.cancel()
+
+    print(f"\nSaved as meeting {meeting_id}" if meeting_id else "\nNothing was saved")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an audio file to the live transcription endpoint")
+    parser.add_argument("audio", help="Audio file (any format ffmpeg reads)")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"WebSocket URL (default: {DEFAULT_URL})")
+    parser.add_argument("--title", default="Live meeting", help="Title of the saved meeting")
+    parser.add_argument("--language", default="sr", help="Language code (default: sr)")
+    parser.add_argument("--streaming", action="store_true", help="Streaming decoding with partial hypotheses")
+    parser.add_argument("--block-seconds", type=float, default=DEFAULT_BLOCK_SECONDS, help=f"Audio per message (default: {DEFAULT_BLOCK_SECONDS})")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed; 0 sends as fast as possible (default: 1)")
+    args = parser.parse_args()
+
+    raise SystemExit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,20 @@
 import sounddevice as sd
 import numpy as np
-import wave
 import argparse
 import time
 import os
-import tempfile
 from faster_whisper import WhisperModel
-from faster_whisper.vad import get_speech_timestamps, VadOptions
+from faster_whisper.vad import VadOptions
 from queue import Queue
-from threading import Thread, Event, Lock
+from threading import Thread, Event, Lock, Condition
 from dataclasses import dataclass
 from pathlib import Path
-from utils import summarizer, meeting_parser, diarizer
+from utils import meeting_parser, diarizer
+from utils.live_audio import RingBuffer, StreamingVad, VAD_BATCH_SAMPLES
+from utils.streaming import LocalAgreementDecoder, join_words
+from utils.backlog import BacklogPolicy, LagMonitor, QUALITY_LEVELS
+from utils.rolling_summary import RollingSummarizer, SummaryFeeder
+from utils.session_journal import RecordingStream, TranscriptJournal, read_journal, repair_recording
 
 SAMPLE_RATE = 16000
 CHANNELS = 1
@@ -19,13 +22,29 @@ DEFAULT_CHUNK_DURATION = 5
 CHUNK_DURATION = DEFAULT_CHUNK_DURATION
 CHUNK_SIZE = SAMPLE_RATE * CHUNK_DURATION
 LANGUAGE = "sr"
+# Frames per audio callback (100 ms) and extra seconds of history kept in the ring buffer
+CAPTURE_BLOCK_SIZE = SAMPLE_RATE // 10
+RING_SLACK_SECONDS = 10
+# Streaming mode: seconds of new audio between decodes of the sliding buffer
+DEFAULT_MIN_CHUNK = 1.0
+# Transcription lag (seconds) above which live mode adds workers or degrades quality
+DEFAULT_MAX_LAG = 15.0
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_FALLBACK_MODEL = "small"
+BACKLOG_CHECK_INTERVAL = 1.0
+BACKLOG_REPORT_INTERVAL = 5.0
+# How often finished transcript lines are handed to the rolling summarizer
+SUMMARY_FEED_INTERVAL = 5.0
 
 print_lock = Lock()
 stop_event = Event()
 pause_event = Event()
+# Voiced audio as (int16 samples, start second) tuples, handed to Whisper in memory
 audio_queue = Queue()
+lag_monitor = LagMonitor()
+# Every transcript segment is appended here as soon as it exists; set up in main
+transcript_journal = None
 full_transcript = []
-all_chunk_files = []
 
 vad_options = VadOptions(
     threshold=0.5,
@@ -49,112 +68,184 @@ def safe_print(*args, **kwargs):
     with print_lock:
         print(*args, **kwargs)
 
-def save_chunk(data: np.ndarray, counter: int) -> str:
-    temp_dir = tempfile.gettempdir()
-    filename = os.path.join(temp_dir, f"chunk_{counter}.wav")
+class RecordingWriter:
+    """
+    Appends the raw capture to the session recording (WAV or FLAC) on its
+    own thread, so disk writes stay out of the path from capture to
+    transcript.
+    """
 
-    with wave.open(filename, 'w') as wf:
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(2)  # 16-bit
-        wf.setframerate(SAMPLE_RATE)
-        wf.writeframes(data.tobytes())
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._queue = Queue()
+        self._thread = Thread(target=self._run, daemon=True)
 
-    all_chunk_files.append(filename)
+    def start(self):
+        self._thread.start()
 
-    return filename
+    def write(self, data: np.ndarray):
+        self._queue.put(data)
 
-def record_chunks():
-    chunk_buffer = np.empty((0,), dtype=np.int16)
-    chunk_counter = 1
-    total_samples = 0
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        recording = RecordingStream(self.path, SAMPLE_RATE, CHANNELS)
+        try:
+            while True:
+                data = self._queue.get()
+                if data is None:
+                    break
+                recording.write(data)
+        finally:
+            recording.close()
+
+def add_segment(segment_obj: TranscriptSegment):
+    # Journaled first, so a crash right after printing cannot lose it
+    if transcript_journal is not None:
+        transcript_journal.segment(segment_obj.start, segment_obj.end, segment_obj.text)
+    full_transcript.append(segment_obj)
+    safe_print(f"\n{segment_obj.format()}", flush=True)
+
+def queue_voiced(voiced_chunk: np.ndarray, chunk_start_sec: float):
+    # Whisper gets the samples directly
+    lag_monitor.queued(chunk_start_sec, len(voiced_chunk) / SAMPLE_RATE)
+    audio_queue.put((voiced_chunk, chunk_start_sec))
+
+def capture_callback(ring: RingBuffer, stats: dict):
+    # Runs on the PortAudio thread: copy into the preallocated ring, nothing else
+    def callback(indata, frames, time_info, status):
+        if status.input_overflow:
+            stats["overflows"] += 1
+        if not pause_event.is_set():
+            ring.write(indata[:, 0])
+    return callback
+
+def record_chunks(writer: RecordingWriter, streaming: bool = False):
+    # The ring holds a full segment plus slack, so a voiced segment can still be sliced after VAD closes it
+    ring = RingBuffer(SAMPLE_RATE * (CHUNK_DURATION * 2 + RING_SLACK_SECONDS))
+    vad = StreamingVad(vad_options, SAMPLE_RATE, max_segment_samples=CHUNK_SIZE)
+    stats = {"overflows": 0}
+    position = 0
+
+    def queue_new(start_sample, end_sample):
+        new = ring.slice(start_sample, end_sample)
+        # The recording gets every frame, so transcript times are recording times
+        writer.write(new)
+        if streaming:
+            # The streaming decoder gets every frame; its own VAD skips the silence
+            queue_voiced(new, start_sample / SAMPLE_RATE)
+        else:
+            # VAD only sees the frames captured since the last pass
+            queue_segments(vad.process(new))
+
+    def skip_to(new_position):
+        # Silence in place of the lost audio keeps the recording aligned with stream time
+        writer.write(np.zeros(new_position - position, dtype=np.int16))
+        vad.reset(new_position)
+        return new_position
+
+    def queue_segments(segments):
+        for start_sample, end_sample in segments:
+            voiced_chunk = ring.slice(start_sample, end_sample)
+            if len(voiced_chunk) > 0:
+                queue_voiced(voiced_chunk, start_sample / SAMPLE_RATE)
 
     try:
-        # Open input stream from microphone
-        with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype='int16') as stream:
+        # Open callback-driven input stream from microphone
+        with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype='int16',
+                            blocksize=CAPTURE_BLOCK_SIZE, callback=capture_callback(ring, stats)):
             while not stop_event.is_set():
-                if pause_event.is_set():
-                    time.sleep(0.1)
+                # Sleeps until the callback delivers audio; while paused the callback drops frames
+                written = ring.wait(position, VAD_BATCH_SAMPLES, timeout=0.5)
+                if written - position < VAD_BATCH_SAMPLES:
                     continue
 
-                # Read small portion of audio (0.5s)
-                data, _ = stream.read(CHUNK_SIZE // 10)
-                chunk_buffer = np.concatenate((chunk_buffer, data.flatten()))
-
-                # If we have enough data for a full chunk, save it
-                if len(chunk_buffer) >= CHUNK_SIZE:
-                    float_buffer = chunk_buffer.astype(np.float32) / 32768.0
-                    speech_segments = get_speech_timestamps(
-                            audio=float_buffer,
-                            vad_options=vad_options,
-                            sampling_rate=SAMPLE_RATE
-                    )
-
-                    for seg in speech_segments:
-                        start_sample = seg['start']
-                        end_sample = seg['end']
-                        voiced_chunk = chunk_buffer[start_sample:end_sample]
-
-                        if len(voiced_chunk) > 0:
-                            filename = save_chunk(voiced_chunk, chunk_counter)
-                            
-                            chunk_start_sec = (total_samples + start_sample) / SAMPLE_RATE
-                            audio_queue.put((filename, chunk_start_sec))
-                            chunk_counter += 1
-
-                    total_samples += len(chunk_buffer)
-                    chunk_buffer = np.empty((0,), dtype=np.int16)
-
-            # Save any remaining audio in buffer
-            if len(chunk_buffer) > 0:
-                float_buffer = chunk_buffer.astype(np.float32) / 32768.0
-                speech_segments = get_speech_timestamps(
-                        audio=float_buffer,
-                        vad_options=vad_options,
-                        sampling_rate=SAMPLE_RATE
-                )
-
-                for seg in speech_segments:
-                    start_sample = seg['start']
-                    end_sample = seg['end']
-                    voiced_chunk = chunk_buffer[start_sample:end_sample]
-                    if len(voiced_chunk) > 0:
-                        filename = save_chunk(voiced_chunk, chunk_counter)
-                        chunk_start_sec = (total_samples + start_sample) / SAMPLE_RATE
-                        audio_queue.put((filename, chunk_start_sec))
-                        chunk_counter += 1
-
-    except KeyboardInterrupt:
-        safe_print("\nRecording interrupted by user.")
+                if written - position > ring.capacity:
+                    safe_print(f"\nTranscription fell behind, skipping {(written - position) / SAMPLE_RATE:.1f}s of audio")
+                    position = skip_to(written - ring.capacity)
 
-def merge_wav_files(chunk_files, output_path):
-    audio_data = []
+                queue_new(position, written)
+                position = written
+                lag_monitor.captured_to(written / SAMPLE_RATE)
 
-    for path in chunk_files:
-        with wave.open(path, 'rb') as wf:
-            frames = wf.readframes(wf.getnframes())
-            audio_data.append(np.frombuffer(frames, dtype=np.int16))
+            ring.close()
 
-    merged = np.concatenate(audio_data)
+        # Close any speech still open when recording stopped
+        written = ring.written
+        if written > position:
+            if written - position > ring.capacity:
+                position = skip_to(written - ring.capacity)
+            queue_new(position, written)
+        if not streaming:
+            queue_segments(vad.flush())
 
-    with wave.open(str(output_path), 'wb') as wf:
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(2)
-        wf.setframerate(SAMPLE_RATE)
-        wf.writeframes(merged.tobytes())
+        if stats["overflows"]:
+            safe_print(f"\nAudio input overflowed {stats['overflows']} times")
 
-def transcribe_audio(whisper_model_name: str):
-    model = WhisperModel(whisper_model_name, device="cpu", compute_type="float32")
+    except KeyboardInterrupt:
+        safe_print("\nRecording interrupted by user.")
 
+class TranscriptionPool:
+    """
+    Whisper models and the worker count / quality level shared by the
+    transcription threads. The main model is loaded with one CTranslate2
+    worker per thread so their decodes run in parallel; the fallback model
+    is loaded the first time the backlog policy asks for it.
+    """
+
+    def __init__(self, model_name: str, fallback_model_name: str, policy: BacklogPolicy):
+        self.policy = policy
+        self.model = WhisperModel(model_name, device="cpu", compute_type="float32", num_workers=policy.max_workers)
+        self.fallback_model_name = fallback_model_name
+        self._fallback_model = None
+        self._load_lock = Lock()
+        self._changed = Condition()
+
+    def decoding(self):
+        """The model and beam size for the next decode."""
+        level = self.policy.level
+        if not level.fallback_model:
+            return self.model, level.beam_size
+
+        with self._load_lock:
+            if self._fallback_model is None:
+                safe_print(f"\nLoading fallback model '{self.fallback_model_name}'...")
+                self._fallback_model = WhisperModel(self.fallback_model_name, device="cpu", compute_type="float32",
+                                                    num_workers=self.policy.max_workers)
+        return self._fallback_model, level.beam_size
+
+    def wait_active(self, index: int) -> bool:
+        # Workers past the current count sleep until the policy adds them; all of them drain the queue at the end
+        with self._changed:
+            return self._changed.wait_for(lambda: index < self.policy.workers or stop_event.is_set(), timeout=0.5)
+
+    def adjust(self, lag: float) -> bool:
+        with self._changed:
+            changed = self.policy.update(lag)
+            if changed:
+                self._changed.notify_all()
+            return changed
+
+def transcribe_audio(index: int, pool: TranscriptionPool):
     while not stop_event.is_set() or not audio_queue.empty():
+        if not pool.wait_active(index):
+            continue
+
         try:
-            chunk_path, chunk_start = audio_queue.get(timeout=0.5)
+            chunk, chunk_start = audio_queue.get(timeout=0.5)
         except:
             continue
 
+        # faster-whisper takes 16 kHz mono float32 samples as well as file paths
+        audio = chunk.astype(np.float32) / 32768.0
+        model, beam_size = pool.decoding()
+
         segments, _info = model.transcribe(
-            chunk_path,
+            audio,
             language=LANGUAGE,
-            beam_size=5,
+            beam_size=beam_size,
             word_timestamps=False
         )
 
@@ -167,23 +258,80 @@ def transcribe_audio(whisper_model_name: str):
             )
 
             if segment_obj.text:
-                full_transcript.append(segment_obj)
-                safe_print(f"\n{segment_obj.format()}", flush=True)
+                add_segment(segment_obj)
 
+        lag_monitor.done(chunk_start)
         audio_queue.task_done()
 
+def monitor_backlog(pool: TranscriptionPool):
+    last_report = 0.0
+    while not stop_event.wait(BACKLOG_CHECK_INTERVAL):
+        stats = lag_monitor.snapshot()
+        changed = pool.adjust(stats["lag"])
+
+        # Report every change, and the lag for as long as transcription is behind
+        now = time.monotonic()
+        if changed or (stats["lag"] > pool.policy.low_water and now - last_report >= BACKLOG_REPORT_INTERVAL):
+            last_report = now
+            level = pool.policy.level
+            safe_print(
+                f"\n[lag {stats['lag']:.1f}s | queued {stats['queued_seconds']:.1f}s in {stats['segments']} segments"
+                f" | workers {pool.policy.workers}/{pool.policy.max_workers} | {level.name}, beam {level.beam_size}]",
+                flush=True
+            )
+
+def emit_words(words):
+    if not words:
+        return
+
+    segment_obj = TranscriptSegment(start=words[0].start, end=words[-1].end, text=join_words(words))
+    if segment_obj.text:
+        add_segment(segment_obj)
+
+def transcribe_streaming(whisper_model_name: str, min_chunk: float):
+    model = WhisperModel(whisper_model_name, device="cpu", compute_type="float32")
+    decoder = LocalAgreementDecoder(model, LANGUAGE, sample_rate=SAMPLE_RATE)
+    decoded_until = 0.0
+
+    while not stop_event.is_set() or not audio_queue.empty():
+        try:
+            chunk, chunk_start = audio_queue.get(timeout=0.5)
+        except:
+            continue
+
+        # Take everything that arrived while the previous step was decoding
+        while True:
+            decoder.insert(chunk, chunk_start)
+            audio_queue.task_done()
+            if audio_queue.empty():
+                break
+            chunk, chunk_start = audio_queue.get_nowait()
+
+        if decoder.end - decoded_until < min_chunk:
+            continue
+        decoded_until = decoder.end
+
+        committed, partial = decoder.step()
+        emit_words(committed)
+        # A chunk is only done once its words are committed; the summary must not pass a partial hypothesis
+        for start in decoder.settled_inserts():
+            lag_monitor.done(start)
+        if partial:
+            safe_print(f"  ~ {join_words(partial)}", end="\r", flush=True)
+
+    emit_words(decoder.finish())
+    for start in decoder.settled_inserts():
+        lag_monitor.done(start)
+
+    stats = decoder.latency_stats()
+    if stats["words"]:
+        safe_print(f"\nWord latency: median {stats['median']:.2f}s, p95 {stats['p95']:.2f}s ({stats['words']} words)")
+
 def save_transcript(transcript, path):
     with open(path, "w", encoding="utf-8") as f:
         for seg in transcript:
             f.write(seg.format() + "\n")
 
-def cleanup_chunks(chunk_files):
-    for path in chunk_files:
-        try:
-            os.remove(path)
-        except OSError:
-            pass
-
 def command_listener():
     while not stop_event.is_set():
         try:
@@ -211,6 +359,64 @@ def command_listener():
             break
 
 
+def finish_session(output_wav: Path, args, rolling_summarizer=None, summary_feeder=None):
+    output_txt = output_wav.with_suffix(".txt")
+    summary_file = output_wav.with_name(output_wav.stem + "_summary." + args.format)
+
+    full_transcript.sort(key=lambda x: x.start)
+
+    if args.diarize:
+        safe_print("Running speaker diarization...")
+        diarization_segments = diarizer.diarize(str(output_wav), num_speakers=args.num_speakers)
+        speaker_map = diarizer.load_speaker_map(args.speaker_map) if args.speaker_map else None
+        segments_text = diarizer.assign_speakers_to_transcript(full_transcript, diarization_segments, speaker_map)
+    else:
+        segments_text = [seg.format() for seg in full_transcript]
+
+    with open(output_txt, "w", encoding="utf-8") as f:
+        for line in segments_text:
+            f.write(line + "\n")
+
+    safe_print(f"Audio saved to     : {output_wav}")
+    safe_print(f"Transcript saved to: {output_txt}")
+
+    if rolling_summarizer is not None:
+        # Blocks were reconstructed and summarized during the meeting; only the rest and the final reduce are left
+        safe_print("Generating meeting minutes...")
+        if summary_feeder is not None:
+            summary_feeder.feed(float("inf"))
+        minutes = rolling_summarizer.finish()
+
+        # Save summary
+        if args.format == "json":
+            summary_file.write_text(minutes.to_json(), encoding="utf-8")
+        else:
+            meeting_parser.save_meeting_minutes(minutes, summary_file)
+
+    safe_print("Done!")
+
+def recover_session(journal_file: Path, args):
+    header, segments, finished = read_journal(journal_file)
+    if header is None:
+        raise SystemExit(f"Not a live session journal: {journal_file}")
+
+    output_wav = Path(header["recording"])
+    if finished:
+        safe_print("The session finished cleanly; rebuilding its outputs anyway.")
+    if repair_recording(output_wav):
+        safe_print(f"Repaired the unfinished recording {output_wav}")
+
+    full_transcript.extend(TranscriptSegment(start=seg["start"], end=seg["end"], text=seg["text"]) for seg in segments)
+    safe_print(f"Recovered {len(segments)} segments from {journal_file}")
+
+    rolling_summarizer = None
+    if args.summarize:
+        rolling_summarizer = RollingSummarizer(cleaned_file=output_wav.with_name(output_wav.stem + "_clean.txt"), chat_model=args.llm_model)
+        rolling_summarizer.start()
+        rolling_summarizer.add_lines([seg.format() for seg in sorted(full_transcript, key=lambda x: x.start)])
+
+    finish_session(output_wav, args, rolling_summarizer)
+
 def main():
     parser = argparse.ArgumentParser(description="Live audio recording and transcription")
 
@@ -224,10 +430,39 @@ def main():
         default=DEFAULT_CHUNK_DURATION,
         help="Chunk duration in seconds"
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Decode a sliding window continuously and print partial hypotheses (default: False)"
+    )
+    parser.add_argument(
+        "--min-chunk",
+        type=float,
+        default=DEFAULT_MIN_CHUNK,
+        help=f"Streaming mode: seconds of new audio between decodes (default: {DEFAULT_MIN_CHUNK})"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Transcription workers live mode may use when it falls behind (default: {DEFAULT_MAX_WORKERS})"
+    )
+    parser.add_argument(
+        "--max-lag",
+        type=float,
+        default=DEFAULT_MAX_LAG,
+        help=f"Seconds of transcription lag before adding workers or degrading quality (default: {DEFAULT_MAX_LAG})"
+    )
+    parser.add_argument(
+        "--fallback-model",
+        type=str,
+        default=DEFAULT_FALLBACK_MODEL,
+        help=f"Smaller Whisper model used when the lag persists; 'none' to only reduce the beam (default: {DEFAULT_FALLBACK_MODEL})"
+    )
     parser.add_argument(
         "--summarize",
         action="store_true",
-        help="Run summarization after recording (true/false)"
+        help="Summarize the transcript while recording and write meeting minutes at the end (true/false)"
     )
 
     parser.add_argument(
@@ -265,11 +500,27 @@ def main():
         type=str,
         help="Path to file mapping speaker IDs to names (SPEAKER_00=Marko)"
     )
+    parser.add_argument(
+        "--audio-format",
+        type=str,
+        choices=["wav", "flac"],
+        default="wav",
+        help="Format of the session recording (default: wav)"
+    )
+    parser.add_argument(
+        "--recover",
+        type=str,
+        help="Path to the journal of a session that did not finish; rebuilds its transcript (and summary) instead of recording"
+    )
 
 
     args = parser.parse_args()
 
-    global CHUNK_DURATION, CHUNK_SIZE
+    if args.recover:
+        recover_session(Path(args.recover), args)
+        return
+
+    global CHUNK_DURATION, CHUNK_SIZE, transcript_journal
     CHUNK_DURATION = args.chunk_duration
     CHUNK_SIZE = SAMPLE_RATE * CHUNK_DURATION
     summarize_flag = args.summarize
@@ -278,8 +529,9 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     timestamp = time.strftime("%Y%m%d_%H%M%S")
-    output_wav = Path(output_dir) / f"recording_{timestamp}.wav"
+    output_wav = Path(output_dir) / f"recording_{timestamp}.{args.audio_format}"
     output_txt = output_wav.with_suffix(".txt")
+    journal_file = output_wav.with_name(output_wav.stem + "_journal.jsonl")
     summary_file = output_wav.with_name(output_wav.stem + "_summary." + args.format)
 
     safe_print(f"Recording to: {output_wav}")
@@ -293,15 +545,57 @@ def main():
     safe_print("-----------------------")
     safe_print(f"Output audio     : {os.path.abspath(output_wav)}")
     safe_print(f"Output transcript: {os.path.abspath(output_txt)}")
-    safe_print(f"Chunk duration   : {CHUNK_DURATION}s")
+    safe_print(f"Journal          : {os.path.abspath(journal_file)}")
+    if args.streaming:
+        safe_print(f"Streaming decode : every {args.min_chunk}s")
+    else:
+        safe_print(f"Chunk duration   : {CHUNK_DURATION}s")
     safe_print("-----------------------")
 
-    record_thread = Thread(target=record_chunks, daemon=True)
-    transcribe_thread = Thread(target=transcribe_audio, args=(args.model,), daemon=True)
+    transcript_journal = TranscriptJournal(journal_file)
+    transcript_journal.start(output_wav, SAMPLE_RATE)
+
+    recording_writer = RecordingWriter(output_wav)
+    recording_writer.start()
+
+    record_thread = Thread(target=record_chunks, args=(recording_writer, args.streaming), daemon=True)
+    if args.streaming:
+        transcribe_threads = [Thread(target=transcribe_streaming, args=(args.model, args.min_chunk), daemon=True)]
+        monitor_thread = None
+    else:
+        fallback_model = None if args.fallback_model.lower() == "none" or args.fallback_model == args.model else args.fallback_model
+        policy = BacklogPolicy(
+            max_workers=args.max_workers,
+            high_water=args.max_lag,
+            low_water=args.max_lag / 3,
+            levels=QUALITY_LEVELS if fallback_model else QUALITY_LEVELS[:-1]
+        )
+        pool = TranscriptionPool(args.model, fallback_model, policy)
+        transcribe_threads = [
+            Thread(target=transcribe_audio, args=(index, pool), daemon=True)
+            for index in range(policy.max_workers)
+        ]
+        monitor_thread = Thread(target=monitor_backlog, args=(pool,), daemon=True)
     command_thread = Thread(target=command_listener, daemon=True)
 
+    rolling_summarizer = None
+    summary_feeder = None
+    summary_feeder_thread = None
+    if summarize_flag:
+        cleaned_file = output_txt.with_name(output_txt.stem + "_clean.txt")
+        rolling_summarizer = RollingSummarizer(cleaned_file=cleaned_file, chat_model=args.llm_model)
+        # A voiced segment is at most one chunk plus VAD padding and batching
+        summary_feeder = SummaryFeeder(rolling_summarizer, full_transcript, lag_monitor.settled_until,
+                                       settle_margin=CHUNK_DURATION + 1)
+        summary_feeder_thread = Thread(target=summary_feeder.run, args=(stop_event, SUMMARY_FEED_INTERVAL), daemon=True)
+        rolling_summarizer.start()
+        summary_feeder_thread.start()
+
     record_thread.start()
-    transcribe_thread.start()
+    for transcribe_thread in transcribe_threads:
+        transcribe_thread.start()
+    if monitor_thread:
+        monitor_thread.start()
     command_thread.start()
 
     try:
@@ -312,57 +606,19 @@ def main():
 
     stop_event.set()
     audio_queue.join()
-    transcribe_thread.join()
+    for transcribe_thread in transcribe_threads:
+        transcribe_thread.join()
+    if monitor_thread:
+        monitor_thread.join()
+    if summary_feeder_thread:
+        summary_feeder_thread.join()
     command_thread.join()
 
     # ---- post-processing ----
-    full_transcript.sort(key=lambda x: x.start)
+    recording_writer.close()
+    transcript_journal.close()
 
-    merge_wav_files(all_chunk_files, output_wav)
-    cleanup_chunks(all_chunk_files)
-
-    if args.diarize:
-        safe_print("Running speaker diarization...")
-        merged_wav = output_wav
-        diarization_segments = diarizer.diarize(str(merged_wav), num_speakers=args.num_speakers)
-        speaker_map = diarizer.load_speaker_map(args.speaker_map) if args.speaker_map else None
-        segments_text = diarizer.assign_speakers_to_transcript(full_transcript, diarization_segments, speaker_map)
-    else:
-        segments_text = [seg.format() for seg in full_transcript]
-
-    with open(output_txt, "w", encoding="utf-8") as f:
-        for line in segments_text:
-            f.write(line + "\n")
-
-    safe_print(f"Audio saved to     : {output_wav}")
-    safe_print(f"Transcript saved to: {output_txt}")
-
-    if summarize_flag:
-        safe_print("Running transcript reconstruction and summarization...")
-        raw_text = output_txt.read_text(encoding="utf-8")
-
-        cleaned_file = output_txt.with_name(output_txt.stem + "_clean.txt")
-
-        ###summarizer.CHAT_MODEL = args.llm_model
-        meeting_parser.CHAT_MODEL = args.llm_model
-
-        list(summarizer.reconstruct_transcript(
-            raw_text,
-            terms_dict=summarizer.TERMS_TO_CORRECT,
-            output_file=cleaned_file
-        ))
-
-        minutes = meeting_parser.generate_meeting_minutes_from_file(cleaned_file)
-
-
-        # Save summary
-        if args.format == "json":
-            summary_file.write_text(minutes.to_json(), encoding="utf-8")
-        else:
-            meeting_parser.save_meeting_minutes(minutes, summary_file)
-
-
-    safe_print("Done!")
+    finish_session(output_wav, args, rolling_summarizer, summary_feeder)
 
 
 
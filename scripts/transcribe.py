@@ -1,12 +1,137 @@
 import sys, os
 import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from scripts.utils.transcriber import Transcriber, TranscriptSegment
-from scripts.utils import audio_utils, diarizer, summarizer
+from scripts.utils import audio_utils, diarizer, summarizer, model_pool
 from pathlib import Path
 
+DEFAULT_MANIFEST = "batch_manifest.jsonl"
+
+def collect_inputs(audio_input: str | None, file_list: str | None) -> list[str]:
+    # A single file, every supported audio file in a directory, and/or the paths listed in a file
+    files = []
+    if audio_input:
+        if os.path.isdir(audio_input):
+            files.extend(
+                str(p) for p in sorted(Path(audio_input).iterdir())
+                if p.is_file() and p.suffix.lower() in audio_utils.SUPPORTED_AUDIO_FORMATS
+            )
+        else:
+            files.append(audio_input)
+
+    if file_list:
+        with open(file_list, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    files.append(line)
+
+    # Keep the order, drop duplicates (also the same file under another relative path)
+    unique = {}
+    for f in files:
+        unique.setdefault(str(Path(f).resolve()), f)
+    return list(unique.values())
+
+def output_names(inputs: list[str]) -> dict[str, str]:
+    # Outputs are named after the input stem; files sharing a stem get a hash of their path so
+    # concurrent jobs never write the same WAV or transcript
+    stems = {}
+    for f in inputs:
+        stems.setdefault(Path(f).stem, []).append(f)
+
+    names = {}
+    for stem, files in stems.items():
+        for f in files:
+            if len(files) == 1:
+                names[f] = stem
+            else:
+                digest = hashlib.sha1(str(Path(f).resolve()).encode("utf-8")).hexdigest()[:8]
+                base, suffix = (stem[:-len("_16k_mono")], "_16k_mono") if stem.endswith("_16k_mono") else (stem, "")
+                names[f] = f"{base}-{digest}{suffix}"
+    return names
+
+def file_identity(path: str) -> dict:
+    stat = os.stat(path)
+    return {"path": str(Path(path).resolve()), "size": stat.st_size, "mtime": stat.st_mtime}
+
+def load_manifest(manifest_path: Path) -> dict:
+    # Completed items by path; an item counts as done only if the file did not change since
+    done = {}
+    if not manifest_path.is_file():
+        return done
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of a run that was killed mid-write
+                continue
+            done[entry["path"]] = entry
+    return done
+
+def is_done(entry: dict | None, identity: dict) -> bool:
+    return entry is not None and entry["size"] == identity["size"] and entry["mtime"] == identity["mtime"]
+
+def append_manifest(manifest_path: Path, entry: dict, lock: threading.Lock):
+    with lock:
+        with open(manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+def process_file(audio_file: str, args, transcriber: Transcriber, prompt_text: str | None, diarization_model=None, diarizer_lock=None, output_name: str | None = None) -> dict:
+    started = time.perf_counter()
+    output_path = Path(args.output)
+    output_name = output_name or Path(audio_file).stem
+
+    wav_file = audio_utils.convert_to_wav_16k_mono(
+        audio_file,
+        args.output,
+        output_name=output_name
+    )
+    audio_seconds = audio_utils.get_audio_duration(wav_file)
+
+    segments = transcriber.transcribe(wav_file, prompt=prompt_text, language="sr", verbose=args.verbose)
+
+    if args.diarize:
+        # One diarizer is shared by all threads; sherpa-onnx runs are serialized
+        with diarizer_lock:
+            diarization_segments = diarizer.diarize(wav_file, num_speakers=args.num_speakers, diarizer=diarization_model)
+        speaker_map = diarizer.load_speaker_map(args.speaker_map) if args.speaker_map else None
+        segments_text = diarizer.assign_speakers_to_transcript(segments, diarization_segments, speaker_map)
+    else:
+        segments_text = [seg.format() for seg in segments]
+
+    # Named after the converted WAV; an input that already was one keeps its own name
+    base_name = output_name if output_name.endswith("_16k_mono") else f"{output_name}_16k_mono"
+    raw_output = output_path / f"{base_name}.txt"
+    clean_output = output_path / f"{base_name}_clean.txt"
+
+    with open(raw_output, "w", encoding="utf-8") as f:
+        f.write("\n".join(segments_text))
+    if args.verbose:
+        print(f"Raw transcript saved to: {raw_output}")
+
+    raw_text = "\n".join(segments_text)
+    list(summarizer.reconstruct_transcript(raw_text, terms_dict=summarizer.SRBGLISH_TERMS, output_file=clean_output))
+    if args.verbose:
+        print(f"Clean transcript saved to: {clean_output}")
+
+    return {
+        "audio_seconds": audio_seconds,
+        "elapsed_seconds": time.perf_counter() - started,
+        "raw_output": str(raw_output),
+        "clean_output": str(clean_output)
+    }
+
 def main():
     parser = argparse.ArgumentParser(description="Speech to Text Transcription with summarization")
-    parser.add_argument("audio_file", help="Path to the audio file")
+    parser.add_argument("audio_file", nargs="?", help="Path to an audio file or a directory of audio files")
+    parser.add_argument("--file-list", help="Path to a text file listing audio files to process, one per line")
     parser.add_argument("-o", "--output", default="output", help="Output file or directory (default: output)")
     parser.add_argument("-m", "--model", default="large", help="Whisper model (default: large)")
     parser.add_argument("--prompt", help="Whisper prompt text or path to a prompt file")
@@ -14,11 +139,23 @@ def main():
     parser.add_argument("--diarize", action="store_true", help="Enable speaker diarization (default: False)")
     parser.add_argument("--num-speakers", type=int, default=-1, help="Number of speakers; -1 = auto-detect")
     parser.add_argument("--speaker-map", type=str, help="Path to file mapping speaker IDs to names (SPEAKER_00=Marko)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Files transcribed concurrently with the shared model (default: 1)")
+    parser.add_argument("--cpu-budget", type=int, default=0, help="Total CPU threads for all concurrent transcriptions (default: 0 = no limit)")
+    parser.add_argument("--manifest", help=f"Resumable manifest of completed files (default: <output>/{DEFAULT_MANIFEST})")
+    parser.add_argument("--force", action="store_true", help="Process files again even if the manifest lists them as completed")
 
     args = parser.parse_args()
 
-    if not audio_utils.validate_audio_format(args.audio_file):
-        print(f"Invalid or non-existent audio file: {args.audio_file}")
+    if not args.audio_file and not args.file_list:
+        parser.error("give an audio file, a directory or --file-list")
+
+    inputs = collect_inputs(args.audio_file, args.file_list)
+    invalid = [f for f in inputs if not audio_utils.validate_audio_format(f)]
+    for f in invalid:
+        print(f"Invalid or non-existent audio file: {f}")
+    inputs = [f for f in inputs if f not in invalid]
+
+    if not inputs:
         sys.exit(1)
 
     prompt_text = None
@@ -32,37 +169,72 @@ def main():
     output_path = Path(args.output)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    wav_file = audio_utils.convert_to_wav_16k_mono(
-        args.audio_file,
-        args.output
+    manifest_path = Path(args.manifest) if args.manifest else output_path / DEFAULT_MANIFEST
+    completed = {} if args.force else load_manifest(manifest_path)
+
+    pending = []
+    for audio_file in inputs:
+        identity = file_identity(audio_file)
+        if is_done(completed.get(identity["path"]), identity):
+            print(f"Skipping {audio_file} (already in {manifest_path})")
+            continue
+        pending.append((audio_file, identity))
+
+    if not pending:
+        print("Nothing to do.")
+        return
+
+    jobs = max(1, min(args.jobs, len(pending)))
+    names = output_names(inputs)
+
+    # Models are loaded once and shared by every file; num_workers lets threads decode in parallel
+    transcriber = model_pool.get_transcriber(
+        model_size=args.model,
+        device="cpu",
+        cpu_threads=model_pool.split_cpu_budget(args.cpu_budget, jobs),
+        num_workers=jobs
     )
+    diarization_model = model_pool.get_diarizer(num_speakers=args.num_speakers) if args.diarize else None
+    diarizer_lock = threading.Lock()
+    manifest_lock = threading.Lock()
 
-    transcriber = Transcriber(model_size=args.model, device="cpu")
-    segments = transcriber.transcribe(wav_file, prompt=prompt_text, language="sr", verbose=args.verbose)
+    batch_started = time.perf_counter()
+    audio_seconds_done = 0.0
+    failed = 0
 
-    if args.diarize:
-        diarization_segments = diarizer.diarize(wav_file, num_speakers=args.num_speakers)
-        speaker_map = diarizer.load_speaker_map(args.speaker_map) if args.speaker_map else None
-        segments_text = diarizer.assign_speakers_to_transcript(segments, diarization_segments, speaker_map)
-    else:
-        segments_text = [seg.format() for seg in segments]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(process_file, audio_file, args, transcriber, prompt_text, diarization_model, diarizer_lock, names[audio_file]): (audio_file, identity)
+            for audio_file, identity in pending
+        }
 
-    base_name = Path(wav_file).stem
-    raw_output = output_path / f"{base_name}.txt"
-    clean_output = output_path / f"{base_name}_clean.txt"
+        for future in as_completed(futures):
+            audio_file, identity = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"Failed {audio_file}: {e}")
+                continue
 
-    with open(raw_output, "w", encoding="utf-8") as f:
-        f.write("\n".join(segments_text))
-    if args.verbose:
-        print(f"Raw transcript saved to: {raw_output}")
+            append_manifest(manifest_path, {**identity, **result}, manifest_lock)
+            audio_seconds_done += result["audio_seconds"]
+            print(f"Done {audio_file}: {result['audio_seconds']:.0f}s audio in {result['elapsed_seconds']:.0f}s")
 
-    raw_text = "\n".join(segments_text)
-    list(summarizer.reconstruct_transcript(raw_text, terms_dict=summarizer.TERMS_TO_CORRECT, output_file=clean_output))
-    if args.verbose:
-        print(f"Clean transcript saved to: {clean_output}")
+    wall_seconds = time.perf_counter() - batch_started
+    throughput = audio_seconds_done / wall_seconds if wall_seconds > 0 else 0.0
+
+    print(
+        f"\nProcessed {len(pending) - failed}/{len(pending)} file(s), "
+        f"{audio_seconds_done / 3600:.2f} h of audio in {wall_seconds / 3600:.2f} h "
+        f"({throughput:.2f} audio-hours per hour)"
+    )
 
     if args.verbose:
         print("\nProcess completed.")
 
+    if failed:
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
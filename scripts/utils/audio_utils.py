@@ -12,7 +12,8 @@ def validate_audio_format(file_path: str) -> bool:
 
     return p.is_file() and p.suffix.lower() in SUPPORTED_AUDIO_FORMATS
 
-def convert_to_wav_16k_mono(input_path: str, output_dir: str, verbose: bool = False) -> str:
+def convert_to_wav_16k_mono(input_path: str, output_dir: str, verbose: bool = False, output_name: str | None = None) -> str:
+    """Convert to <output_dir>/<output_name or input stem>_16k_mono.wav; returns the WAV path."""
 
     input_path = Path(input_path)
 
@@ -29,7 +30,7 @@ def convert_to_wav_16k_mono(input_path: str, output_dir: str, verbose: bool = Fa
     
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    base_name = Path(input_path).stem
+    base_name = output_name or Path(input_path).stem
     output_path = os.path.join(output_dir, f"{base_name}_16k_mono.wav")
 
     try:
@@ -61,6 +62,34 @@ def get_audio_duration(wav_path: str) -> float:
         duration = frames / float(rate)
         return duration
 
+def probe_duration(input_path: str) -> float | None:
+    """Read the duration of any supported file from its container metadata without decoding it."""
+    try:
+        info = ffmpeg.probe(str(input_path))
+        return float(info["format"]["duration"])
+    except (ffmpeg.Error, FileNotFoundError, KeyError, ValueError):
+        return None
+
+def encode_opus_preview(input_path: str, output_path: str, bitrate: str = "24k") -> str:
+    """
+    Encode a small mono Opus/WebM rendition for playback. WebM carries a cue
+    index, so players can seek in it with byte-range requests.
+    """
+    try:
+        (
+            ffmpeg
+            .input(str(input_path))
+            .output(str(output_path), ac=1, acodec="libopus", audio_bitrate=bitrate, application="voip", vn=None, format="webm")
+            .overwrite_output()
+            .run(quiet=True)
+        )
+    except ffmpeg.Error as e:
+        raise RuntimeError(f"Error encoding audio preview: {e.stderr.decode()}") from e
+    except FileNotFoundError:
+        raise EnvironmentError("FFmpeg is not installed or not available in PATH")
+
+    return str(output_path)
+
 if __name__ == "__main__":
     if len(sys.argv) >= 3:
         input_file = sys.argv[1]
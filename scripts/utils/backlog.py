@@ -0,0 +1,111 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    name: str
+    beam_size: int
+    fallback_model: bool
+
+
+# From full quality down to the cheapest decoding live mode accepts
+QUALITY_LEVELS = (
+    QualityLevel("full", beam_size=5, fallback_model=False),
+    QualityLevel("fast", beam_size=1, fallback_model=False),
+    QualityLevel("fallback", beam_size=1, fallback_model=True),
+)
+
+
+class LagMonitor:
+    """
+    Tracks how far transcription is behind capture. Lag is the stream time
+    captured so far minus the start of the oldest segment not yet
+    transcribed; queued seconds is the audio waiting or being decoded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._captured = 0.0
+        self._pending: dict[float, float] = {}
+
+    def captured_to(self, stream_seconds: float):
+        with self._lock:
+            self._captured = max(self._captured, stream_seconds)
+
+    def queued(self, start: float, duration: float):
+        with self._lock:
+            self._pending[start] = duration
+
+    def done(self, start: float):
+        with self._lock:
+            self._pending.pop(start, None)
+
+    def settled_until(self) -> float:
+        """Stream time before which every segment is transcribed; later ones may still arrive."""
+        with self._lock:
+            return min(self._pending, default=self._captured)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            oldest = min(self._pending, default=None)
+            return {
+                "lag": max(self._captured - oldest, 0.0) if oldest is not None else 0.0,
+                "queued_seconds": sum(self._pending.values()),
+                "segments": len(self._pending)
+            }
+
+
+class BacklogPolicy:
+    """
+    Decides how many workers run and at which quality level from the lag.
+    Above high_water it escalates one step at a time (first another worker,
+    then a cheaper quality level); below low_water it recovers in reverse
+    (full quality first, then fewer workers). At most one step is taken per
+    cooldown, so a decode that just finished is not judged on stale lag.
+    """
+
+    def __init__(self, max_workers: int, high_water: float, low_water: float, levels: tuple = QUALITY_LEVELS,
+                 cooldown: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.max_workers = max(max_workers, 1)
+        self.high_water = high_water
+        self.low_water = low_water
+        self.levels = levels
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self.workers = 1
+        self.level_index = 0
+        self._last_change = float("-inf")
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.level_index]
+
+    def update(self, lag: float) -> bool:
+        """Apply one step if the lag calls for it; returns True if workers or level changed."""
+        now = self.clock()
+        if now - self._last_change < self.cooldown:
+            return False
+
+        if lag > self.high_water:
+            if self.workers < self.max_workers:
+                self.workers += 1
+            elif self.level_index < len(self.levels) - 1:
+                self.level_index += 1
+            else:
+                return False
+        elif lag < self.low_water:
+            if self.level_index > 0:
+                self.level_index -= 1
+            elif self.workers > 1:
+                self.workers -= 1
+            else:
+                return False
+        else:
+            return False
+
+        self._last_change = now
+        return True
@@ -2,6 +2,7 @@ import sherpa_onnx
 import time
 import argparse
 import soundfile as sf
+from dataclasses import dataclass
 
 from scripts.utils.transcriber import Transcriber
 from scripts.utils import audio_utils
@@ -14,6 +15,13 @@ MULTI_SPEAKER_THRESHOLD = 0.3
 SHORT_SEGMENT_THRESHOLD = 1.5
 SHORT_SEGMENT_DOMINANCE = 0.7
 
+# Plain copy of a sherpa-onnx diarization segment that can be serialized
+@dataclass
+class DiarizationSegment:
+    start: float
+    end: float
+    speaker: int
+
 def load_segmentation_model() -> sherpa_onnx.OfflineSpeakerSegmentationModelConfig:
     pyannote_cfg = sherpa_onnx.OfflineSpeakerSegmentationPyannoteModelConfig(
         model=str(SEGMENTATION_MODEL_PATH)
@@ -55,8 +63,10 @@ def load_speaker_map(path: str) -> dict:
                 mapping[key.strip()] = val.strip()
     return mapping
 
-def diarize(wav_path: str, num_speakers: int = -1, cluster_threshold: float = 0.5):
-    diarizer = load_diarizer(num_speakers=num_speakers, cluster_threshold=cluster_threshold)
+def diarize(wav_path: str, num_speakers: int = -1, cluster_threshold: float = 0.5, diarizer=None):
+    # Pass an already loaded diarizer to avoid reloading the models for every file
+    if diarizer is None:
+        diarizer = load_diarizer(num_speakers=num_speakers, cluster_threshold=cluster_threshold)
 
     wav_16k_path = audio_utils.convert_to_wav_16k_mono(wav_path, output_dir="output")
 
@@ -70,14 +80,14 @@ def diarize(wav_path: str, num_speakers: int = -1, cluster_threshold: float = 0.
     return result.sort_by_start_time()
 
 
-def assign_speakers_to_transcript(transcript, diarization_segments, speaker_map=None):
+def assign_speaker_labels(transcript, diarization_segments) -> list[str]:
     """
-    Assign speakers to transcript using majority voting per transcript segment.
+    Speaker label of every transcript segment, chosen by majority voting.
     If second speaker has >= multi_speaker_threshold overlap ratio,
-    output as multi-speaker (e.g., speaker_0 + speaker_1).
+    the label is multi-speaker (e.g., speaker_0 + speaker_1).
     """
 
-    output_segments = []
+    labels = []
     previous_speaker = None
 
     for t_seg in transcript:
@@ -126,6 +136,21 @@ def assign_speakers_to_transcript(transcript, diarization_segments, speaker_map=
                 else:
                     assigned_label = main_speaker
 
+        previous_speaker = assigned_label
+        labels.append(assigned_label)
+
+    return labels
+
+
+def assign_speakers_to_transcript(transcript, diarization_segments, speaker_map=None):
+    """
+    Assign speakers to transcript using majority voting per transcript segment
+    and format every segment as "[start - end] (speaker) text".
+    """
+
+    output_segments = []
+
+    for t_seg, assigned_label in zip(transcript, assign_speaker_labels(transcript, diarization_segments)):
         if speaker_map:
             if " + " in assigned_label:
                 parts = assigned_label.split(" + ")
@@ -133,13 +158,10 @@ def assign_speakers_to_transcript(transcript, diarization_segments, speaker_map=
             else:
                 assigned_label = speaker_map.get(assigned_label, assigned_label) or assigned_label
 
-
-        previous_speaker = assigned_label
-
         segment_text = t_seg.text.strip() if t_seg.text else ""
         output_segments.append(
-            f"[{time.strftime('%H:%M:%S', time.gmtime(seg_start))} - "
-            f"{time.strftime('%H:%M:%S', time.gmtime(seg_end))}] "
+            f"[{time.strftime('%H:%M:%S', time.gmtime(t_seg.start))} - "
+            f"{time.strftime('%H:%M:%S', time.gmtime(t_seg.end))}] "
             f"({assigned_label}) {segment_text}"
         )
 
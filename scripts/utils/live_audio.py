@@ -0,0 +1,229 @@
+import threading
+from typing import Optional
+
+import numpy as np
+from faster_whisper.vad import VadOptions, get_vad_model
+
+# Silero VAD scores windows of 512 samples (32 ms at 16 kHz), each with 64 samples of left context
+VAD_WINDOW_SAMPLES = 512
+VAD_CONTEXT_SAMPLES = 64
+# Frames the consumer gathers before running the VAD (256 ms); one model call per
+# callback block costs more CPU than the polling loop it replaces
+VAD_BATCH_SAMPLES = VAD_WINDOW_SAMPLES * 8
+
+
+class RingBuffer:
+    """
+    Preallocated int16 ring buffer for captured audio. The audio callback
+    writes into it without allocating; the consumer reads new samples by
+    absolute position and can slice recent history (e.g. a speech segment
+    that started a few seconds ago) as long as it was not overwritten yet.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self._written = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self.closed = False
+
+    @property
+    def written(self) -> int:
+        """Total samples written since the start (absolute position of the next sample)."""
+        return self._written
+
+    def write(self, samples: np.ndarray):
+        # Only the tail of an oversized write fits, but positions still count all of it
+        skipped = max(len(samples) - self.capacity, 0)
+        samples = samples[skipped:]
+        n = len(samples)
+        with self._lock:
+            self._written += skipped
+            start = self._written % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            self._data[:n - first] = samples[first:]
+            self._written += n
+            self._available.notify_all()
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._available.notify_all()
+
+    def wait(self, position: int, min_samples: int = 1, timeout: Optional[float] = None) -> int:
+        """Block until min_samples past position exist (or the buffer is closed); returns the write position."""
+        with self._lock:
+            self._available.wait_for(lambda: self._written - position >= min_samples or self.closed, timeout)
+            return self._written
+
+    def slice(self, start: int, end: int) -> np.ndarray:
+        """Copy of the samples at absolute positions start..end (exclusive)."""
+        with self._lock:
+            if end > self._written:
+                end = self._written
+            if start < self._written - self.capacity:
+                raise IndexError(f"Samples from {start} were already overwritten")
+            n = max(end - start, 0)
+            out = np.empty(n, dtype=np.int16)
+            first_index = start % self.capacity
+            first = min(n, self.capacity - first_index)
+            out[:first] = self._data[first_index:first_index + first]
+            out[first:] = self._data[:n - first]
+            return out
+
+
+class StreamingVad:
+    """
+    Silero VAD applied incrementally: each call scores only the new 512-sample
+    windows and carries the model state (LSTM state and context samples) and
+    the speech/silence state over to the next call.
+    Segments are returned (absolute sample positions) once enough silence
+    ends them and their end padding is settled, or when they reach
+    max_segment_samples. They are padded like get_speech_timestamps and
+    never overlap.
+    """
+
+    def __init__(self, vad_options: VadOptions, sample_rate: int, max_segment_samples: int):
+        self.model = get_vad_model()
+        # The model's own __call__ starts from a zero state every time, so the single
+        # Silero v6 session (input, h, c) of faster-whisper 1.2 is run directly
+        if not hasattr(self.model, "session"):
+            raise RuntimeError("StreamingVad requires faster-whisper>=1.2.0 (Silero VAD v6 model)")
+        self.threshold = vad_options.threshold
+        self.neg_threshold = vad_options.neg_threshold if vad_options.neg_threshold is not None else max(vad_options.threshold - 0.15, 0.01)
+        self.min_speech_samples = sample_rate * vad_options.min_speech_duration_ms // 1000
+        self.min_silence_samples = sample_rate * vad_options.min_silence_duration_ms // 1000
+        self.pad_samples = sample_rate * vad_options.speech_pad_ms // 1000
+        self.max_segment_samples = max_segment_samples
+
+        # Samples not yet scored (less than one window) and the position of the first of them
+        self._pending = np.zeros(VAD_WINDOW_SAMPLES, dtype=np.float32)
+        self._pending_len = 0
+        self._position = 0
+
+        self._h = np.zeros((1, 1, 128), dtype=np.float32)
+        self._c = np.zeros((1, 1, 128), dtype=np.float32)
+        self._context = np.zeros(VAD_CONTEXT_SAMPLES, dtype=np.float32)
+
+        self._speech_start: Optional[int] = None
+        self._silence_start: Optional[int] = None
+        # (speech start, silence start) of a segment waiting for its end padding
+        self._ended: Optional[tuple[int, int]] = None
+        self._last_end = 0
+
+    def _score(self, audio: np.ndarray) -> np.ndarray:
+        windows = audio.reshape(-1, VAD_WINDOW_SAMPLES)
+        context = np.empty((len(windows), VAD_CONTEXT_SAMPLES), dtype=np.float32)
+        context[0] = self._context
+        context[1:] = windows[:-1, -VAD_CONTEXT_SAMPLES:]
+        batch = np.concatenate([context, windows], axis=1)
+
+        output, self._h, self._c = self.model.session.run(None, {"input": batch, "h": self._h, "c": self._c})
+        self._context = windows[-1, -VAD_CONTEXT_SAMPLES:].copy()
+        return np.asarray(output).reshape(-1)
+
+    def _emit(self, speech_start: int, end: int, segments: list):
+        # Padding never reaches back into the previous segment, so no audio is decoded twice
+        start = max(speech_start - self.pad_samples, self._last_end, 0)
+        segments.append((start, end))
+        self._last_end = end
+
+    def _release(self, end: int, segments: list):
+        speech_start, _silence_start = self._ended
+        self._ended = None
+        self._emit(speech_start, end, segments)
+
+    def process(self, samples: np.ndarray) -> list[tuple[int, int]]:
+        """Feed new int16 samples; returns the speech segments that ended in them."""
+        audio = samples.astype(np.float32) / 32768.0
+
+        # Complete the window left over from the previous call
+        if self._pending_len:
+            take = min(VAD_WINDOW_SAMPLES - self._pending_len, len(audio))
+            self._pending[self._pending_len:self._pending_len + take] = audio[:take]
+            self._pending_len += take
+            audio = audio[take:]
+            head = self._pending if self._pending_len == VAD_WINDOW_SAMPLES else None
+        else:
+            head = None
+
+        full = len(audio) - len(audio) % VAD_WINDOW_SAMPLES
+        windows = audio[:full]
+        if head is not None:
+            windows = np.concatenate([head, windows])
+            self._pending_len = 0
+
+        segments: list[tuple[int, int]] = []
+        if len(windows):
+            probs = self._score(windows)
+            for i, prob in enumerate(probs):
+                self._step(self._position + i * VAD_WINDOW_SAMPLES, float(prob), segments)
+            self._position += len(windows)
+
+        rest = audio[full:]
+        if len(rest):
+            self._pending[:len(rest)] = rest
+            self._pending_len = len(rest)
+
+        return segments
+
+    def _step(self, position: int, prob: float, segments: list):
+        window_end = position + VAD_WINDOW_SAMPLES
+
+        # A finished segment is held until its end padding is known: like
+        # get_speech_timestamps, a silence shorter than two pads is split at
+        # its midpoint, a longer one gives both sides the full pad
+        if self._ended is not None:
+            silence_start = self._ended[1]
+            if prob >= self.threshold:
+                self._release(silence_start + (position - silence_start) // 2, segments)
+            elif window_end - silence_start >= 2 * self.pad_samples:
+                self._release(silence_start + self.pad_samples, segments)
+
+        if prob >= self.threshold:
+            self._silence_start = None
+            if self._speech_start is None:
+                self._speech_start = position
+        elif self._speech_start is not None and prob < self.neg_threshold:
+            if self._silence_start is None:
+                self._silence_start = position
+            if position - self._silence_start >= self.min_silence_samples:
+                if self._silence_start - self._speech_start > self.min_speech_samples:
+                    self._ended = (self._speech_start, self._silence_start)
+                    if window_end - self._silence_start >= 2 * self.pad_samples:
+                        self._release(self._silence_start + self.pad_samples, segments)
+                self._speech_start = None
+                self._silence_start = None
+                return
+
+        # Long speech is cut, so the transcript never waits for more than one segment
+        if self._speech_start is not None and window_end - self._speech_start >= self.max_segment_samples:
+            self._emit(self._speech_start, window_end, segments)
+            self._speech_start = window_end
+
+    def reset(self, position: int):
+        """Start over at an absolute sample position, e.g. after audio was dropped."""
+        self._pending_len = 0
+        self._position = position
+        self._h[:] = 0
+        self._c[:] = 0
+        self._context[:] = 0
+        self._speech_start = None
+        self._silence_start = None
+        # The audio of a held segment is gone as well
+        self._ended = None
+        self._last_end = position
+
+    def flush(self) -> list[tuple[int, int]]:
+        """Close the segments still open at the end of the stream."""
+        segments: list[tuple[int, int]] = []
+        stream_end = self._position + self._pending_len
+        if self._ended is not None:
+            self._release(min(self._ended[1] + self.pad_samples, stream_end), segments)
+        if self._speech_start is not None and stream_end - self._speech_start > self.min_speech_samples:
+            self._emit(self._speech_start, stream_end, segments)
+        self._speech_start = None
+        self._silence_start = None
+        return segments
@@ -1,5 +1,6 @@
 import requests
 from pathlib import Path
+from typing import Callable, List, Optional
 from scripts.utils.summarizer import parse_meeting_minutes, MeetingMinutes
 
 # LLM endpoint
@@ -44,22 +45,19 @@ def process_chunk(chunk: str) -> str:
     resp.raise_for_status()
     return resp.json()["choices"][0]["message"]["content"].strip()
 
-# Generate meeting minutes from a transcript file
-def generate_meeting_minutes_from_file(file_path: Path, lm_api_url: str = LM_API_URL) -> MeetingMinutes:
-    if not file_path.is_file():
-        raise FileNotFoundError(f"File doesn't exist: {file_path}")
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        transcript_text = f.read()
-
-    # Chunk the transcript
+# Summarize every chunk of a transcript (map step)
+def summarize_chunks(transcript_text: str, should_stop: Optional[Callable[[], bool]] = None) -> List[str]:
     chunks = chunk_text(transcript_text)
     partial_summaries = []
     for i, chunk in enumerate(chunks):
+        if should_stop and should_stop():
+            break
         print(f"Processing chunk {i+1}/{len(chunks)}")
         partial_summaries.append(process_chunk(chunk))
+    return partial_summaries
 
-    # Combine chunk-level summaries
+# Combine chunk-level summaries into structured meeting minutes (reduce step)
+def generate_minutes_from_partials(partial_summaries: List[str], lm_api_url: str = LM_API_URL) -> MeetingMinutes:
     combined_summary = "\n\n".join(partial_summaries)
 
     # Final LLM call to generate structured JSON
@@ -94,6 +92,17 @@ def generate_meeting_minutes_from_file(file_path: Path, lm_api_url: str = LM_API
     meeting_minutes = parse_meeting_minutes(llm_json)
     return meeting_minutes
 
+# Generate meeting minutes from a transcript file
+def generate_meeting_minutes_from_file(file_path: Path, lm_api_url: str = LM_API_URL) -> MeetingMinutes:
+    if not file_path.is_file():
+        raise FileNotFoundError(f"File doesn't exist: {file_path}")
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        transcript_text = f.read()
+
+    partial_summaries = summarize_chunks(transcript_text)
+    return generate_minutes_from_partials(partial_summaries, lm_api_url)
+
 
 def print_meeting_minutes(minutes: MeetingMinutes) -> None:
     print("--- Executive Summary ---")
@@ -120,7 +129,7 @@ def print_meeting_minutes(minutes: MeetingMinutes) -> None:
             f"  Conclusion: {disc.conclusion}\n"
         )
 
-def save_meeting_minutes(minutes: MeetingMinutes, file_path: Path):
+def format_meeting_minutes(minutes: MeetingMinutes) -> str:
     lines = []
 
     lines.append("--- Executive Summary ---")
@@ -150,7 +159,10 @@ def save_meeting_minutes(minutes: MeetingMinutes, file_path: Path):
         lines.append(f"  Conclusion: {disc.conclusion}")
         lines.append("")
 
-    content = "\n".join(lines)
+    return "\n".join(lines)
+
+def save_meeting_minutes(minutes: MeetingMinutes, file_path: Path):
+    content = format_meeting_minutes(minutes)
 
     file_path.parent.mkdir(parents=True, exist_ok=True)
     file_path.write_text(content, encoding="utf-8")
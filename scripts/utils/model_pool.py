@@ -0,0 +1,39 @@
+import threading
+from scripts.utils.transcriber import Transcriber
+from scripts.utils import diarizer as diarizer_utils
+
+# Warm model pool shared by every caller in the process.
+# Models are loaded once per configuration and reused across files / jobs.
+# A Whisper model created with num_workers=N can run N transcriptions in parallel threads.
+
+_lock = threading.Lock()
+_transcribers: dict = {}
+_diarizers: dict = {}
+
+def get_transcriber(model_size: str = "large", device: str = "cpu", cpu_threads: int = 0, num_workers: int = 1) -> Transcriber:
+    key = (model_size, device, cpu_threads, num_workers)
+    with _lock:
+        if key not in _transcribers:
+            _transcribers[key] = Transcriber(
+                model_size=model_size,
+                device=device,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers
+            )
+        return _transcribers[key]
+
+def get_diarizer(num_speakers: int = -1, cluster_threshold: float = 0.5):
+    key = (num_speakers, cluster_threshold)
+    with _lock:
+        if key not in _diarizers:
+            _diarizers[key] = diarizer_utils.load_diarizer(
+                num_speakers=num_speakers,
+                cluster_threshold=cluster_threshold
+            )
+        return _diarizers[key]
+
+def split_cpu_budget(cpu_budget: int, workers: int) -> int:
+    # Threads per concurrent transcription so that all of them together stay within the budget
+    if cpu_budget <= 0:
+        return 0
+    return max(1, cpu_budget // max(1, workers))
@@ -0,0 +1,126 @@
+from pathlib import Path
+from queue import Queue
+from threading import Event, Thread
+from typing import Callable, Dict, List, Optional
+
+from scripts.utils import meeting_parser, summarizer
+from scripts.utils.summarizer import MeetingMinutes
+
+
+class RollingSummarizer:
+    """
+    Runs the per-block LLM work of meeting minutes while the meeting is still
+    being recorded: every block of finished transcript lines is reconstructed
+    and every full chunk of cleaned text is summarized in the background.
+    finish() then only handles the last partial block and runs the final
+    structured reduce (generate_minutes_from_partials).
+
+    Blocks and chunks match the post-recording pipeline: reconstruct_transcript
+    cleans 5 lines per LLM call and summarize_chunks summarizes 500 characters
+    of cleaned text per call.
+    """
+
+    def __init__(self, cleaned_file: Optional[Path] = None, terms_dict: Optional[Dict[str, str]] = None,
+                 lines_per_block: int = 5, chars_per_chunk: int = 500, chat_model: Optional[str] = None):
+        self.cleaned_file = cleaned_file
+        self.terms_dict = terms_dict
+        self.lines_per_block = lines_per_block
+        self.chars_per_chunk = chars_per_chunk
+        if chat_model:
+            meeting_parser.CHAT_MODEL = chat_model
+
+        self.partial_summaries: List[str] = []
+        self._lines: List[str] = []
+        self._cleaned = ""
+        self._queue: Queue = Queue()
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def start(self):
+        if self.cleaned_file is not None:
+            self.cleaned_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cleaned_file.write_text("", encoding="utf-8")
+        self._thread.start()
+
+    def add_lines(self, lines: List[str]):
+        """Queue finished transcript lines, in transcript order."""
+        if lines:
+            self._queue.put(list(lines))
+
+    def _clean_block(self, lines: List[str]):
+        cleaned = list(summarizer.reconstruct_transcript("\n".join(lines), terms_dict=self.terms_dict))
+        # reconstruct_transcript drops a block whose LLM call failed; keep the original lines instead
+        text = "\n".join(cleaned) if cleaned else summarizer.to_latin("\n".join(lines))
+
+        if self.cleaned_file is not None:
+            with open(self.cleaned_file, "a", encoding="utf-8") as f:
+                f.write(text + "\n")
+        self._cleaned += text + "\n"
+
+    def _summarize(self, final: bool):
+        while len(self._cleaned) >= self.chars_per_chunk or (final and self._cleaned):
+            chunk = self._cleaned[:self.chars_per_chunk]
+            self._cleaned = self._cleaned[self.chars_per_chunk:]
+            try:
+                self.partial_summaries.append(meeting_parser.process_chunk(chunk))
+            except Exception as e:
+                # The reduce step still sees the content, just not condensed
+                print(f"Chunk summary failed, keeping the text: {e}")
+                self.partial_summaries.append(chunk)
+
+    def _run(self):
+        while True:
+            lines = self._queue.get()
+            if lines is None:
+                break
+
+            self._lines += lines
+            while len(self._lines) >= self.lines_per_block:
+                block = self._lines[:self.lines_per_block]
+                self._lines = self._lines[self.lines_per_block:]
+                self._clean_block(block)
+                self._summarize(final=False)
+
+        if self._lines:
+            self._clean_block(self._lines)
+            self._lines = []
+        self._summarize(final=True)
+
+    def finish(self) -> MeetingMinutes:
+        """Process what is left and generate the minutes from the partial summaries."""
+        self._queue.put(None)
+        self._thread.join()
+        return meeting_parser.generate_minutes_from_partials(self.partial_summaries)
+
+
+class SummaryFeeder:
+    """
+    Hands transcript lines to a RollingSummarizer once no earlier segment can
+    still arrive. settled_until() is the stream time before which all queued
+    audio is transcribed (in streaming mode: its words committed);
+    settle_margin covers the longest voiced segment VAD may still be
+    collecting. Segments are read from transcript, which the transcription
+    threads append to.
+    """
+
+    def __init__(self, rolling: RollingSummarizer, transcript: list, settled_until: Callable[[], float],
+                 settle_margin: float):
+        self.rolling = rolling
+        self.transcript = transcript
+        self.settled_until = settled_until
+        self.settle_margin = settle_margin
+        self._fed = set()
+
+    def feed(self, until: float):
+        ready = sorted(
+            (seg for seg in list(self.transcript) if id(seg) not in self._fed and seg.start < until),
+            key=lambda seg: seg.start
+        )
+        self._fed.update(id(seg) for seg in ready)
+        self.rolling.add_lines([seg.format() for seg in ready])
+
+    def feed_settled(self):
+        self.feed(self.settled_until() - self.settle_margin)
+
+    def run(self, stop_event: Event, interval: float):
+        while not stop_event.wait(interval):
+            self.feed_settled()
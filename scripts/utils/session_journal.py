@@ -0,0 +1,171 @@
+import json
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+RECORDING_FORMATS = {"wav": "WAV", "flac": "FLAC"}
+# Seconds of audio between flushes of the recording to disk
+RECORDING_FLUSH_SECONDS = 5.0
+
+
+class RecordingStream:
+    """
+    The raw session capture, appended as it is recorded (WAV or FLAC through
+    soundfile). Every captured frame is written, silence included, so stream
+    time in the transcript is also time in the recording. Data is flushed to
+    disk every few seconds; repair_recording() finishes a file that a crash
+    left open.
+    """
+
+    def __init__(self, path: Path, sample_rate: int, channels: int = 1):
+        self.path = Path(path)
+        audio_format = RECORDING_FORMATS[self.path.suffix.lstrip(".").lower()]
+        self._file = sf.SoundFile(str(self.path), "w", samplerate=sample_rate, channels=channels,
+                                  subtype="PCM_16", format=audio_format)
+        self._flush_frames = int(sample_rate * RECORDING_FLUSH_SECONDS)
+        self._unflushed = 0
+        self.frames = 0
+
+    def write(self, samples: np.ndarray):
+        self._file.write(samples)
+        self.frames += len(samples)
+        self._unflushed += len(samples)
+        if self._unflushed >= self._flush_frames:
+            self._file.flush()
+            self._unflushed = 0
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+# Frames read at a time when rewriting an unfinished FLAC
+FLAC_REPAIR_BLOCK = 4096
+
+
+def repair_recording(path: Path) -> bool:
+    """
+    Finish a recording that was not closed. A WAV gets its RIFF and data chunk
+    sizes fixed (they are only written on close). A FLAC without a total length
+    in its STREAMINFO is rewritten up to its last complete frame. Returns True
+    if the file was changed.
+    """
+    path = Path(path)
+    if not path.is_file():
+        return False
+    if path.suffix.lower() == ".flac":
+        return _repair_flac(path)
+    if path.suffix.lower() != ".wav":
+        return False
+
+    size = path.stat().st_size
+    with open(path, "r+b") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return False
+
+        # Walk the chunks up to "data"
+        offset = 12
+        while offset + 8 <= size:
+            f.seek(offset)
+            chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+            if chunk_id == b"data":
+                data_size = size - offset - 8
+                if chunk_size == data_size and struct.unpack("<I", header[4:8])[0] == size - 8:
+                    return False
+                f.seek(offset + 4)
+                f.write(struct.pack("<I", data_size))
+                f.seek(4)
+                f.write(struct.pack("<I", size - 8))
+                return True
+            offset += 8 + chunk_size + (chunk_size % 2)
+
+    return False
+
+
+def _repair_flac(path: Path) -> bool:
+    tmp_path = path.with_name(path.stem + ".repair.flac")
+    with sf.SoundFile(str(path)) as src:
+        # libsndfile reports the maximum frame count when STREAMINFO has no length
+        if src.frames < 2 ** 62:
+            return False
+
+        with sf.SoundFile(str(tmp_path), "w", samplerate=src.samplerate, channels=src.channels,
+                          subtype="PCM_16", format="FLAC") as dst:
+            while True:
+                try:
+                    block = src.read(FLAC_REPAIR_BLOCK, dtype="int16")
+                except sf.LibsndfileError:
+                    # Reached the frame the crash cut off
+                    break
+                if len(block) == 0:
+                    break
+                dst.write(block)
+
+    os.replace(tmp_path, path)
+    return True
+
+
+class TranscriptJournal:
+    """
+    Append-only JSON Lines journal of a live session: a header line with the
+    recording it belongs to, one line per transcript segment as soon as it is
+    produced, and an end line when the session finished cleanly. Every line is
+    flushed and fsynced, so a crash loses at most the segment being written.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, entry: dict):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def start(self, recording: Path, sample_rate: int):
+        self._append({"type": "session", "recording": str(recording), "sample_rate": sample_rate, "started": time.time()})
+
+    def segment(self, start: float, end: float, text: str):
+        self._append({"type": "segment", "start": start, "end": end, "text": text})
+
+    def close(self, clean: bool = True):
+        if clean:
+            self._append({"type": "end", "finished": time.time()})
+        with self._lock:
+            self._file.close()
+
+
+def read_journal(path: Path) -> tuple[Optional[dict], list[dict], bool]:
+    """The session header, the segments in stream order and whether the session ended cleanly."""
+    header = None
+    segments = []
+    finished = False
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of a session that crashed mid-write
+                continue
+
+            if entry.get("type") == "session":
+                header = entry
+            elif entry.get("type") == "segment":
+                segments.append(entry)
+            elif entry.get("type") == "end":
+                finished = True
+
+    segments.sort(key=lambda seg: seg["start"])
+    return header, segments, finished
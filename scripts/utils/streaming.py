@@ -0,0 +1,193 @@
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+# Longest repetition of the committed tail that is dropped from a new hypothesis
+_MAX_OVERLAP_WORDS = 5
+_NORMALIZE_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+@dataclass
+class Word:
+    start: float
+    end: float
+    text: str
+
+    @property
+    def key(self) -> str:
+        return _NORMALIZE_RE.sub("", self.text).lower()
+
+
+def join_words(words: list[Word]) -> str:
+    # faster-whisper words carry their leading space
+    return "".join(w.text for w in words).strip()
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    return float(np.percentile(values, q))
+
+
+class LocalAgreementDecoder:
+    """
+    Streaming Whisper decoding with local agreement. Audio is appended to a
+    sliding buffer that is decoded again every step; words on which two
+    successive hypotheses agree are committed, the rest is reported as a
+    partial hypothesis that later steps may still change. Speech is never cut
+    at a fixed edge: the buffer is only trimmed behind committed words, and the
+    committed text is given to Whisper as prompt.
+    """
+
+    def __init__(self, model, language: Optional[str], sample_rate: int = 16000, beam_size: int = 5,
+                 max_buffer_seconds: float = 15.0, prompt_chars: int = 200,
+                 clock: Callable[[], float] = time.monotonic):
+        self.model = model
+        self.language = language
+        self.sample_rate = sample_rate
+        self.beam_size = beam_size
+        self.max_buffer_seconds = max_buffer_seconds
+        self.prompt_chars = prompt_chars
+        self.clock = clock
+
+        self.audio = np.zeros(0, dtype=np.float32)
+        # Stream time (seconds) of the first sample in the buffer
+        self.offset: Optional[float] = None
+        self.committed: list[Word] = []
+        self.hypothesis: list[Word] = []
+
+        # (stream time at the end of an insert, clock when it arrived), for word latency
+        self._arrivals: deque[tuple[float, float]] = deque()
+        self.latencies: list[float] = []
+        # (start, end) stream times of inserted audio whose words may still change
+        self._unsettled: deque[tuple[float, float]] = deque()
+        self.finished = False
+
+    @property
+    def buffer_seconds(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+    @property
+    def end(self) -> float:
+        return (self.offset or 0.0) + self.buffer_seconds
+
+    @property
+    def settled_until(self) -> float:
+        """Stream time before which every word is committed (or was given up on); later words may still change."""
+        if self.finished:
+            return self.end
+        committed_end = self.committed[-1].end if self.committed else 0.0
+        return max(committed_end, self.offset or 0.0)
+
+    def insert(self, samples: np.ndarray, start_sec: float, arrived: Optional[float] = None):
+        """Append int16 samples captured at stream time start_sec (arrived on the decoder clock, default now)."""
+        if self.offset is None:
+            self.offset = start_sec
+        self.audio = np.concatenate([self.audio, samples.astype(np.float32) / 32768.0])
+        self._arrivals.append((self.end, self.clock() if arrived is None else arrived))
+        self._unsettled.append((start_sec, start_sec + len(samples) / self.sample_rate))
+
+    def settled_inserts(self) -> list[float]:
+        """Start times of the inserts whose words are all committed now; each is returned once."""
+        settled = self.settled_until
+        starts = []
+        while self._unsettled and self._unsettled[0][1] <= settled:
+            starts.append(self._unsettled.popleft()[0])
+        return starts
+
+    def _prompt(self) -> Optional[str]:
+        text = join_words(self.committed)[-self.prompt_chars:]
+        return text or None
+
+    def _decode(self) -> list[Word]:
+        segments, _info = self.model.transcribe(
+            self.audio,
+            language=self.language,
+            beam_size=self.beam_size,
+            word_timestamps=True,
+            initial_prompt=self._prompt(),
+            condition_on_previous_text=False,
+            vad_filter=True
+        )
+        return [
+            Word(self.offset + w.start, self.offset + w.end, w.word)
+            for segment in segments
+            for w in (segment.words or [])
+        ]
+
+    def _drop_committed(self, words: list[Word]) -> list[Word]:
+        last_end = self.committed[-1].end if self.committed else None
+        if last_end is None:
+            return words
+
+        words = [w for w in words if w.end > last_end - 0.1]
+
+        # The prompt makes Whisper repeat the last committed words at the buffer start
+        if words and abs(words[0].start - last_end) < 1.0:
+            tail = [w.key for w in self.committed[-_MAX_OVERLAP_WORDS:]]
+            for n in range(min(_MAX_OVERLAP_WORDS, len(words), len(tail)), 0, -1):
+                if tail[-n:] == [w.key for w in words[:n]]:
+                    return words[n:]
+        return words
+
+    def _commit(self, words: list[Word]):
+        now = self.clock()
+        for word in words:
+            # Latency from the moment the audio holding the end of the word arrived
+            arrived = next((at for end, at in self._arrivals if end >= word.end), now)
+            self.latencies.append(now - arrived)
+        self.committed.extend(words)
+
+    def _trim(self):
+        if self.buffer_seconds <= self.max_buffer_seconds:
+            return
+
+        cut = self.committed[-1].end if self.committed else self.offset
+        if cut <= self.offset:
+            # Nothing committed inside the buffer; give up on the oldest audio
+            cut = self.end - self.max_buffer_seconds
+            self.hypothesis = [w for w in self.hypothesis if w.start >= cut]
+
+        samples = int((cut - self.offset) * self.sample_rate)
+        self.audio = self.audio[samples:]
+        self.offset += samples / self.sample_rate
+        while self._arrivals and self._arrivals[0][0] < self.offset:
+            self._arrivals.popleft()
+
+    def step(self) -> tuple[list[Word], list[Word]]:
+        """Decode the buffer; returns the newly committed words and the current partial hypothesis."""
+        if not len(self.audio):
+            return [], self.hypothesis
+
+        words = self._drop_committed(self._decode())
+
+        agreed = 0
+        for previous, current in zip(self.hypothesis, words):
+            if previous.key != current.key:
+                break
+            agreed += 1
+
+        committed = words[:agreed]
+        self._commit(committed)
+        self.hypothesis = words[agreed:]
+        self._trim()
+        return committed, self.hypothesis
+
+    def finish(self) -> list[Word]:
+        """Decode the rest of the buffer and commit its hypothesis at the end of the stream."""
+        committed, hypothesis = self.step()
+        self._commit(hypothesis)
+        self.hypothesis = []
+        self.finished = True
+        return committed + hypothesis
+
+    def latency_stats(self) -> dict:
+        return {
+            "words": len(self.latencies),
+            "median": percentile(self.latencies, 50),
+            "p95": percentile(self.latencies, 95)
+        }
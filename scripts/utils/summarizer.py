@@ -1,6 +1,6 @@
 from pathlib import Path
 import requests
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from pydantic import BaseModel, ValidationError
 from transliterate import translit
 
@@ -72,7 +72,7 @@ def chunk_text(lines, chunk_size=5):
         yield lines[i:i + chunk_size]
 
 # Main function to clean a transcript
-def reconstruct_transcript(raw_text: str, terms_dict: Optional[Dict[str, str]] = None, output_file: Optional[Path] = None):
+def reconstruct_transcript(raw_text: str, terms_dict: Optional[Dict[str, str]] = None, output_file: Optional[Path] = None, should_stop: Optional[Callable[[], bool]] = None):
     if terms_dict is None:
         terms_dict = {}
 
@@ -92,6 +92,9 @@ def reconstruct_transcript(raw_text: str, terms_dict: Optional[Dict[str, str]] =
         output_file.write_text("", encoding="utf-8")
 
     for chunk_lines in chunk_text(lines, chunk_size=5):
+        if should_stop and should_stop():
+            return
+
         chunk_text_to_send = "\n".join(chunk_lines)
 
         chunk_text_to_send = to_latin(chunk_text_to_send)
@@ -1,7 +1,8 @@
-import time, pathlib
+import math, time, pathlib
+import numpy as np
 from dataclasses import dataclass
 from faster_whisper import WhisperModel
-from typing import List, Optional
+from typing import Callable, List, Optional, Union
 
 # Represents a segment of transcribed audio
 @dataclass
@@ -9,6 +10,8 @@ class TranscriptSegment:
     start: float
     end: float
     text: str
+    # Average token probability of the segment (exp of Whisper's avg_logprob)
+    confidence: Optional[float] = None
 
     def format(self) -> str:
         start_str = time.strftime('%H:%M:%S', time.gmtime(int(self.start)))
@@ -17,14 +20,17 @@ class TranscriptSegment:
 
 # Wrapper class for Whisper transcription
 class Transcriber:
-    def __init__(self, model_size: str = "large", device: str = "cpu"):
+    # cpu_threads=0 lets CTranslate2 pick; num_workers > 1 allows parallel transcribe() calls from threads
+    def __init__(self, model_size: str = "large", device: str = "cpu", cpu_threads: int = 0, num_workers: int = 1):
 
         self.model_size = model_size
         self.device = device
-        self.model = WhisperModel(model_size, device=device)
+        self.model = WhisperModel(model_size, device=device, cpu_threads=cpu_threads, num_workers=num_workers)
 
-    # Transcribe an audio file
-    def transcribe(self, audio_path: str, prompt: Optional[str] = None, language: Optional[str] = "sr", verbose=False) -> List[TranscriptSegment]:
+    # Transcribe an audio file, or 16 kHz mono float32 samples
+    # should_stop is checked between segments; decoding stops early when it returns True.
+    # on_segment is called with every segment as soon as it is decoded.
+    def transcribe(self, audio_path: Union[str, np.ndarray], prompt: Optional[str] = None, language: Optional[str] = "sr", verbose=False, should_stop: Optional[Callable[[], bool]] = None, on_segment: Optional[Callable[[TranscriptSegment], None]] = None, beam_size: int = 5) -> List[TranscriptSegment]:
         
         start_time = time.time()
 
@@ -33,7 +39,7 @@ class Transcriber:
         # Perform transcription
         segments_list, _info = self.model.transcribe(
             audio_path,
-            beam_size=5,
+            beam_size=beam_size,
             word_timestamps=False,
             initial_prompt=prompt,
             language=language
@@ -41,14 +47,21 @@ class Transcriber:
 
         # Convert Whisper output to TranscriptSegment objects
         for segment in segments_list:
+            if should_stop and should_stop():
+                break
+
             segments.append(
                 TranscriptSegment(
                     start=segment.start,
                     end=segment.end,
-                    text=segment.text
+                    text=segment.text,
+                    confidence=math.exp(segment.avg_logprob)
                 )
             )
 
+            if on_segment:
+                on_segment(segments[-1])
+
         if verbose:
             print(f"Transcription finished in {time.time() - start_time:.2f}s")
 
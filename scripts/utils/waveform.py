@@ -0,0 +1,104 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Samples per peak of each zoom level; at 16 kHz the finest is 10 ms and each level is 4x coarser
+WAVEFORM_LEVELS = (160, 640, 2560, 10240, 40960)
+WAVEFORM_DTYPES = ("int8", "float16")
+WAVEFORM_META_FILE = "peaks.json"
+
+# Samples decoded per block; a multiple of the finest level so blocks never split a peak
+_BLOCK_SAMPLES = WAVEFORM_LEVELS[0] * 4096
+
+
+def _reduce(mins: np.ndarray, maxs: np.ndarray, factor: int) -> tuple[np.ndarray, np.ndarray]:
+    # Pad with the last value, which never changes the min/max of the partial window
+    pad = -len(mins) % factor
+    if pad:
+        mins = np.concatenate([mins, np.repeat(mins[-1:], pad)])
+        maxs = np.concatenate([maxs, np.repeat(maxs[-1:], pad)])
+    return mins.reshape(-1, factor).min(axis=1), maxs.reshape(-1, factor).max(axis=1)
+
+
+def compute_peaks(wav_path: str) -> tuple[int, dict[int, tuple[np.ndarray, np.ndarray]]]:
+    """
+    Min/max peaks of a mono WAV at every level of WAVEFORM_LEVELS. The PCM is
+    read once, block by block; coarser levels are reduced from the finest one.
+    """
+    mins, maxs = [], []
+    with sf.SoundFile(wav_path) as f:
+        sample_rate = f.samplerate
+        for block in f.blocks(blocksize=_BLOCK_SAMPLES, dtype="float32", always_2d=True):
+            samples = block[:, 0]
+            block_mins, block_maxs = _reduce(samples, samples, WAVEFORM_LEVELS[0])
+            mins.append(block_mins)
+            maxs.append(block_maxs)
+
+    levels = {}
+    level_mins = np.concatenate(mins) if mins else np.zeros(0, dtype=np.float32)
+    level_maxs = np.concatenate(maxs) if maxs else np.zeros(0, dtype=np.float32)
+    levels[WAVEFORM_LEVELS[0]] = (level_mins, level_maxs)
+
+    for previous, samples_per_peak in zip(WAVEFORM_LEVELS, WAVEFORM_LEVELS[1:]):
+        if len(level_mins):
+            level_mins, level_maxs = _reduce(level_mins, level_maxs, samples_per_peak // previous)
+        levels[samples_per_peak] = (level_mins, level_maxs)
+
+    return sample_rate, levels
+
+
+def _encode(mins: np.ndarray, maxs: np.ndarray, dtype: str) -> bytes:
+    # Interleaved min, max pairs
+    pairs = np.empty(len(mins) * 2, dtype=np.float32)
+    pairs[0::2] = mins
+    pairs[1::2] = maxs
+    if dtype == "int8":
+        return np.clip(np.round(pairs * 127), -127, 127).astype(np.int8).tobytes()
+    return pairs.astype(np.float16).tobytes()
+
+
+def write_peaks(wav_path: str, output_dir: str, dtype: str = "int8") -> dict:
+    """
+    Compute the peaks of a WAV and store one binary file per level plus a
+    peaks.json index in output_dir. Returns the index.
+    """
+    if dtype not in WAVEFORM_DTYPES:
+        raise ValueError(f"Unsupported waveform dtype: {dtype}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sample_rate, levels = compute_peaks(wav_path)
+
+    meta = {"sample_rate": sample_rate, "dtype": dtype, "levels": []}
+    for samples_per_peak, (mins, maxs) in levels.items():
+        name = f"peaks_{samples_per_peak}.bin"
+        tmp_path = output_dir / f"{name}.tmp"
+        tmp_path.write_bytes(_encode(mins, maxs, dtype))
+        os.replace(tmp_path, output_dir / name)
+        meta["levels"].append({"samples_per_peak": samples_per_peak, "count": len(mins), "file": name})
+
+    # The index is written last, so it only ever points at complete level files
+    tmp_meta = output_dir / f"{WAVEFORM_META_FILE}.tmp"
+    tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_meta, output_dir / WAVEFORM_META_FILE)
+
+    return meta
+
+
+def read_meta(peaks_dir: str) -> dict | None:
+    path = Path(peaks_dir) / WAVEFORM_META_FILE
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def read_window(peaks_dir: str, level: dict, dtype: str, first: int, last: int) -> bytes:
+    """Interleaved min/max bytes of peaks first..last (exclusive) of one level, read with a single seek."""
+    itemsize = np.dtype(dtype).itemsize
+    with open(Path(peaks_dir) / level["file"], "rb") as f:
+        f.seek(first * 2 * itemsize)
+        return f.read((last - first) * 2 * itemsize)
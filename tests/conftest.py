@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Settings are read at import time, so they must be in place before app is imported
+_tmp = Path(tempfile.mkdtemp(prefix="meeting-tests-"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp / 'test.db'}")
+os.environ.setdefault("OUTPUT_DIR", str(_tmp / "output"))
+os.environ.setdefault("AUDIO_DIR", str(_tmp / "audio"))
+
+from app import models  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.services.meeting_cache import meeting_cache  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    # Every test starts from empty tables, files and caches (meeting ids repeat across tests)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    shutil.rmtree(os.environ["OUTPUT_DIR"], ignore_errors=True)
+    meeting_cache.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_meeting(db):
+    def make(title="Meeting", duration=600.0, **fields):
+        meeting = models.Meeting(title=title, date=datetime(2024, 1, 1, 10), audio_file_path="data/shorts4.mp3",
+                                 duration=duration, **fields)
+        db.add(meeting)
+        db.commit()
+        return meeting
+    return make
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,40 @@
+from app import worker
+from app.services.audio_preview import AudioPreviewService
+from app.services.audio_processor import AudioProcessor
+
+
+def fake_encode(source_path, output_path, bitrate):
+    with open(output_path, "wb") as f:
+        f.write(b"webm")
+
+
+def test_missing_preview_serves_original_and_is_encoded_by_a_worker(client, db, make_meeting, monkeypatch):
+    meeting = make_meeting()
+
+    def fail_encode(*args):
+        raise AssertionError("The API must not transcode")
+
+    monkeypatch.setattr(AudioProcessor, "encode_opus_preview", fail_encode)
+    first = client.get(f"/api/meetings/{meeting.id}/audio")
+
+    assert first.status_code == 200
+    assert first.headers["x-audio-rendition"] == "original"
+    assert first.headers["content-type"] == "audio/mpeg"
+
+    monkeypatch.setattr(AudioProcessor, "encode_opus_preview", fake_encode)
+    assert worker.encode_requested_preview(db)
+    assert not worker.encode_requested_preview(db)
+
+    second = client.get(f"/api/meetings/{meeting.id}/audio", headers={"Range": "bytes=0-1"})
+
+    assert second.status_code == 206
+    assert second.headers["x-audio-rendition"] == "preview"
+    assert second.content == b"we"
+
+
+def test_request_is_taken_by_one_worker_only(db):
+    AudioPreviewService.request(7)
+    AudioPreviewService.request(7)
+
+    assert AudioPreviewService.take_request() == 7
+    assert AudioPreviewService.take_request() is None
@@ -0,0 +1,77 @@
+from scripts.utils.backlog import QUALITY_LEVELS, BacklogPolicy, LagMonitor
+
+
+def policy(max_workers=2, cooldown=5.0):
+    now = [0.0]
+    backlog = BacklogPolicy(max_workers, high_water=10.0, low_water=3.0, cooldown=cooldown, clock=lambda: now[0])
+    return backlog, now
+
+
+def state(backlog):
+    return backlog.workers, backlog.level.name
+
+
+def test_escalates_workers_first_then_quality():
+    backlog, now = policy()
+    steps = []
+    for second in range(0, 30, 5):
+        now[0] = second
+        backlog.update(20.0)
+        steps.append(state(backlog))
+
+    assert steps == [(2, "full"), (2, "fast"), (2, "fallback"), (2, "fallback"), (2, "fallback"), (2, "fallback")]
+    assert not backlog.update(20.0)
+
+
+def test_recovers_quality_first_then_workers():
+    backlog, now = policy()
+    for second in range(0, 15, 5):
+        now[0] = second
+        backlog.update(20.0)
+
+    steps = []
+    for second in range(15, 40, 5):
+        now[0] = second
+        backlog.update(1.0)
+        steps.append(state(backlog))
+
+    assert steps == [(2, "fast"), (2, "full"), (1, "full"), (1, "full"), (1, "full")]
+    assert backlog.level == QUALITY_LEVELS[0]
+
+
+def test_one_step_per_cooldown():
+    backlog, now = policy(max_workers=1)
+
+    assert backlog.update(20.0)
+    now[0] = 4.9
+    assert not backlog.update(20.0)
+    now[0] = 5.0
+    assert backlog.update(20.0)
+    assert state(backlog) == (1, "fallback")
+
+
+def test_lag_between_the_marks_changes_nothing():
+    backlog, now = policy()
+
+    assert not backlog.update(5.0)
+    assert state(backlog) == (1, "full")
+
+
+def test_lag_is_measured_from_the_oldest_pending_segment():
+    monitor = LagMonitor()
+    assert monitor.snapshot() == {"lag": 0.0, "queued_seconds": 0.0, "segments": 0}
+
+    monitor.captured_to(12.0)
+    monitor.queued(2.0, 3.0)
+    monitor.queued(6.0, 4.0)
+    monitor.captured_to(10.0)
+
+    assert monitor.snapshot() == {"lag": 10.0, "queued_seconds": 7.0, "segments": 2}
+    assert monitor.settled_until() == 2.0
+
+    monitor.done(2.0)
+    assert monitor.snapshot()["lag"] == 6.0
+    monitor.done(6.0)
+    monitor.done(6.0)
+    assert monitor.snapshot()["lag"] == 0.0
+    assert monitor.settled_until() == 12.0
@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+
+from scripts import transcribe
+from scripts.utils.transcriber import TranscriptSegment
+
+
+def test_same_stem_in_different_directories_gets_distinct_names(tmp_path):
+    inputs = [str(tmp_path / "a" / "sastanak.mp3"), str(tmp_path / "b" / "sastanak.mp3"), str(tmp_path / "plan.mp3")]
+
+    names = transcribe.output_names(inputs)
+
+    assert names[inputs[2]] == "plan"
+    assert names[inputs[0]] != names[inputs[1]]
+    assert all(names[f].startswith("sastanak-") for f in inputs[:2])
+    # Stable across runs, so a resumed batch writes to the same files
+    assert transcribe.output_names(inputs) == names
+
+
+def test_the_same_file_is_listed_once(tmp_path, monkeypatch):
+    (tmp_path / "a").mkdir()
+    monkeypatch.chdir(tmp_path)
+    file_list = tmp_path / "files.txt"
+    file_list.write_text("a/sastanak.mp3\n./a/sastanak.mp3\n# a/other.mp3\nb/sastanak.mp3\n", encoding="utf-8")
+
+    assert transcribe.collect_inputs(None, str(file_list)) == ["a/sastanak.mp3", "b/sastanak.mp3"]
+
+
+class EchoTranscriber:
+    """Transcribes a file as its own path, after waiting for the other job to start."""
+
+    def __init__(self, jobs):
+        self.barrier = threading.Barrier(jobs)
+
+    def transcribe(self, wav_file, **kwargs):
+        self.barrier.wait(timeout=5)
+        return [TranscriptSegment(start=0.0, end=1.0, text=str(wav_file), confidence=1.0)]
+
+
+def test_concurrent_jobs_with_the_same_stem_keep_their_outputs(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcribe.summarizer, "reconstruct_transcript", lambda text, output_file=None, **kwargs: [])
+    inputs = []
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / "sastanak_16k_mono.wav"
+        sf.write(str(path), np.zeros(16000, dtype=np.int16), 16000, subtype="PCM_16")
+        inputs.append(str(path))
+    names = transcribe.output_names(inputs)
+    (tmp_path / "out").mkdir()
+    args = SimpleNamespace(output=str(tmp_path / "out"), verbose=False, diarize=False)
+    transcriber = EchoTranscriber(jobs=2)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(lambda f: transcribe.process_file(f, args, transcriber, None, output_name=names[f]), inputs))
+
+    outputs = [result["raw_output"] for result in results]
+    assert len(set(outputs)) == 2
+    assert all(output.endswith("_16k_mono.txt") and "sastanak-" in output for output in outputs)
+    for audio_file, output in zip(inputs, outputs):
+        assert audio_file in open(output, encoding="utf-8").read()
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from app import models
+from app.services.checkpoint_store import ARTIFACT_DIR, CheckpointStore
+from app.services.job_queue import JobQueueService
+
+
+def store(db, meeting):
+    job, _created = JobQueueService.enqueue(db, meeting, submitted_by="alice")
+    return CheckpointStore(job.id, meeting.id)
+
+
+def test_prune_keeps_the_latest_version_of_each_stage(db, make_meeting, tmp_path):
+    meeting = make_meeting()
+    checkpoints = store(db, meeting)
+    old_peaks, peaks = tmp_path / "old.peaks", tmp_path / "new.peaks"
+    for path in (old_peaks, peaks):
+        path.write_bytes(b"\0")
+    wav = tmp_path / "meeting_16k_mono.wav"
+    wav.write_bytes(b"RIFF")
+
+    checkpoints.save("converted_audio", "a", str(wav), files=[str(wav)])
+    checkpoints.save("converted_audio", "b", str(wav), files=[str(wav)])
+    checkpoints.save("waveform_peaks", "a", {}, files=[str(old_peaks)])
+    checkpoints.save("waveform_peaks", "b", {}, files=[str(peaks)])
+    checkpoints.save("raw_segments", "a", [])
+
+    assert checkpoints.prune() == 2
+
+    rows = db.query(models.JobArtifact).order_by(models.JobArtifact.stage).all()
+    assert [(a.stage, a.version) for a in rows] == [("converted_audio", 2), ("raw_segments", 1), ("waveform_peaks", 2)]
+    assert sorted(p.name for p in checkpoints.artifact_dir.iterdir()) == ["converted_audio_v2.json", "raw_segments_v1.json", "waveform_peaks_v2.json"]
+    # The converted WAV is still used by the latest version; the old peaks are not
+    assert wav.exists() and peaks.exists() and not old_peaks.exists()
+    assert checkpoints.load("converted_audio", "b") == str(wav)
+    assert checkpoints.load("converted_audio", "a") is None
+    assert checkpoints.prune() == 0
+
+
+def test_prune_never_deletes_the_recording(db, make_meeting, tmp_path):
+    meeting = make_meeting()
+    checkpoints = store(db, meeting)
+    recording = tmp_path / "recording.wav"
+    recording.write_bytes(b"RIFF")
+
+    checkpoints.save("converted_audio", "a", str(recording), files=[str(recording)])
+    checkpoints.save("converted_audio", "b", str(tmp_path / "other.wav"), files=[])
+
+    assert checkpoints.prune(keep=[str(recording)]) == 1
+    assert recording.exists()
+
+
+def test_deleting_a_meeting_removes_checkpoints_and_converted_audio(client, db, make_meeting, tmp_path):
+    recording = tmp_path / "recording.wav"
+    recording.write_bytes(b"RIFF")
+    converted = tmp_path / "recording_16k_mono.wav"
+    converted.write_bytes(b"RIFF")
+    meeting = make_meeting()
+    meeting.audio_file_path = str(recording)
+    db.commit()
+    checkpoints = store(db, meeting)
+    checkpoints.save("converted_audio", "a", str(converted), files=[str(converted)])
+    checkpoints.save("raw_segments", "a", [])
+    other = make_meeting()
+    other_checkpoints = store(db, other)
+    other_checkpoints.save("raw_segments", "a", [])
+
+    assert client.delete(f"/api/meetings/{meeting.id}").status_code == 200
+
+    assert not (ARTIFACT_DIR / f"meeting_{meeting.id}").exists()
+    assert not converted.exists()
+    assert recording.exists()
+    assert other_checkpoints.load("raw_segments", "a") == []
+
+
+def test_meeting_without_checkpoints_can_be_removed():
+    CheckpointStore.remove_meeting(123456)
+    assert not Path(ARTIFACT_DIR / "meeting_123456").exists()
@@ -0,0 +1,69 @@
+import re
+
+from app.services.export_service import ExportService, subtitle_timestamp
+from app.services.meeting_cache import meeting_cache
+
+
+def cue(text, speaker=None, start=1.0, end=2.5):
+    return {"start": start, "end": end, "speaker": speaker, "text": text}
+
+
+def render(cues, format):
+    return "".join(ExportService.render_subtitles(cues, format))
+
+
+def test_subtitle_timestamp():
+    assert subtitle_timestamp(3725.0406, ",") == "01:02:05,041"
+    assert subtitle_timestamp(-1, ".") == "00:00:00.000"
+
+
+def test_vtt_escapes_cue_text_and_voice():
+    vtt = render([cue("A & B <b>bold</b> --> next", speaker="Ana <PM>")], "vtt")
+
+    assert vtt == (
+        "WEBVTT\n\n"
+        "00:00:01.000 --> 00:00:02.500\n"
+        "<v Ana &lt;PM&gt;>A &amp; B &lt;b&gt;bold&lt;/b&gt; --&gt; next\n\n"
+    )
+
+
+def test_vtt_has_one_timing_line_per_cue():
+    vtt = render([cue("prvi -->\n\ndrugi"), cue("treći", start=3, end=4)], "vtt")
+
+    assert len(re.findall("-->", vtt)) == 2
+    assert "\n\n\n" not in vtt
+    assert vtt.split("\n\n")[1:3] == ["00:00:01.000 --> 00:00:02.500\nprvi --&gt;\ndrugi",
+                                      "00:00:03.000 --> 00:00:04.000\ntreći"]
+
+
+def test_srt_numbers_cues_and_skips_empty_text():
+    srt = render([cue("prvi", speaker="speaker_0"), cue(""), cue("a --> b", start=3, end=2)], "srt")
+
+    assert srt == (
+        "1\n00:00:01,000 --> 00:00:02,500\nspeaker_0: prvi\n\n"
+        "2\n00:00:03,000 --> 00:00:03,000\na -> b\n\n"
+    )
+
+
+def test_cache_key_follows_content_version_and_status():
+    keys = {
+        ExportService.etag(1, 3, "completed", "json"),
+        ExportService.etag(1, 3, "processing", "json"),
+        ExportService.etag(1, 4, "completed", "json"),
+    }
+    assert len(keys) == 3
+    assert ExportService.cache_path(1, 3, "processing", "json") != ExportService.cache_path(1, 3, "completed", "json")
+
+
+def test_json_export_status_is_not_served_stale(client, db, make_meeting):
+    meeting = make_meeting(status="completed")
+
+    first = client.get(f"/api/meetings/{meeting.id}/export", params={"format": "json"})
+    meeting.status = "processing"
+    db.commit()
+    meeting_cache.revalidate(db)
+    second = client.get(f"/api/meetings/{meeting.id}/export", params={"format": "json"})
+
+    assert first.json()["meeting"]["status"] == "completed"
+    assert second.json()["meeting"]["status"] == "processing"
+    assert first.headers["etag"] != second.headers["etag"]
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.services.job_events import EventBroker
+
+
+def event(meeting_id, job_status):
+    return {"meeting_id": meeting_id, "status": "pending", "job_id": 1, "job_status": job_status,
+            "stage": None, "progress": None}
+
+
+def test_events_for_unwatched_meetings_are_not_kept():
+    async def run():
+        broker = EventBroker()
+        broker.bind_loop(asyncio.get_running_loop())
+        for meeting_id in range(100):
+            broker.publish(event(meeting_id, "queued"))
+        return broker
+
+    broker = asyncio.run(run())
+    assert broker._latest == {}
+
+
+def test_subscriber_gets_changes_once_and_state_is_dropped_when_it_leaves():
+    async def run():
+        broker = EventBroker()
+        snapshot = event(1, "queued")
+        queue = broker.subscribe(1, snapshot)
+
+        broker.publish(event(1, "queued"))
+        broker.publish(event(1, "running"))
+        broker.publish(event(1, "running"))
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+
+        broker.unsubscribe(1, queue)
+        broker.publish(event(1, "completed"))
+        return broker, received
+
+    broker, received = asyncio.run(run())
+    assert [e["job_status"] for e in received] == ["running"]
+    assert broker.latest(1) is None
+    assert broker.watched_meetings() == []
+
+
+def test_sse_snapshot_is_read_fresh(client, db, make_meeting):
+    from app import models
+    from app.models.job import JobStatus
+    from app.services.job_events import broker
+
+    meeting = make_meeting(status="completed")
+    db.add(models.Job(meeting_id=meeting.id, status=JobStatus.completed))
+    db.commit()
+    # A stale event left behind from when the job was queued
+    broker._latest[meeting.id] = {**event(meeting.id, "queued"), "job_id": None}
+
+    response = client.get(f"/api/meetings/{meeting.id}/events")
+    events = [line for line in response.text.splitlines() if line.startswith("data:")]
+
+    assert len(events) == 1
+    assert '"job_status": "completed"' in events[0]
+    broker._latest.clear()
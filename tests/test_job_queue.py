@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+from sqlalchemy.orm import Query
+
+from app import models
+from app.models.job import JobStatus, utcnow
+from app.services.job_queue import JOB_LEASE_SECONDS, JobQueueService
+
+
+def test_enqueue_is_single_flight(db, make_meeting):
+    meeting = make_meeting()
+
+    job, created = JobQueueService.enqueue(db, meeting)
+    again, created_again = JobQueueService.enqueue(db, meeting)
+
+    assert created and not created_again
+    assert again.id == job.id
+    assert db.query(models.Job).count() == 1
+
+
+def test_claim_leases_the_job_to_one_worker(db, make_meeting):
+    job, _ = JobQueueService.enqueue(db, make_meeting())
+
+    claimed = JobQueueService.claim(db, "w1")
+
+    assert claimed.id == job.id
+    assert claimed.status == JobStatus.running
+    assert claimed.worker_id == "w1"
+    assert claimed.attempts == 1
+    assert claimed.lease_expires_at > utcnow() + timedelta(seconds=JOB_LEASE_SECONDS - 5)
+    assert JobQueueService.claim(db, "w2") is None
+
+
+def test_claim_skips_jobs_not_yet_available(db, make_meeting):
+    job, _ = JobQueueService.enqueue(db, make_meeting())
+    job.available_at = utcnow() + timedelta(minutes=5)
+    db.commit()
+
+    assert JobQueueService.claim(db, "w1") is None
+
+
+def test_expired_lease_is_taken_over(db, make_meeting):
+    job, _ = JobQueueService.enqueue(db, make_meeting())
+    JobQueueService.claim(db, "dead")
+    job.lease_expires_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    claimed = JobQueueService.claim(db, "w2")
+
+    assert claimed.id == job.id
+    assert claimed.worker_id == "w2"
+    assert claimed.attempts == 2
+    assert not JobQueueService.heartbeat(db, job.id, "dead")
+    assert JobQueueService.heartbeat(db, job.id, "w2")
+
+
+def test_expired_lease_without_attempts_left_fails(db, make_meeting):
+    job, _ = JobQueueService.enqueue(db, make_meeting())
+    job.status = JobStatus.running
+    job.attempts = job.max_attempts
+    job.lease_expires_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    assert JobQueueService.claim(db, "w1") is None
+    db.refresh(job)
+    assert job.status == JobStatus.failed
+    assert job.dedupe_key is None
+
+
+def test_claim_compare_and_set_rejects_a_stale_observation(db, make_meeting, monkeypatch):
+    job, _ = JobQueueService.enqueue(db, make_meeting())
+    original_update = Query.update
+
+    def claimed_elsewhere(query, values, **kwargs):
+        # Another worker (without row locks, as on SQLite) wins the race just before our update
+        if models.Job.worker_id in values:
+            other = db.get_bind().connect()
+            other.execute(models.Job.__table__.update().where(models.Job.id == job.id).values(
+                status=JobStatus.running, attempts=1, worker_id="other"))
+            other.commit()
+            other.close()
+        return original_update(query, values, **kwargs)
+
+    monkeypatch.setattr(Query, "update", claimed_elsewhere)
+
+    assert JobQueueService.claim(db, "w1") is None
+    db.expire_all()
+    assert db.get(models.Job, job.id).worker_id == "other"
+
+
+def test_fail_retries_with_backoff_then_gives_up(db, make_meeting):
+    meeting = make_meeting()
+    job, _ = JobQueueService.enqueue(db, meeting)
+
+    for attempt in range(1, job.max_attempts + 1):
+        claimed = JobQueueService.claim(db, "w1")
+        assert claimed.attempts == attempt
+        retried = JobQueueService.fail(db, claimed, "boom")
+        if retried:
+            assert claimed.status == JobStatus.queued
+            assert claimed.available_at > utcnow()
+            claimed.available_at = utcnow() - timedelta(seconds=1)
+            db.commit()
+
+    assert not retried
+    assert job.status == JobStatus.failed
+    assert meeting.status == "failed"
+
+
+def test_cancel_queued_job_is_immediate(db, make_meeting):
+    meeting = make_meeting()
+    job, _ = JobQueueService.enqueue(db, meeting)
+
+    assert JobQueueService.request_cancel(db, job)
+    assert job.status == JobStatus.cancelled
+    assert meeting.status == "pending"
+    assert JobQueueService.claim(db, "w1") is None
+
+
+def test_cancel_running_job_is_flagged(db, make_meeting):
+    JobQueueService.enqueue(db, make_meeting())
+    job = JobQueueService.claim(db, "w1")
+
+    assert not JobQueueService.request_cancel(db, job)
+    assert job.status == JobStatus.running
+    assert job.cancel_requested
+
+
+def test_recover_stale_requeues_expired_leases(db, make_meeting):
+    JobQueueService.enqueue(db, make_meeting())
+    job = JobQueueService.claim(db, "dead")
+    job.lease_expires_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    assert JobQueueService.recover_stale(db) == 1
+    assert job.status == JobStatus.queued
+    assert job.worker_id is None
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from faster_whisper.audio import decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+from scripts.utils.live_audio import RingBuffer, StreamingVad
+
+SAMPLE_RATE = 16000
+VAD_OPTIONS = VadOptions(threshold=0.5, min_speech_duration_ms=200, min_silence_duration_ms=150)
+
+
+@pytest.fixture(scope="module")
+def speech():
+    audio = decode_audio("data/shorts4.mp3", sampling_rate=SAMPLE_RATE)
+    return (audio * 32767).astype(np.int16)
+
+
+def stream(vad, samples, block=1600):
+    segments = []
+    for offset in range(0, len(samples), block):
+        segments += vad.process(samples[offset:offset + block])
+    return segments + vad.flush()
+
+
+def test_ring_buffer_slices_by_absolute_position():
+    ring = RingBuffer(10)
+    ring.write(np.arange(7, dtype=np.int16))
+    ring.write(np.arange(7, 14, dtype=np.int16))
+
+    assert ring.written == 14
+    assert ring.slice(4, 14).tolist() == list(range(4, 14))
+    assert ring.slice(12, 20).tolist() == [12, 13]
+    with pytest.raises(IndexError):
+        ring.slice(3, 8)
+
+
+def test_ring_buffer_keeps_the_tail_of_an_oversized_write():
+    ring = RingBuffer(4)
+    ring.write(np.arange(6, dtype=np.int16))
+
+    assert ring.written == 6
+    assert ring.slice(2, 6).tolist() == [2, 3, 4, 5]
+
+
+def test_ring_buffer_wait_returns_on_close():
+    ring = RingBuffer(4)
+    ring.close()
+
+    assert ring.wait(0, min_samples=4, timeout=1) == 0
+
+
+@pytest.mark.parametrize("block", [512, 1600, 4096])
+def test_streaming_vad_matches_get_speech_timestamps(speech, block):
+    reference = get_speech_timestamps(speech.astype(np.float32) / 32768.0, VAD_OPTIONS, sampling_rate=SAMPLE_RATE)
+
+    segments = stream(StreamingVad(VAD_OPTIONS, SAMPLE_RATE, max_segment_samples=SAMPLE_RATE * 600), speech, block)
+
+    assert segments == [(ts["start"], ts["end"]) for ts in reference]
+
+
+def test_streaming_vad_segments_never_overlap(speech):
+    segments = stream(StreamingVad(VAD_OPTIONS, SAMPLE_RATE, max_segment_samples=SAMPLE_RATE * 5), speech)
+
+    assert max(end - start for start, end in segments) <= SAMPLE_RATE * 5 + VAD_OPTIONS.speech_pad_ms * SAMPLE_RATE // 1000
+    for (_, previous_end), (start, _) in zip(segments, segments[1:]):
+        assert start >= previous_end
+
+
+def test_streaming_vad_reset_drops_held_audio(speech):
+    vad = StreamingVad(VAD_OPTIONS, SAMPLE_RATE, max_segment_samples=SAMPLE_RATE * 600)
+    vad.process(speech[:SAMPLE_RATE * 3])
+    vad.reset(SAMPLE_RATE * 20)
+
+    segments = stream(vad, speech[SAMPLE_RATE * 20:])
+
+    assert segments
+    assert segments[0][0] >= SAMPLE_RATE * 20
+
+
+def test_streaming_scores_match_the_installed_model(speech):
+    vad = StreamingVad(VAD_OPTIONS, SAMPLE_RATE, SAMPLE_RATE * 30)
+    audio = speech[:SAMPLE_RATE * 10 // 512 * 512]
+
+    # State carried across calls gives the scores of one pass over the whole audio
+    scores = np.concatenate([vad._score(audio[i:i + 4096].astype(np.float32) / 32768.0) for i in range(0, len(audio), 4096)])
+    reference = vad.model(audio.astype(np.float32) / 32768.0).reshape(-1)
+
+    # The model's __call__ zeroes the tail of its last window (it builds the context from a view), so that one differs
+    assert len(scores) == len(reference)
+    assert np.allclose(scores[:-1], reference[:-1], atol=1e-4)
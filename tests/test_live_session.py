@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app import models
+from app.routers import live
+from app.services import live_session
+from scripts.benchmarks.live_capture import synthetic_audio
+from scripts.utils import model_pool
+from scripts.utils.transcriber import TranscriptSegment
+
+
+class FakeTranscriber:
+    model = None
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.beam_sizes = []
+
+    def transcribe(self, audio, language=None, beam_size=5, **kwargs):
+        if self.error:
+            raise self.error
+        time.sleep(self.delay)
+        self.beam_sizes.append(beam_size)
+        return [TranscriptSegment(start=0.0, end=len(audio) / 16000, text=" zdravo", confidence=0.9)]
+
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    fake = FakeTranscriber()
+    monkeypatch.setattr(model_pool, "get_transcriber", lambda **kwargs: fake)
+    return fake
+
+
+@pytest.fixture(scope="module")
+def pcm():
+    return synthetic_audio(20).astype("<i2").tobytes()
+
+
+def run(client, pcm, block_bytes=32000):
+    messages = []
+    with client.websocket_connect("/ws/live?title=Live") as ws:
+        messages.append(ws.receive_json())
+        for offset in range(0, len(pcm), block_bytes):
+            ws.send_bytes(pcm[offset:offset + block_bytes])
+        ws.send_text(json.dumps({"type": "stop"}))
+        try:
+            while True:
+                messages.append(ws.receive_json())
+        except WebSocketDisconnect as e:
+            return messages, e.code
+
+
+def recordings():
+    return sorted(live_session.AUDIO_DIR.glob("live_*.wav")) if live_session.AUDIO_DIR.exists() else []
+
+
+def test_session_is_saved_as_a_meeting(client, db, transcriber, pcm):
+    messages, code = run(client, pcm)
+
+    assert code == 1000
+    assert messages[0]["type"] == "ready"
+    assert any(m["type"] == "segment" for m in messages)
+    saved = messages[-1]
+    meeting = db.get(models.Meeting, saved["meeting_id"])
+    assert meeting.status == "completed"
+    assert meeting.duration == pytest.approx(20, abs=0.1)
+    assert set(transcriber.beam_sizes) == {5}
+
+
+def test_session_falling_behind_degrades_then_is_saved_and_closed(client, db, transcriber, pcm, monkeypatch):
+    monkeypatch.setattr(live_session, "LIVE_MAX_LAG_SECONDS", 0.05)
+    monkeypatch.setattr(live, "LIVE_MAX_LAG_SECONDS", 0.05)
+    transcriber.delay = 0.2
+
+    messages, code = run(client, pcm, block_bytes=32000 * 5)
+
+    assert code == live.WS_TRY_AGAIN_LATER
+    lag = [m for m in messages if m["type"] == "lag"]
+    assert lag and lag[0]["quality"] == "fast" and lag[0]["beam_size"] == 1
+    meeting = db.get(models.Meeting, messages[-1]["meeting_id"])
+    assert meeting.status == "completed"
+    assert 0 < meeting.duration < 20
+
+
+def test_failed_session_keeps_recording_with_a_failed_meeting(client, db, transcriber, pcm):
+    transcriber.error = RuntimeError("decoder crashed")
+    before = recordings()
+
+    messages, code = run(client, pcm)
+
+    assert code == 1011
+    meeting = db.get(models.Meeting, messages[-1]["meeting_id"])
+    assert meeting.status == "failed"
+    assert sorted(set(recordings()) - set(before)) == [Path(meeting.audio_file_path)]
+
+
+def test_recording_is_deleted_when_the_session_cannot_be_saved(client, db, transcriber, pcm, monkeypatch):
+    before = recordings()
+
+    def fail_save(*args, **kwargs):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(live_session.LiveSessionService, "save", fail_save)
+    _messages, code = run(client, pcm[:32000 * 3])
+
+    assert code == 1011
+    assert recordings() == before
+
+
+def test_inbox_blocks_the_receiver_while_full():
+    async def scenario():
+        inbox = live.AudioInbox(max_bytes=4)
+        await inbox.put(b"1234")
+        blocked = asyncio.create_task(inbox.put(b"56"))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        pcm, _arrived = await inbox.take()
+        await asyncio.wait_for(blocked, 1)
+        await inbox.close()
+        return pcm, await inbox.take(), await inbox.take()
+
+    first, second, end = asyncio.run(scenario())
+    assert first == b"1234"
+    assert second[0] == b"56"
+    assert end is None
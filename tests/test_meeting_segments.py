@@ -0,0 +1,31 @@
+from app import models
+
+
+def add_segments(db, meeting, speakers):
+    for position, speaker in enumerate(speakers):
+        db.add(models.TranscriptSegment(meeting_id=meeting.id, position=position, start=position * 5.0,
+                                        end=position * 5.0 + 5.0, speaker=speaker, raw_text="tekst", text="tekst"))
+    db.commit()
+
+
+def speakers(client, meeting, speaker):
+    response = client.get(f"/api/meetings/{meeting.id}/segments", params={"speaker": speaker})
+    assert response.status_code == 200
+    return [item["speaker"] for item in response.json()["items"]]
+
+
+def test_speaker_filter_matches_overlapping_speech(client, db, make_meeting):
+    meeting = make_meeting()
+    add_segments(db, meeting, ["speaker_1", "speaker_0 + speaker_1", "speaker_1 + speaker_2", "speaker_2"])
+
+    assert speakers(client, meeting, "speaker_1") == ["speaker_1", "speaker_0 + speaker_1", "speaker_1 + speaker_2"]
+
+
+def test_speaker_filter_has_no_wildcards(client, db, make_meeting):
+    meeting = make_meeting()
+    add_segments(db, meeting, ["speakerX1 + speaker_2", "speaker_0 + speakerX1", "speaker_10 + speaker_2", "a\\b + speaker_0"])
+
+    assert speakers(client, meeting, "speaker_1") == []
+    assert speakers(client, meeting, "%") == []
+    assert speakers(client, meeting, "_") == []
+    assert speakers(client, meeting, "a\\b") == ["a\\b + speaker_0"]
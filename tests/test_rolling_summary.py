@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import numpy as np
+
+from scripts.utils.backlog import LagMonitor
+from scripts.utils.rolling_summary import SummaryFeeder
+from scripts.utils.streaming import LocalAgreementDecoder, join_words
+
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class Segment:
+    start: float
+    end: float
+    text: str
+
+    def format(self) -> str:
+        return f"[{self.start:.1f} - {self.end:.1f}] {self.text}"
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.lines = []
+
+    def add_lines(self, lines):
+        self.lines.extend(lines)
+
+
+class HesitantModel:
+    """Hears one word per second but keeps changing its mind about the newest three."""
+
+    def __init__(self):
+        self.decoder = None
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        offset = self.decoder.offset
+        end = offset + len(audio) / SAMPLE_RATE
+        words = [SimpleNamespace(start=i + 0.1 - offset, end=i + 0.9 - offset, word=f" rec{i}")
+                 for i in range(int(offset), int(end)) if i + 0.9 <= end]
+        for word in words[-3:]:
+            word.word = f" guess{self.calls}"
+        return iter([SimpleNamespace(words=words)]), None
+
+
+def test_streaming_summary_never_passes_uncommitted_words():
+    model = HesitantModel()
+    decoder = LocalAgreementDecoder(model, "sr", sample_rate=SAMPLE_RATE, max_buffer_seconds=15.0)
+    model.decoder = decoder
+    monitor = LagMonitor()
+    transcript = []
+    summarizer = RecordingSummarizer()
+    feeder = SummaryFeeder(summarizer, transcript, monitor.settled_until, settle_margin=0.0)
+
+    def emit(words):
+        if words:
+            transcript.append(Segment(words[0].start, words[-1].end, join_words(words)))
+
+    fed_until = []
+    for second in range(30):
+        monitor.captured_to(second + 1.0)
+        monitor.queued(float(second), 1.0)
+        decoder.insert(np.zeros(SAMPLE_RATE, dtype=np.int16), float(second))
+        committed, hypothesis = decoder.step()
+        emit(committed)
+        for start in decoder.settled_inserts():
+            monitor.done(start)
+
+        fed = len(summarizer.lines)
+        feeder.feed_settled()
+        fed_until += [seg.end for seg in transcript if seg.format() in summarizer.lines[fed:]]
+        # Nothing handed over lies in audio whose words may still change
+        assert all(end <= decoder.settled_until for end in fed_until)
+        assert not hypothesis or monitor.settled_until() <= hypothesis[0].start
+
+    emit(decoder.finish())
+    for start in decoder.settled_inserts():
+        monitor.done(start)
+    feeder.feed(float("inf"))
+
+    # Every line exactly once, in stream order
+    assert summarizer.lines == [seg.format() for seg in sorted(transcript, key=lambda seg: seg.start)]
+    assert monitor.snapshot()["segments"] == 0
+
+
+def test_inserts_settle_only_once_their_words_are_committed():
+    model = HesitantModel()
+    decoder = LocalAgreementDecoder(model, "sr", sample_rate=SAMPLE_RATE)
+    model.decoder = decoder
+
+    for second in range(6):
+        decoder.insert(np.zeros(SAMPLE_RATE, dtype=np.int16), float(second))
+        decoder.step()
+
+    # rec0..rec1 are committed, the guesses after them are not
+    assert decoder.settled_until == 1.9
+    assert decoder.settled_inserts() == [0.0]
+    assert decoder.settled_inserts() == []
+
+    decoder.finish()
+    assert decoder.settled_inserts() == [1.0, 2.0, 3.0, 4.0, 5.0]
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from app.models.job import JobStatus, utcnow
+from app.services import scheduler
+from app.services.job_queue import JobQueueService
+from app.services.scheduler import SchedulerService
+
+
+def queue(db, make_meeting, user, expected_seconds, waited=0.0):
+    job, _ = JobQueueService.enqueue(db, make_meeting(), submitted_by=user)
+    job.expected_seconds = expected_seconds
+    job.created_at = utcnow() - timedelta(seconds=waited)
+    db.commit()
+    return job
+
+
+def test_shortest_expected_job_goes_first(db, make_meeting):
+    long = queue(db, make_meeting, "alice", 3600)
+    short = queue(db, make_meeting, "bob", 60)
+    medium = queue(db, make_meeting, "carol", 600)
+
+    assert SchedulerService.claim_order(db) == [short.id, medium.id, long.id]
+
+
+def test_waiting_jobs_age_ahead_of_shorter_ones(db, make_meeting):
+    old_long = queue(db, make_meeting, "alice", 3600, waited=3000)
+    new_short = queue(db, make_meeting, "bob", 600)
+
+    # 3600 - 2 * 3000 < 600
+    assert SchedulerService.claim_order(db) == [old_long.id, new_short.id]
+
+
+def test_abandoned_jobs_are_taken_over_first(db, make_meeting):
+    abandoned = queue(db, make_meeting, "alice", 3600)
+    JobQueueService.claim(db, "dead")
+    short = queue(db, make_meeting, "bob", 60)
+    abandoned.lease_expires_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    assert SchedulerService.claim_order(db) == [abandoned.id, short.id]
+
+
+def test_claim_order_skips_users_at_their_cap(db, make_meeting):
+    first = queue(db, make_meeting, "alice", 60)
+    second = queue(db, make_meeting, "alice", 120)
+    other = queue(db, make_meeting, "bob", 3600)
+
+    assert JobQueueService.claim(db, "w1").id == first.id
+    assert SchedulerService.claim_order(db) == [other.id]
+    assert second.status == JobStatus.queued
+
+
+def test_claim_rechecks_the_cap_a_concurrent_worker_reached(db, make_meeting, monkeypatch):
+    first = queue(db, make_meeting, "alice", 60)
+    second = queue(db, make_meeting, "alice", 120)
+    other = queue(db, make_meeting, "bob", 3600)
+
+    # Both workers computed their order before either claimed anything
+    stale_order = SchedulerService.claim_order(db)
+    monkeypatch.setattr(SchedulerService, "claim_order", staticmethod(lambda db: stale_order))
+
+    assert JobQueueService.claim(db, "w1").id == first.id
+    assert JobQueueService.claim(db, "w2").id == other.id
+    db.expire_all()
+    assert second.status == JobStatus.queued
+
+
+def test_cap_applies_per_user(db, make_meeting, monkeypatch):
+    monkeypatch.setattr(scheduler, "SCHEDULER_MAX_RUNNING_PER_USER", 2)
+    jobs = [queue(db, make_meeting, "alice", 60 * i) for i in range(1, 4)]
+
+    claimed = [JobQueueService.claim(db, f"w{i}") for i in range(3)]
+
+    assert [job.id for job in claimed[:2]] == [jobs[0].id, jobs[1].id]
+    assert claimed[2] is None
@@ -0,0 +1,55 @@
+from app import models
+from app.services.search_index import SearchIndexService, fold, tokenize
+
+
+def add_segments(db, meeting, lines):
+    for position, (speaker, text) in enumerate(lines):
+        db.add(models.TranscriptSegment(meeting_id=meeting.id, position=position, start=position * 5.0,
+                                        end=position * 5.0 + 5.0, speaker=speaker, raw_text=text, text=text))
+    db.commit()
+
+
+def test_fold_matches_cyrillic_and_diacritics():
+    assert fold("Чачак") == fold("Čačak") == fold("cacak") == "cacak"
+    assert tokenize("Đorđe i ja, 2024.") == ["djordje", "ja", "2024"]
+
+
+def test_search_ranks_segments_and_requires_every_term(db, make_meeting):
+    meeting = make_meeting(status="completed")
+    add_segments(db, meeting, [("speaker_0", "Budžet za sprint je odobren"), ("speaker_1", "Sprint počinje sutra")])
+    SearchIndexService.index_meeting(db, meeting.id)
+    db.commit()
+
+    both = SearchIndexService.search(db, "budzet sprint")
+    one = SearchIndexService.search(db, "sprint")
+
+    assert both["total"] == 1
+    assert both["items"][0]["start"] == 0.0
+    assert one["total"] == 2
+    assert SearchIndexService.search(db, "kafka")["total"] == 0
+
+
+def test_rename_only_rewrites_speaker_documents(client, db, make_meeting):
+    meeting = make_meeting(status="completed")
+    add_segments(db, meeting, [("speaker_0", "Otvaramo sastanak"), ("speaker_1", "Imam pitanje")])
+    db.add(models.Speaker(meeting_id=meeting.id, label="speaker_0", name="Ana"))
+    SearchIndexService.index_meeting(db, meeting.id)
+    db.commit()
+    content_ids = {doc_id for (doc_id,) in db.query(models.SearchDocument.id).filter(
+        models.SearchDocument.kind != "speaker").all()}
+
+    response = client.put(f"/api/meetings/{meeting.id}/speakers",
+                          json=[{"meeting_id": meeting.id, "label": "speaker_0", "name": "Marko Petrović"}])
+    assert response.status_code == 200
+
+    db.expire_all()
+    assert {doc_id for (doc_id,) in db.query(models.SearchDocument.id).filter(
+        models.SearchDocument.kind != "speaker").all()} == content_ids
+
+    assert SearchIndexService.search(db, "ana")["total"] == 0
+    by_name = SearchIndexService.search(db, "petrovic")
+    assert [(item["kind"], item["speaker"]) for item in by_name["items"]] == [("speaker", "Marko Petrović")]
+
+    # Segments keep their label in the index and show the current name
+    segment = SearchIndexService.search(db, "otvaramo")["items"][0]
+    assert segment["speaker"] == "Marko Petrović"
@@ -0,0 +1,96 @@
+import shutil
+import struct
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from scripts.utils.session_journal import RecordingStream, TranscriptJournal, read_journal, repair_recording
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds):
+    return (np.sin(np.arange(int(SAMPLE_RATE * seconds)) / 10) * 8000).astype(np.int16)
+
+
+def crashed_recording(tmp_path, suffix, samples):
+    """Copy of a recording taken while it was still open, as a crash leaves it."""
+    recording = RecordingStream(tmp_path / f"live{suffix}", SAMPLE_RATE)
+    recording.write(samples)
+    crashed = tmp_path / f"crashed{suffix}"
+    shutil.copy(recording.path, crashed)
+    recording.close()
+    return crashed
+
+
+def test_wav_left_open_gets_its_sizes_fixed(tmp_path):
+    samples = tone(12)
+    path = crashed_recording(tmp_path, ".wav", samples)
+    assert path.read_bytes()[4:8] == struct.pack("<I", 8)
+
+    assert repair_recording(path)
+
+    data = path.read_bytes()
+    assert struct.unpack("<I", data[4:8])[0] == len(data) - 8
+    audio, rate = sf.read(str(path), dtype="int16")
+    assert rate == SAMPLE_RATE
+    assert np.array_equal(audio, samples)
+    assert not repair_recording(path)
+
+
+def test_flac_left_open_is_rewritten_up_to_its_last_frame(tmp_path):
+    samples = tone(12)
+    path = crashed_recording(tmp_path, ".flac", samples)
+    with sf.SoundFile(str(path)) as f:
+        assert f.frames >= 2 ** 62
+
+    assert repair_recording(path)
+
+    audio, _rate = sf.read(str(path), dtype="int16")
+    # Everything flushed before the crash survives, bit for bit
+    assert SAMPLE_RATE * 5 <= len(audio) <= len(samples)
+    assert np.array_equal(audio, samples[:len(audio)])
+    assert not repair_recording(path)
+
+
+@pytest.mark.parametrize("name", ["missing.wav", "notes.txt"])
+def test_other_files_are_left_alone(tmp_path, name):
+    path = tmp_path / name
+    if name.endswith(".txt"):
+        path.write_text("RIFF")
+
+    assert not repair_recording(path)
+
+
+def test_journal_of_a_crashed_session(tmp_path):
+    path = tmp_path / "live.jsonl"
+    journal = TranscriptJournal(path)
+    journal.start(tmp_path / "live.wav", SAMPLE_RATE)
+    journal.segment(4.0, 6.0, "drugi")
+    journal.segment(0.5, 3.5, "prvi")
+    journal.close(clean=False)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "segment", "start": 7.0, "en')
+
+    header, segments, finished = read_journal(path)
+
+    assert header["recording"] == str(tmp_path / "live.wav")
+    assert header["sample_rate"] == SAMPLE_RATE
+    assert [seg["text"] for seg in segments] == ["prvi", "drugi"]
+    assert not finished
+
+
+def test_journal_of_a_finished_session(tmp_path):
+    path = tmp_path / "live.jsonl"
+    journal = TranscriptJournal(path)
+    journal.start(tmp_path / "live.flac", SAMPLE_RATE)
+    journal.segment(0.0, 1.0, "Ćao")
+    journal.close()
+    # Late segments from a worker that was still decoding are ignored
+    journal.segment(1.0, 2.0, "kasno")
+
+    _header, segments, finished = read_journal(path)
+
+    assert [seg["text"] for seg in segments] == ["Ćao"]
+    assert finished
@@ -0,0 +1,47 @@
+from app import models
+from app.services.speaker_names import SpeakerNameService
+
+
+def test_labels_match_whole_words_only():
+    names = {"speaker_1": "Ana", "speaker_10": "Marko"}
+
+    rendered = SpeakerNameService.render("speaker_1, speaker_10 i speaker_11 (speaker_1): xspeaker_1", names)
+
+    assert rendered == "Ana, Marko i speaker_11 (Ana): xspeaker_1"
+
+
+def test_names_are_not_renamed_again():
+    # A single pass: a name that looks like another label stays as given
+    names = {"speaker_0": "speaker_1", "speaker_1": "Ana"}
+
+    assert SpeakerNameService.render("speaker_0 + speaker_1", names) == "speaker_1 + Ana"
+
+
+def test_regex_characters_in_labels_and_names_are_literal():
+    names = {"speaker.0": r"Ana \1 $", "speaker_0": "Marko"}
+
+    assert SpeakerNameService.render("speaker.0 speakerX0 speaker_0", names) == r"Ana \1 $ speakerX0 Marko"
+
+
+def test_nested_values_are_rendered():
+    names = {"speaker_0": "Ana"}
+    summary = {"action_items": [{"owner": "speaker_0", "due": None}], "topics": ["speaker_0 o budžetu"], "count": 2}
+
+    assert SpeakerNameService.render_value(summary, names) == {
+        "action_items": [{"owner": "Ana", "due": None}], "topics": ["Ana o budžetu"], "count": 2
+    }
+    assert SpeakerNameService.render_value(summary, {}) is summary
+    assert SpeakerNameService.render(None, names) is None
+
+
+def test_only_named_speakers_of_the_meeting_are_used(db, make_meeting):
+    meeting, other = make_meeting(), make_meeting()
+    db.add_all([
+        models.Speaker(meeting_id=meeting.id, label="speaker_0", name="Ana"),
+        models.Speaker(meeting_id=meeting.id, label="speaker_1", name=""),
+        models.Speaker(meeting_id=meeting.id, label="speaker_2", name=None),
+        models.Speaker(meeting_id=other.id, label="speaker_1", name="Marko"),
+    ])
+    db.commit()
+
+    assert SpeakerNameService.names_for_meeting(db, meeting.id) == {"speaker_0": "Ana"}
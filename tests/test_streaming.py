@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from scripts.utils.streaming import LocalAgreementDecoder, join_words
+
+SAMPLE_RATE = 16000
+# (start, end, text) on the stream clock, one word per second
+SCRIPT = [(i + 0.1, i + 0.9, f" rec{i}") for i in range(20)]
+
+
+class FakeModel:
+    """Whisper stand-in that 'hears' the script words lying completely inside the buffer."""
+
+    def __init__(self, script=SCRIPT, echo_prompt=False, unstable_tail=False):
+        self.script = script
+        self.echo_prompt = echo_prompt
+        self.unstable_tail = unstable_tail
+        self.decoder = None
+        self.prompts = []
+        self.calls = 0
+
+    def transcribe(self, audio, language=None, beam_size=5, word_timestamps=False, initial_prompt=None, **kwargs):
+        self.calls += 1
+        self.prompts.append(initial_prompt)
+        offset = self.decoder.offset
+        end = offset + len(audio) / SAMPLE_RATE
+        words = [SimpleNamespace(start=s - offset, end=e - offset, word=t) for s, e, t in self.script if s >= offset and e <= end]
+        if self.unstable_tail and words:
+            # The newest word is misheard differently on every call until more audio follows it
+            words[-1] = SimpleNamespace(start=words[-1].start, end=words[-1].end, word=f" guess{self.calls}")
+        if self.echo_prompt and initial_prompt and words:
+            # Whisper likes to repeat the prompt at the start of the buffer
+            last = initial_prompt.split()[-1]
+            words.insert(0, SimpleNamespace(start=0.0, end=0.05, word=f" {last}"))
+        return iter([SimpleNamespace(words=words)]), None
+
+
+def decoder_for(model, **kwargs):
+    decoder = LocalAgreementDecoder(model, "sr", sample_rate=SAMPLE_RATE, **kwargs)
+    model.decoder = decoder
+    return decoder
+
+
+def stream(decoder, seconds, chunk=1.0):
+    committed = []
+    for i in range(int(seconds / chunk)):
+        decoder.insert(np.zeros(int(chunk * SAMPLE_RATE), dtype=np.int16), i * chunk)
+        words, _hypothesis = decoder.step()
+        committed += words
+    return committed + decoder.finish()
+
+
+def test_words_are_committed_once_two_hypotheses_agree():
+    decoder = decoder_for(FakeModel())
+
+    decoder.insert(np.zeros(SAMPLE_RATE * 3, dtype=np.int16), 0.0)
+    committed, hypothesis = decoder.step()
+    assert committed == [] and [w.text for w in hypothesis] == [" rec0", " rec1", " rec2"]
+
+    decoder.insert(np.zeros(SAMPLE_RATE, dtype=np.int16), 3.0)
+    committed, hypothesis = decoder.step()
+    assert [w.text for w in committed] == [" rec0", " rec1", " rec2"]
+    assert [w.text for w in hypothesis] == [" rec3"]
+
+
+def test_stream_commits_every_word_exactly_once():
+    model = FakeModel(echo_prompt=True)
+    decoder = decoder_for(model, max_buffer_seconds=4.0)
+
+    words = stream(decoder, 20)
+
+    assert join_words(words) == join_words(decoder.committed) == " ".join(f"rec{i}" for i in range(20))
+    # Committed text is the prompt of the next decode
+    assert model.prompts[-1].endswith("rec18")
+
+
+def test_unstable_words_stay_partial_until_they_agree():
+    decoder = decoder_for(FakeModel(unstable_tail=True))
+
+    words = stream(decoder, 6)
+
+    # Only the end of the stream commits the last guess
+    assert [w.text for w in words[:-1]] == [f" rec{i}" for i in range(5)]
+    assert words[-1].text.startswith(" guess")
+
+
+def test_buffer_is_trimmed_behind_committed_words():
+    decoder = decoder_for(FakeModel(), max_buffer_seconds=4.0)
+
+    offsets = []
+    for i in range(12):
+        decoder.insert(np.zeros(SAMPLE_RATE, dtype=np.int16), float(i))
+        decoder.step()
+        offsets.append(decoder.offset)
+
+    # Cut at the end of the last committed word whenever the buffer outgrows 4 s
+    assert offsets == pytest.approx([0.0] * 4 + [3.9] * 3 + [6.9] * 3 + [9.9] * 2)
+    assert decoder.end == pytest.approx(12.0)
+
+
+def test_buffer_without_agreement_drops_its_oldest_audio():
+    decoder = decoder_for(FakeModel(script=[]), max_buffer_seconds=4.0)
+
+    for i in range(10):
+        decoder.insert(np.zeros(SAMPLE_RATE, dtype=np.int16), float(i))
+        decoder.step()
+
+    assert decoder.buffer_seconds == 4.0
+    assert decoder.offset == 6.0
+
+
+def test_latency_is_measured_from_the_arrival_of_the_word():
+    now = [0.0]
+    decoder = decoder_for(FakeModel(), clock=lambda: now[0])
+
+    for i in range(3):
+        now[0] = float(i)
+        decoder.insert(np.zeros(SAMPLE_RATE, dtype=np.int16), float(i))
+        decoder.step()
+    now[0] = 3.5
+    decoder.finish()
+
+    # rec0 arrived at 0 and was committed at 1, rec1 at 1 -> 2; rec2 only at the end of the stream
+    assert decoder.latencies == [1.0, 1.0, 1.5]
+    assert decoder.latency_stats()["words"] == 3